@@ -0,0 +1,89 @@
+"""Benchmark kickoff-window detection in read_jleague_matches.
+
+Builds a synthetic 50-team, 98-section season (2450 matches) and times the
+previous per-section implementation (groupby().apply(make_kickoff_time) plus
+a Python loop over every kickoff) against the vectorized
+match_utils.sections_live_between, checking that both select the same
+sections for a series of windows.
+
+Usage:
+    uv run python scripts/bench_kickoff_window.py [--teams 50] [-n REPEAT]
+"""
+import argparse
+from datetime import timedelta
+import sys
+import timeit
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from match_utils import sections_live_between  # noqa: E402
+
+TZ = 'Asia/Tokyo'
+
+
+def make_season(teams: int) -> pd.DataFrame:
+    """Weekly sections with matches spread over Sat/Sun and a few undecided times."""
+    sections = (teams - 1) * 2
+    rows = []
+    first_day = pd.Timestamp('2026-02-07')
+    for sec in range(1, sections + 1):
+        for i in range(teams // 2):
+            day = first_day + timedelta(days=7 * (sec - 1) + i % 2)
+            rows.append({
+                'section_no': sec,
+                'match_index_in_section': i + 1,
+                'match_date': day.strftime('%Y/%m/%d'),
+                'start_time': '未定' if i % 13 == 0 else f'{13 + i % 6}:{"03" if i % 2 else "00"}',
+            })
+    return pd.DataFrame(rows)
+
+
+def legacy_sections_to_update(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> set[int]:
+    """Previous implementation of get_sections_to_update."""
+    def make_kickoff_time(_subset):
+        is_valid_time = _subset['start_time'].str.match(r'^\d{1,2}:\d{2}$')
+        start_time = _subset['start_time'].where(is_valid_time, '00:00')
+        result = pd.to_datetime(_subset['match_date'] + ' ' + start_time)
+        return list(result.dt.tz_localize(TZ).sort_values().drop_duplicates())
+
+    dates = df.dropna(subset=['match_date']).groupby('section_no') \
+              .apply(make_kickoff_time, include_groups=False).to_dict()
+    target_sec = set()
+    for _sec, _dates in dates.items():
+        for _start in _dates:
+            if start <= _start + timedelta(hours=2) and _start <= end:
+                target_sec.add(_sec)
+    return target_sec
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark kickoff-window detection')
+    parser.add_argument('--teams', type=int, default=50, help='teams in the season (default: 50)')
+    parser.add_argument('-n', '--repeat', type=int, default=10, help='calls per timing (default: 10)')
+    args = parser.parse_args()
+
+    df = make_season(args.teams)
+    windows = [(pd.Timestamp(f'2026-{m:02d}-{d:02d} 12:00', tz=TZ), pd.Timestamp(f'2026-{m:02d}-{d:02d} 20:00', tz=TZ))
+               for m in range(2, 13) for d in (1, 8, 15, 22)]
+    for start, end in windows:
+        if legacy_sections_to_update(df, start, end) != sections_live_between(df, start, end, TZ):
+            print(f'Mismatch for window {start} - {end}', file=sys.stderr)
+            return 1
+
+    start, end = windows[len(windows) // 2]
+    slow = min(timeit.repeat(lambda: legacy_sections_to_update(df, start, end),
+                             number=args.repeat, repeat=3)) / args.repeat
+    fast = min(timeit.repeat(lambda: sections_live_between(df, start, end, TZ),
+                             number=args.repeat, repeat=3)) / args.repeat
+    print(f'{args.teams} teams, {df["section_no"].nunique()} sections, {len(df)} matches')
+    print(f'legacy groupby/apply + loop: {slow * 1000:8.2f} ms')
+    print(f'vectorized overlap query:    {fast * 1000:8.2f} ms  ({slow / fast:.1f}x)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
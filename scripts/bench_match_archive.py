@@ -0,0 +1,70 @@
+"""Benchmark cross-season queries with match_utils.MatchArchive.
+
+Compares a head-to-head query answered by loading every docs/csv file
+(the glob + read_allmatches_csv approach) with MatchArchive, checks that
+both return the same rows, and times building, reopening and querying
+the index.  The index is written to a temporary file.
+
+Usage:
+    uv run python scripts/bench_match_archive.py [TEAM OPPONENT] [-n REPEAT]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from match_utils import MatchArchive  # noqa: E402
+from match_utils import mu  # noqa: E402
+
+
+def load_everything(archive: MatchArchive, team: str, opponent: str) -> pd.DataFrame:
+    """Previous approach: parse every CSV and filter."""
+    frames = []
+    for file in archive.files():
+        df = mu._parse_allmatches_csv(file.path)
+        hit = (((df['home_team'] == team) & (df['away_team'] == opponent))
+               | ((df['home_team'] == opponent) & (df['away_team'] == team)))
+        if hit.any():
+            frames.append(df[hit].assign(competition=file.competition, season=file.season))
+    return pd.concat(frames, ignore_index=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('teams', nargs='*', default=['鹿島', '浦和'], help='Team and opponent [default: 鹿島 浦和]')
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='Timing repetitions [default: 5]')
+    args = parser.parse_args()
+    team, opponent = args.teams
+
+    os.chdir(PROJECT_ROOT / 'src')
+    mu.init_config(PROJECT_ROOT / 'config' / 'jleague.yaml')
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = Path(tmp) / 'index.json'
+        archive = MatchArchive(index_path=index_path)
+        build = min(timeit.repeat(lambda: (index_path.unlink(missing_ok=True), MatchArchive(index_path=index_path)
+                                           .refresh()), number=1, repeat=args.repeat))
+        reopen = min(timeit.repeat(lambda: MatchArchive(index_path=index_path).refresh(),
+                                   number=1, repeat=args.repeat))
+        result = archive.matches(team, opponent)
+        expected = load_everything(archive, team, opponent)[result.columns]
+        pd.testing.assert_frame_equal(result, expected)
+        print(f'{team} vs {opponent}: {len(result)} matches in {len(set(result["season"]))} seasons '
+              f'({len(archive.files())} files, index {index_path.stat().st_size // 1024} KiB)')
+
+        full = min(timeit.repeat(lambda: load_everything(archive, team, opponent), number=1, repeat=args.repeat))
+        query = min(timeit.repeat(lambda: archive.matches(team, opponent), number=1, repeat=args.repeat))
+    print(f'load every file:  {full * 1000:8.1f} ms')
+    print(f'build index:      {build * 1000:8.1f} ms')
+    print(f'reopen index:     {reopen * 1000:8.1f} ms')
+    print(f'archive query:    {query * 1000:8.1f} ms  ({full / query:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Check and benchmark match_date normalization in MatchUtils.read_allmatches_csv.
+
+For every CSV under docs/csv, compares the vectorized
+MatchUtils.normalize_dates with the previous per-row
+``map(to_datetime_aspossible)`` path (the script fails on any difference),
+then times read_allmatches_csv with both paths on the largest files.
+
+Usage:
+    uv run python scripts/bench_match_dates.py [--largest 5] [-n REPEAT]
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from match_utils import mu  # noqa: E402
+
+CSV_DIR = PROJECT_ROOT / 'docs' / 'csv'
+
+
+def per_row(values: pd.Series) -> pd.Series:
+    """Previous implementation: one pd.to_datetime call per row."""
+    return values.map(mu.to_datetime_aspossible)
+
+
+def match_csv_files() -> list[Path]:
+    """Match CSVs under docs/csv (files with a match_date column), largest first."""
+    files = [path for path in CSV_DIR.rglob('*.csv')
+             if 'match_date' in pd.read_csv(path, nrows=0).columns]
+    return sorted(files, key=lambda path: path.stat().st_size, reverse=True)
+
+
+def check_equivalence(files: list[Path]) -> int:
+    """Compare both paths on every file; return the number of rows compared."""
+    rows = 0
+    for path in files:
+        values = pd.read_csv(path, index_col=0, dtype=str, na_values='')['match_date']
+        expected = per_row(values)
+        actual = mu.normalize_dates(values)
+        if not (actual.equals(expected) and actual.dtype == expected.dtype):
+            diff = actual.ne(expected) & ~(actual.isna() & expected.isna())
+            raise SystemExit(f'{path.relative_to(PROJECT_ROOT)}: differs at\n'
+                             f'{pd.DataFrame({"per_row": expected, "vectorized": actual})[diff]}')
+        rows += len(values)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--largest', type=int, default=5, help='Number of files to time [default: 5]')
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='Timing repetitions [default: 5]')
+    args = parser.parse_args()
+
+    mu.init_config(PROJECT_ROOT / 'config' / 'jleague.yaml')
+    files = match_csv_files()
+    rows = check_equivalence(files)
+    print(f'Equivalent on {len(files)} files / {rows} rows in {CSV_DIR.relative_to(PROJECT_ROOT)}')
+
+    print(f'{"file":<40} {"rows":>6} {"per-row ms":>11} {"vector ms":>10} {"speedup":>8}')
+    for path in files[:args.largest]:
+        with mock.patch.object(type(mu), 'normalize_dates', lambda self, values: per_row(values)):
+            before = min(timeit.repeat(lambda: mu.read_allmatches_csv(path), number=1, repeat=args.repeat))
+        after = min(timeit.repeat(lambda: mu.read_allmatches_csv(path), number=1, repeat=args.repeat))
+        rows = len(pd.read_csv(path, index_col=0, dtype=str))
+        print(f'{path.name:<40} {rows:>6} {before * 1000:>11.1f} {after * 1000:>10.1f} {before / after:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark the nullable_int normalization done before every CSV write.
+
+Loads every match CSV under docs/csv the way writers see them (raw
+strings plus float-format goals, as produced by pandas when a column has
+NaN), then compares the previous per-cell lambda
+``str(int(float(x))) if x != '' else ''`` with the vectorized
+match_utils.normalize_df_for_csv (the script fails on any difference),
+and times both per file and on all files concatenated (the size of the
+history CSVs written by make_old_matches_csv.py).
+
+Usage:
+    uv run python scripts/bench_normalize_csv.py [-n REPEAT]
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from match_utils import CSV_COLUMN_SCHEMA  # noqa: E402
+from match_utils import normalize_df_for_csv  # noqa: E402
+
+CSV_DIR = PROJECT_ROOT / 'docs' / 'csv'
+
+
+def per_cell(df: pd.DataFrame) -> pd.DataFrame:
+    """Previous implementation of the normalization."""
+    df = df.copy()
+    for col, dtype in CSV_COLUMN_SCHEMA.items():
+        if col in df.columns and dtype == 'nullable_int':
+            df[col] = df[col].fillna('').apply(lambda x: str(int(float(x))) if x != '' else x)
+    return df
+
+
+def load_corpus() -> list[pd.DataFrame]:
+    """Every match CSV, with the numeric columns parsed by pandas (floats where NaN occurs)."""
+    frames = []
+    for path in sorted(CSV_DIR.rglob('*.csv')):
+        if path.name == 'csv_timestamp.csv':
+            continue
+        frames.append(pd.read_csv(path, index_col=0))
+    return frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='Timing repetitions [default: 5]')
+    args = parser.parse_args()
+
+    frames = load_corpus()
+    cells = sum(len(df) * sum(1 for col in df.columns if CSV_COLUMN_SCHEMA.get(col) == 'nullable_int')
+                for df in frames)
+    for df in frames:
+        pd.testing.assert_frame_equal(normalize_df_for_csv(df), per_cell(df))
+    print(f'Equivalent on {len(frames)} files / {cells} nullable_int cells in {CSV_DIR.relative_to(PROJECT_ROOT)}')
+
+    print(f'{"workload":<28} {"per-cell ms":>12} {"vector ms":>10} {"speedup":>8}')
+    combined = pd.concat(frames, ignore_index=True)
+    workloads = {'every file separately': lambda fn: [fn(df) for df in frames],
+                 f'one frame ({len(combined)} rows)': lambda fn: fn(combined)}
+    for label, run in workloads.items():
+        before = min(timeit.repeat(lambda: run(per_cell), number=1, repeat=args.repeat))
+        after = min(timeit.repeat(lambda: run(normalize_df_for_csv), number=1, repeat=args.repeat))
+        print(f'{label:<28} {before * 1000:>12.1f} {after * 1000:>10.1f} {before / after:>7.1f}x')
+
+if __name__ == '__main__':
+    main()
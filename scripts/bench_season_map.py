@@ -0,0 +1,66 @@
+"""Benchmark season_map.yaml loading in match_utils.
+
+Compares yaml.safe_load with the LibYAML loader used by
+load_season_map_file (the script fails if the results differ), then
+times the season-map work read_jleague_matches.py does at startup
+(resolve_season_start_month plus get_sub_seasons for J1/J2/J3) with an
+empty process cache and again with a warm one.
+
+Usage:
+    uv run python scripts/bench_season_map.py [-n REPEAT]
+"""
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+import match_utils  # noqa: E402
+from match_utils import YAML_LOADER  # noqa: E402
+from match_utils import mu  # noqa: E402
+
+SEASON_MAP_PATH = PROJECT_ROOT / 'docs' / 'yaml' / 'season_map.yaml'
+
+
+def startup() -> None:
+    """Season-map calls made by read_jleague_matches.py for one run."""
+    mu.resolve_season_start_month()
+    for competition in ('J1', 'J2', 'J3'):
+        mu.get_sub_seasons(competition)
+
+
+def cold_startup() -> None:
+    match_utils._season_maps.clear()
+    startup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='Timing repetitions [default: 5]')
+    args = parser.parse_args()
+
+    text = SEASON_MAP_PATH.read_text(encoding='utf-8')
+    if yaml.load(text, Loader=YAML_LOADER) != yaml.safe_load(text):
+        raise SystemExit(f'{YAML_LOADER.__name__} and yaml.safe_load differ')
+    print(f'{SEASON_MAP_PATH.name}: {len(text.splitlines())} lines, loader {YAML_LOADER.__name__}')
+
+    os.chdir(PROJECT_ROOT / 'src')
+    mu.init_config(PROJECT_ROOT / 'config' / 'jleague.yaml')
+    timings = {
+        'yaml.safe_load': lambda: yaml.safe_load(text),
+        f'yaml.load({YAML_LOADER.__name__})': lambda: yaml.load(text, Loader=YAML_LOADER),
+        'startup, empty cache': cold_startup,
+        'startup, warm cache': startup,
+    }
+    for label, func in timings.items():
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f'{label:<28} {best * 1000:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark the Monte Carlo season simulator (season_simulator.simulate_positions).
+
+Takes a finished season, turns the matches after a cut-off date back into
+unplayed rows and measures simulated seasons per second: a loop drawing
+one season at a time, the batched simulation in this process, and the
+batched simulation on a process pool.  The script fails if the pooled
+result differs from the single-process one (same seed).
+
+Usage:
+    uv run python scripts/bench_season_simulator.py [COMPETITION SEASON] [--cutoff DATE] [-n SIMULATIONS]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from match_utils import mu  # noqa: E402
+from season_simulator import season_states  # noqa: E402
+from season_simulator import simulate_positions  # noqa: E402
+from standings_timeline import season_rules  # noqa: E402
+
+
+def simulate_one_by_one(matches: pd.DataFrame, rules, simulations: int, seed: int) -> np.ndarray:
+    """Previous approach: draw each season's matches in a Python loop."""
+    state = next(iter(season_states(matches, rules).values()))
+    rng = np.random.default_rng(seed)
+    counts = np.zeros((len(state.teams), len(state.teams)), dtype=np.int64)
+    for _ in range(simulations):
+        points = state.points.copy()
+        for home, away in zip(state.home, state.away):
+            home_points, away_points = state.outcome_points[np.searchsorted(state.cumulative, rng.random(),
+                                                                            side='right')]
+            points[home] += home_points
+            points[away] += away_points
+        order = np.lexsort((rng.random(len(points)), state.tiebreak, -points))
+        counts[order, np.arange(len(points))] += 1
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('target', nargs='*', default=['J1', '2025'], help='Competition and season [default: J1 2025]')
+    parser.add_argument('--cutoff', default='2025/10/01', help='Matches after this date are unplayed [default: 2025/10/01]')
+    parser.add_argument('-n', '--simulations', type=int, default=200_000, help='Simulated seasons [default: 200000]')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(), help='Pool size [default: CPU count]')
+    args = parser.parse_args()
+    competition, season = args.target
+
+    os.chdir(PROJECT_ROOT / 'src')
+    mu.init_config(PROJECT_ROOT / 'config' / 'jleague.yaml')
+    rules = season_rules(competition, season)
+    matches = mu.read_allmatches_csv(mu.get_csv_path(competition, season))
+    later = matches['match_date'] > args.cutoff
+    matches.loc[later, ['home_goal', 'away_goal', 'status']] = ['', '', 'ＶＳ']
+    print(f'{competition} {season}: {later.sum()} of {len(matches)} matches after {args.cutoff} to simulate')
+
+    loop_count = max(args.simulations // 100, 1)
+    rates = {}
+    start = time.perf_counter()
+    simulate_one_by_one(matches, rules, loop_count, 0)
+    rates['one season at a time'] = loop_count / (time.perf_counter() - start)
+    start = time.perf_counter()
+    single = simulate_positions(matches, rules, args.simulations, seed=0, workers=1)
+    rates['batched, 1 process'] = args.simulations / (time.perf_counter() - start)
+    start = time.perf_counter()
+    pooled = simulate_positions(matches, rules, args.simulations, seed=0, workers=args.workers)
+    rates[f'batched, pool of {args.workers}'] = args.simulations / (time.perf_counter() - start)
+    for group, table in single.items():
+        if not table.equals(pooled[group]):
+            raise SystemExit(f'{group}: pooled result differs from the single-process one')
+
+    for label, rate in rates.items():
+        print(f'{label:<24} {rate:>12,.0f} seasons/s')
+
+
+if __name__ == '__main__':
+    main()
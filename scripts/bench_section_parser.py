@@ -0,0 +1,46 @@
+"""Benchmark J-League section page parsers.
+
+Times read_match_from_web (BeautifulSoup) against read_match_from_html
+(lxml + precompiled XPath) on the section fixtures in tests/test_data and
+checks that both return identical records.
+
+Usage:
+    uv run python scripts/bench_section_parser.py [-n REPEAT]
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from read_jleague_matches import read_match_from_html  # noqa: E402
+from read_jleague_matches import read_match_from_web  # noqa: E402
+
+FIXTURE_DIR = PROJECT_ROOT / 'tests' / 'test_data'
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark J-League section page parsers')
+    parser.add_argument('-n', '--repeat', type=int, default=20, help='parses per page (default: 20)')
+    args = parser.parse_args()
+
+    print(f'{"page":<26} {"bs4 ms":>9} {"lxml ms":>9} {"speedup":>8}')
+    for path in sorted(FIXTURE_DIR.glob('*_section*.html')):
+        html = path.read_bytes().decode('utf-8', errors='ignore')
+        if repr(read_match_from_html(html)) != repr(read_match_from_web(BeautifulSoup(html, 'lxml'))):
+            print(f'{path.name}: parsers disagree', file=sys.stderr)
+            return 1
+        slow = min(timeit.repeat(lambda: read_match_from_web(BeautifulSoup(html, 'lxml')),
+                                 number=args.repeat, repeat=3)) / args.repeat
+        fast = min(timeit.repeat(lambda: read_match_from_html(html),
+                                 number=args.repeat, repeat=3)) / args.repeat
+        print(f'{path.name:<26} {slow * 1000:9.2f} {fast * 1000:9.2f} {slow / fast:7.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
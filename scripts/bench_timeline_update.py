@@ -0,0 +1,62 @@
+"""Benchmark incremental standings timeline updates (standings_timeline.patch_timeline).
+
+Takes a finished season, replaces the result of one match on the last
+match date with a different score (the kind of late correction a cron
+run picks up), finds the changed rows with mu.diff_matches and compares
+rebuilding the timeline from scratch with patching the stored one from
+the earliest changed date.  Both start from the match data and end with
+the timeline text as written next to the CSV, and the script fails if the
+results differ.
+
+Usage:
+    uv run python scripts/bench_timeline_update.py [COMPETITION SEASON] [-n REPEAT]
+"""
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from match_utils import mu  # noqa: E402
+from standings_timeline import build_timeline  # noqa: E402
+from standings_timeline import dump_timeline  # noqa: E402
+from standings_timeline import patch_timeline  # noqa: E402
+from standings_timeline import season_rules  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('target', nargs='*', default=['J2', '2025'], help='Competition and season [default: J2 2025]')
+    parser.add_argument('-n', '--repeat', type=int, default=20, help='Timing repetitions [default: 20]')
+    args = parser.parse_args()
+    competition, season = args.target
+
+    os.chdir(PROJECT_ROOT / 'src')
+    mu.init_config(PROJECT_ROOT / 'config' / 'jleague.yaml')
+    rules = season_rules(competition, season)
+    old = mu.read_allmatches_csv(mu.get_csv_path(competition, season))
+    new = old.copy()
+    last = new.index[new['match_date'] == new['match_date'].max()][0]
+    new.loc[last, ['home_goal', 'away_goal']] = [str(int(new.loc[last, 'home_goal']) + 1), '0']
+
+    changeset = mu.diff_matches(new, old)
+    since = min(changeset.match_dates())
+    stored = dump_timeline(build_timeline(old, rules))
+    rebuilt = dump_timeline(build_timeline(new, rules))
+    if patch_timeline(stored, new, since, rules) != rebuilt:
+        raise SystemExit('patched timeline differs from the rebuilt one')
+    dates = [row['date'] for row in build_timeline(new, rules)['dates']]
+    print(f'{competition} {season}: {len(new)} matches, {len(dates)} dates, timeline {len(rebuilt) // 1024} KiB; '
+          f'changed {changeset.summary().splitlines()[0]} on {since} (date {dates.index(since)} of {len(dates)})')
+
+    rebuild = min(timeit.repeat(lambda: dump_timeline(build_timeline(new, rules)), number=1, repeat=args.repeat))
+    patch = min(timeit.repeat(lambda: patch_timeline(stored, new, since, rules), number=1, repeat=args.repeat))
+    print(f'rebuild:  {rebuild * 1000:8.2f} ms')
+    print(f'patch:    {patch * 1000:8.2f} ms  ({rebuild / patch:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
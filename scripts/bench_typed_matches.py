@@ -0,0 +1,65 @@
+"""Memory report: MatchUtils.read_allmatches_csv vs typed_matches.read_typed_matches_csv.
+
+Loads every match CSV under docs/csv with both loaders, checks that the
+typed table writes each file back byte for byte (the script fails
+otherwise), and reports deep memory usage (DataFrame.memory_usage with
+deep=True, index included) and load time for the whole archive and the
+largest files.
+
+Usage:
+    uv run python scripts/bench_typed_matches.py [--largest 5]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from match_utils import mu  # noqa: E402
+from typed_matches import read_typed_matches_csv  # noqa: E402
+
+CSV_DIR = PROJECT_ROOT / 'docs' / 'csv'
+
+
+def match_csv_files() -> list[Path]:
+    """Match CSVs under docs/csv, largest first."""
+    files = [path for path in CSV_DIR.rglob('*.csv') if path.name != 'csv_timestamp.csv']
+    return sorted(files, key=lambda path: path.stat().st_size, reverse=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--largest', type=int, default=5, help='Number of files listed [default: 5]')
+    args = parser.parse_args()
+
+    mu.init_config(PROJECT_ROOT / 'config' / 'jleague.yaml')
+    files = match_csv_files()
+    rows = {}
+    load_time = {'str': 0.0, 'typed': 0.0}
+    for path in files:
+        start = time.perf_counter()
+        strings = mu._parse_allmatches_csv(path)
+        load_time['str'] += time.perf_counter() - start
+        start = time.perf_counter()
+        table = read_typed_matches_csv(path)
+        load_time['typed'] += time.perf_counter() - start
+        if table.to_csv() != path.read_text(encoding='utf-8'):
+            raise SystemExit(f'{path.relative_to(PROJECT_ROOT)}: typed round trip differs')
+        rows[path] = (len(strings), strings.memory_usage(deep=True).sum(), table.frame.memory_usage(deep=True).sum())
+    print(f'Lossless round trip on {len(files)} files in {CSV_DIR.relative_to(PROJECT_ROOT)}')
+
+    print(f'{"file":<40} {"rows":>6} {"str KiB":>9} {"typed KiB":>10} {"ratio":>6}')
+    for path in files[:args.largest]:
+        count, before, after = rows[path]
+        print(f'{path.name:<40} {count:>6} {before / 1024:>9.0f} {after / 1024:>10.0f} {before / after:>5.1f}x')
+    count = sum(r[0] for r in rows.values())
+    before = sum(r[1] for r in rows.values())
+    after = sum(r[2] for r in rows.values())
+    print(f'{"all files":<40} {count:>6} {before / 1024:>9.0f} {after / 1024:>10.0f} {before / after:>5.1f}x')
+    print(f'load time: str {load_time["str"]:.2f} s, typed {load_time["typed"]:.2f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,28 +1,8 @@
 #!/bin/bash
+# 全リーダーを1プロセスで実行 (src/update_orchestrator.py)
+# 01時(JST)の実行は全CSV更新 (daily)、それ以外は試合時間ごとの更新 (ongame)
+# 手動実行例: bash scripts/call_update_csv.sh "" --mode daily
 
 echo Called by schedule $1
-DAILY=Daily
-ONGAME=OnGame
-TRIGGER=$(echo $1 | awk '{if($3 == "*" && $4 == "*") {print "'$DAILY'"} else {print "'$ONGAME'"}}')
-
-RUNNING_HOUR=`TZ=Asia/Tokyo date "+%H"`
 TZ=Asia/Tokyo date
-echo $RUNNING_HOUR
-echo $TRIGGER
-
-if [ $RUNNING_HOUR -eq 1 ]; then
-# if [ $TRIGGER = $DAILY]; then
-  # 日ごと深夜自動実行 ⇒ 全CSVのアップデートを実行
-  uv run python src/read_jleague_matches.py -f
-  uv run python src/read_jfamatch.py PrincePremierE PrincePremierW PrinceKanto WC2026 WC2026KO
-  # JFAでスケジュール生成後、openfootballで日次スコアを上書き (JFA反映遅延の補完)
-  uv run python src/read_openfootball_wc.py
-  uv run python src/read_we_league.py
-  # uv run python src/read_aclgl_matches.py
-else
-  # 試合時間ごとの自動実行では、Jリーグと開催中のWC2026を更新
-  uv run python src/read_jleague_matches.py
-  uv run python src/read_jfamatch.py WC2026 WC2026KO
-  # JFAでスケジュール生成後、openfootballで日次スコアを上書き (JFA反映遅延の補完)
-  uv run python src/read_openfootball_wc.py
-fi
+exec uv run python src/update_orchestrator.py --schedule "$1" "${@:2}"
@@ -13,13 +13,16 @@ import csv
 import re
 import sys
 
-import yaml
 from pathlib import Path
 
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from match_utils import load_season_map_file  # noqa: E402
+
 SEASON_MAP_PATH = PROJECT_ROOT / 'docs' / 'yaml' / 'season_map.yaml'
 CSV_DIR = PROJECT_ROOT / 'docs' / 'csv'
 CONFIG_TS = PROJECT_ROOT / 'frontend' / 'src' / 'types' / 'config.ts'
@@ -120,8 +123,7 @@ def check_all() -> list[str]:
 
     # 2. Load season_map.yaml
     try:
-        with open(SEASON_MAP_PATH, 'r', encoding='utf-8') as f:
-            season_map = yaml.safe_load(f)
+        season_map = load_season_map_file(SEASON_MAP_PATH)
     except Exception as e:
         return [f"Failed to load season_map.yaml: {e}"]
 
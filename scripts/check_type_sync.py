@@ -1,8 +1,9 @@
 """Cross-language type drift detector.
 
 Compares Python canonical type definitions (CSV_COLUMN_SCHEMA,
-SeasonEntry.OPTIONAL_KEYS, POINT_SYSTEM_VALUES) against their
-TypeScript counterparts (RawMatchRow, SeasonEntryOptions, POINT_MAPS).
+SeasonEntry.OPTIONAL_KEYS, POINT_SYSTEM_VALUES, standings_timeline.POINT_MAPS)
+against their TypeScript counterparts (RawMatchRow, SeasonEntryOptions,
+POINT_MAPS).
 
 Exit code 0 = all checks pass, 1 = drift detected.
 
@@ -20,6 +21,7 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / 'src'))
 
 from match_utils import CSV_COLUMN_SCHEMA, POINT_SYSTEM_VALUES, SeasonEntry  # noqa: E402
+from standings_timeline import POINT_MAPS  # noqa: E402
 
 # ---------------------------------------------------------------------------
 # TS source paths
@@ -68,6 +70,21 @@ def _parse_point_maps_keys(content: str) -> set[str]:
     return set(re.findall(r"'([^']+)'\s*:", match.group(1)))
 
 
+def _parse_point_maps(content: str) -> dict[str, dict[str, int]]:
+    """Extract POINT_MAPS entries (system -> result -> points) from config.ts."""
+    match = re.search(
+        r'export const POINT_MAPS\s*=\s*\{(.*?)\}\s*satisfies',
+        content,
+        re.DOTALL,
+    )
+    if not match:
+        raise ValueError("POINT_MAPS not found in config.ts")
+    return {
+        name: {key: int(value) for key, value in re.findall(r'(\w+):\s*(\d+)', body)}
+        for name, body in re.findall(r"'([^']+)'\s*:\s*\{([^}]+)\}", match.group(1))
+    }
+
+
 def check_csv_columns() -> list[str]:
     """Check CSV_COLUMN_SCHEMA keys against RawMatchRow fields."""
     errors: list[str] = []
@@ -170,6 +187,16 @@ def check_point_system_values() -> list[str]:
     return errors
 
 
+def check_point_map_values() -> list[str]:
+    """Check standings_timeline.POINT_MAPS against the TS POINT_MAPS points."""
+    ts_maps = _parse_point_maps(CONFIG_TS.read_text(encoding='utf-8'))
+    return [
+        f"POINT_MAPS['{name}'] differs: Python {POINT_MAPS.get(name)}, TS {ts_maps.get(name)}"
+        for name in sorted(set(POINT_MAPS) | set(ts_maps))
+        if POINT_MAPS.get(name) != ts_maps.get(name)
+    ]
+
+
 def check_view_type_consistency() -> list[str]:
     """Check that bracket_blocks entries have view_type including 'bracket'."""
     import yaml
@@ -209,6 +236,7 @@ def main() -> int:
         ('SeasonEntryOptions', check_season_entry_options),
         ('count cascade fields', check_required_count_cascade_fields),
         ('PointSystem values', check_point_system_values),
+        ('POINT_MAPS points', check_point_map_values),
         ('view_type consistency', check_view_type_consistency),
     ]
 
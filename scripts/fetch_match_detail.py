@@ -10,11 +10,15 @@ Usage:
 """
 import argparse
 import logging
+import sys
 import time
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
 import pandas as pd
-import requests
+
+from http_client import http
 
 logger = logging.getLogger(__name__)
 
@@ -72,7 +76,7 @@ def fetch_and_save(year: int, match_card_id: str, *, delay: float, dry_run: bool
         return False
 
     out_dir.mkdir(parents=True, exist_ok=True)
-    resp = requests.get(url, timeout=60)
+    resp = http.get(url)
     resp.raise_for_status()
     out_path.write_text(resp.text, encoding='utf-8')
     logger.info('Saved: %s (%d bytes) [%d/%d]', out_path, len(resp.text), count, total)
@@ -13,6 +13,7 @@ sys.path.insert(0, str(_REPO_ROOT / 'scripts' / 'legacy'))
 import pandas as pd
 
 from fetch_match_detail import FILTER_ALIASES
+from match_utils import normalize_df_for_csv
 from read_older2020_matches import parse_years
 from set_config import Config
 
@@ -115,10 +116,7 @@ def make_each_csv(filename: str, comp_index: int) -> dict[str, pd.DataFrame]:
         matches['away_pk_score'] = matches['away_pk_score'].fillna('')
         columns_list.extend(['home_pk_score', 'away_pk_score'])
     if 'home_score_ex' in matches.columns:
-        for col in ('home_score_ex', 'away_score_ex'):
-            matches[col] = matches[col].fillna('').apply(
-                lambda x: str(int(float(x))) if x != '' else ''
-            )
+        matches = normalize_df_for_csv(matches, ['home_score_ex', 'away_score_ex'])
         columns_list.extend(['home_score_ex', 'away_score_ex'])
     matches['attendance'] = matches['attendance'].astype('int')
 
@@ -207,10 +205,7 @@ def make_jleaguecup_csv(year: int) -> None:
 
     # ET scores from enrich
     if 'home_score_ex' in matches.columns:
-        for col in ('home_score_ex', 'away_score_ex'):
-            matches[col] = matches[col].fillna('').apply(
-                lambda x: str(int(float(x))) if x != '' else ''
-            )
+        matches = normalize_df_for_csv(matches, ['home_score_ex', 'away_score_ex'])
 
     # Status
     matches['status'] = matches.apply(
@@ -237,12 +232,8 @@ def make_jleaguecup_csv(year: int) -> None:
     columns_list.append('leg')
 
     # Normalize nullable_int columns to int-strings or empty
-    for col in ('leg', 'home_pk_score', 'away_pk_score',
-                'home_score_ex', 'away_score_ex'):
-        if col in result.columns:
-            result[col] = result[col].fillna('').apply(
-                lambda x: str(int(float(x))) if x != '' else ''
-            )
+    result = normalize_df_for_csv(result, ['leg', 'home_pk_score', 'away_pk_score',
+                                           'home_score_ex', 'away_score_ex'])
 
     outfile = config.get_path('match_data.league_csv_path',
                               season=str(year), competition='JLeagueCup')
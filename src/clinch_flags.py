@@ -0,0 +1,416 @@
+"""Clinch and elimination flags of league seasons.
+
+For every slider date of a season and every team, tells whether the
+title, the promotion places and safety from relegation are already
+certain or already out of reach, whatever the results of the remaining
+matches.  The flags are published next to the CSV as
+``<csv name>.clinch.json``::
+
+    {"version": 1, "source": "2025_allmatch_result-J2.csv", "source_sha256": "...",
+     "point_system": "standard", "promotion_count": 2, "relegation_count": 3,
+     "season_teams": [...], "dates": ["1970/01/01", "2025/02/15", ...],
+     "groups": {"DefaultGroup": {
+         "teams": ["札幌", ...],
+         "title": [[0, 0, ...], ...], "promotion": [[...], ...], "safety": [[...], ...]}}}
+
+Every flag array is indexed ``[date index][team index]`` (dates and teams
+as in standings_timeline): CLINCHED when the team finishes at the target
+rank or better in every completion of the season, ELIMINATED when it
+finishes below it in every completion, OPEN otherwise.  The targets are
+rank 1 (title), promotion_count (promotion) and team count -
+relegation_count (safety); a target with a zero count is omitted.  Teams
+level on points may fall either way, so tiebreakers never settle a flag.
+
+getSafetyLine / getPossibleLine (frontend/src/core/sorter.ts) compare one
+team's max points with the others' current points, as if every other
+team could win all its remaining matches at once.  Here the remaining
+fixtures are shared: "can k other teams all reach T points" and "can
+the other teams all stay at T points or below" are transportation
+problems from the remaining matches to the teams, decided with a
+max-flow (_max_flow).  A match may hand out any split of between
+PointBounds.least and PointBounds.most points with at most
+PointBounds.win per side, the bounds of the results the point system
+produces in league matches (POINT_SYSTEM_RESULTS).  This relaxes the
+real results, so a settled case may be flagged a few dates late.  That
+a set flag holds in every real completion is not proven for every point
+system; tests/test_clinch_flags.py checks it against every completion of
+small random cases.  A settled flag stays settled on later dates, which
+prunes most of the flows.
+
+Usage::
+
+    python clinch_flags.py J1 J2 J3           # config.season
+    python clinch_flags.py J2 -s 2025
+    python clinch_flags.py --all              # every CSV of the archive
+"""
+import argparse
+from collections import deque
+from dataclasses import dataclass
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from match_utils import MatchArchive
+from match_utils import mu
+from standings_timeline import CANCELLED_STATUS
+from standings_timeline import DEFAULT_GROUP
+from standings_timeline import POINT_MAPS
+from standings_timeline import POINT_SYSTEM_RESULTS
+from standings_timeline import RESULT_COUNTERPART
+from standings_timeline import RESULT_TYPES
+from standings_timeline import SeasonRules
+from standings_timeline import match_results
+from standings_timeline import season_rules
+from standings_timeline import slider_dates
+
+logger = logging.getLogger(__name__)
+
+CLINCH_VERSION = 1
+
+CLINCHED = 1
+OPEN = 0
+ELIMINATED = -1
+
+
+@dataclass(frozen=True)
+class PointBounds:
+    """What one match can hand out under a point system.
+
+    Attributes:
+        win: Most points for one side
+        lose: Fewest points for one side
+        least: Fewest points for both sides together
+        most: Most points for both sides together
+    """
+    win: int
+    lose: int
+    least: int
+    most: int
+
+    @classmethod
+    def of(cls, point_system: str, results: tuple[str, ...] = ()) -> 'PointBounds':
+        """Bounds of the point system's results (POINT_SYSTEM_RESULTS) and the given ones."""
+        point_map = POINT_MAPS[point_system]
+        played = {*POINT_SYSTEM_RESULTS.get(point_system, RESULT_TYPES), *results}
+        sides = [(point_map[result], point_map[RESULT_COUNTERPART[result]]) for result in played]
+        return cls(max(max(side) for side in sides), min(min(side) for side in sides),
+                   min(map(sum, sides)), max(map(sum, sides)))
+
+
+def _max_flow(pairs: dict[tuple[int, int], tuple[int, int]], capacity: list[int]) -> int:
+    """Most points the remaining matches can hand out within the teams' capacities.
+
+    Args:
+        pairs: (team, team) -> (points the pair's matches hand out, most points
+            for one of the two teams)
+        capacity: Most points each team can take
+
+    Returns:
+        int: Max-flow value (Dinic)
+    """
+    if not pairs:
+        return 0
+    flow = 0
+    nodes = len(pairs)
+    source, sink = nodes + len(capacity), nodes + len(capacity) + 1
+    graph: list[list[list[int]]] = [[] for _ in range(sink + 1)]   # edge: [to, capacity, reverse index]
+
+    def add_edge(u: int, v: int, limit: int) -> None:
+        if limit > 0:
+            graph[u].append([v, limit, len(graph[v])])
+            graph[v].append([u, 0, len(graph[u]) - 1])
+
+    total = 0
+    for node, ((i, j), (points, side)) in enumerate(pairs.items()):
+        add_edge(source, node, points)
+        add_edge(node, nodes + i, side)
+        add_edge(node, nodes + j, side)
+        total += points
+    for team, limit in enumerate(capacity):
+        add_edge(nodes + team, sink, limit)
+
+    def augment(u: int, limit: int) -> int:
+        if u == sink:
+            return limit
+        edges = graph[u]
+        while cursor[u] < len(edges):
+            edge = edges[cursor[u]]
+            v, residual, reverse = edge
+            if residual > 0 and level[v] == level[u] + 1:
+                pushed = augment(v, min(limit, residual))
+                if pushed:
+                    edge[1] -= pushed
+                    graph[v][reverse][1] += pushed
+                    return pushed
+            cursor[u] += 1
+        return 0
+
+    while True:
+        level = [-1] * len(graph)
+        level[source] = 0
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for v, residual, _ in graph[u]:
+                if residual > 0 and level[v] < 0:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        if level[sink] < 0:
+            return flow
+        cursor = [0] * len(graph)
+        while pushed := augment(source, total):
+            flow += pushed
+
+
+def _pairs(remaining: np.ndarray, team: int) -> list[tuple[int, int, int]]:
+    """(i, j, matches) of the remaining pairs without team."""
+    upper = np.triu(remaining, 1)
+    upper[team] = 0
+    upper[:, team] = 0
+    i, j = np.nonzero(upper)
+    return list(zip(i.tolist(), j.tolist(), upper[i, j].tolist()))
+
+
+def _clinched(team: int, rank: int, points: np.ndarray, remaining: np.ndarray, bounds: PointBounds) -> bool:
+    """True if fewer than rank other teams can reach team's points when it loses every remaining match."""
+    target = points[team] + bounds.lose * remaining[team].sum()
+    # Other teams win their matches against team
+    base = points + bounds.win * remaining[team]
+    best = base + bounds.win * (remaining.sum(axis=1) - remaining[team])
+    rivals = (best >= target) & (np.arange(len(points)) != team)
+    if np.count_nonzero(rivals) < rank:
+        return True
+    demand = np.where(rivals, np.maximum(target - base, 0), 0)
+    if np.count_nonzero(rivals & (demand == 0)) >= rank:
+        return False
+    # Rivals that may fall short; dropping one lowers the shortfall by its demand at most
+    spare = np.sort(demand[rivals])[::-1][:np.count_nonzero(rivals) - rank].sum()
+    # Between two rivals a match hands out up to bounds.most; otherwise the rival wins it
+    pairs = {(i, j): ((bounds.most if rivals[i] and rivals[j] else bounds.win) * count, bounds.win * count)
+             for i, j, count in _pairs(remaining, team) if rivals[i] or rivals[j]}
+    return demand.sum() - _max_flow(pairs, demand.tolist()) > spare
+
+
+def _eliminated(team: int, rank: int, points: np.ndarray, remaining: np.ndarray, bounds: PointBounds) -> bool:
+    """True if at least rank other teams end above team's points when it wins every remaining match."""
+    target = points[team] + bounds.win * remaining[team].sum()
+    others = np.arange(len(points)) != team
+    base = points + bounds.lose * remaining[team]
+    games = remaining.sum(axis=1) - remaining[team]
+    room = target - base
+    above = np.count_nonzero(others & (room < 0))
+    if above >= rank:
+        return True
+    if np.count_nonzero(others & (base + bounds.win * games > target)) < rank or bounds.least == 0:
+        return False
+    # Teams above target take anything; others take up to their room
+    capacity = np.where(room < 0, bounds.win * games, np.clip(room, 0, bounds.win * games))
+    pairs = {(i, j): (bounds.least * count, bounds.win * count) for i, j, count in _pairs(remaining, team)}
+    shortfall = sum(points for points, _ in pairs.values()) - _max_flow(pairs, capacity.tolist())
+    if shortfall == 0:
+        return False
+    # Letting a team end above target raises its capacity by at most extra
+    extra = np.sort((bounds.win * games - capacity)[others & (room >= 0)])[::-1]
+    return shortfall > extra[:rank - 1 - above].sum()
+
+
+def rank_flags(points: np.ndarray, remaining: np.ndarray, rank: int, point_system: str = 'standard',
+               teams: np.ndarray = None, results: tuple[str, ...] = ()) -> np.ndarray:
+    """Whether each team surely finishes within rank, surely below it, or neither.
+
+    Args:
+        points: Current points per team
+        remaining: Symmetric matrix of the remaining matches between each pair of teams
+        rank: Target rank (1 = title)
+        point_system: POINT_MAPS key
+        teams: Teams to evaluate (default all); the others are OPEN
+        results: Result types the remaining matches may end with besides
+            POINT_SYSTEM_RESULTS[point_system]
+
+    Returns:
+        np.ndarray: CLINCHED, ELIMINATED or OPEN per team
+    """
+    bounds = PointBounds.of(point_system, results)
+    flags = np.full(len(points), OPEN, dtype=np.int64)
+    if rank >= len(points):
+        flags[:] = CLINCHED
+        return flags
+    for team in range(len(points)) if teams is None else teams:
+        if _clinched(team, rank, points, remaining, bounds):
+            flags[team] = CLINCHED
+        elif _eliminated(team, rank, points, remaining, bounds):
+            flags[team] = ELIMINATED
+    return flags
+
+
+@dataclass(frozen=True)
+class SeasonCounts:
+    """Ranks that decide the season (SeasonEntry.promotion_count / relegation_count)."""
+    promotion_count: int = 0
+    relegation_count: int = 0
+
+
+def season_counts(competition: str, season_key: str, family_key: str = None) -> SeasonCounts:
+    """promotion_count / relegation_count of a season (zeros if it is not in the map)."""
+    entry = (mu.load_competition_seasons(competition, family_key) or {}).get(season_key)
+    if entry is None:
+        return SeasonCounts()
+    return SeasonCounts(entry.promotion_count, entry.relegation_count)
+
+
+def _targets(team_count: int, counts: SeasonCounts) -> dict[str, int]:
+    targets = {'title': 1}
+    if counts.promotion_count > 0:
+        targets['promotion'] = counts.promotion_count
+    if counts.relegation_count > 0:
+        targets['safety'] = team_count - counts.relegation_count
+    return targets
+
+
+def build_clinch_flags(matches: pd.DataFrame, rules: SeasonRules = SeasonRules(),
+                       counts: SeasonCounts = SeasonCounts()) -> dict[str, Any]:
+    """Compute the clinch / elimination flags of every team at every slider date.
+
+    Args:
+        matches: Match data as returned by mu.read_allmatches_csv
+        rules: Season settings (see standings_timeline.season_rules)
+        counts: Promotion / relegation counts (see season_counts)
+
+    Returns:
+        dict: Flags without the source fields (see the module docstring)
+    """
+    dates = slider_dates(matches)
+    results = match_results(matches, rules.point_system)
+    rows = len(matches)
+    text = {name: (matches[name].fillna('').astype(str).to_numpy() if name in matches.columns
+                   else np.full(rows, '', dtype=object))
+            for name in ('match_date', 'home_team', 'away_team', 'status', 'group')}
+    groups = np.where(text['group'] == '', DEFAULT_GROUP, text['group'])
+    active = text['status'] != CANCELLED_STATUS
+    # First slider date at which each match counts; len(dates) = still to play
+    first = np.where(results['played'][:rows],
+                     np.searchsorted(np.array(dates, dtype=object), text['match_date'], side='left'), len(dates))
+
+    seen = tuple(RESULT_TYPES[code] for code in np.unique(results['result'][results['played']]))
+    output = {}
+    for group in dict.fromkeys(groups):
+        in_group = np.flatnonzero((groups == group) & active)
+        names = list(dict.fromkeys([*rules.teams, *np.column_stack(
+            [text['home_team'][in_group], text['away_team'][in_group]]).ravel()]))
+        index = {name: i for i, name in enumerate(names)}
+        home = np.array([index[name] for name in text['home_team'][in_group]], dtype=np.int64)
+        away = np.array([index[name] for name in text['away_team'][in_group]], dtype=np.int64)
+        counted = first[in_group]
+        gained = np.zeros((len(dates) + 1, len(names)), dtype=np.int64)
+        np.add.at(gained, (counted, home), results['point'][in_group])
+        np.add.at(gained, (counted, away), results['point'][rows + in_group])
+        points = np.cumsum(gained, axis=0)
+        remaining = np.zeros((len(names), len(names)), dtype=np.int64)
+        np.add.at(remaining, (home, away), 1)
+        remaining += remaining.T
+
+        entry: dict[str, Any] = {'teams': names}
+        targets = _targets(len(names), counts)
+        flags = {target: np.full(len(names), OPEN, dtype=np.int64) for target in targets}
+        for target in targets:
+            entry[target] = []
+        for day in range(len(dates)):
+            played = counted == day
+            np.subtract.at(remaining, (home[played], away[played]), 1)
+            np.subtract.at(remaining, (away[played], home[played]), 1)
+            for target, rank in targets.items():
+                # Later results only narrow the completions: settled flags stay
+                unsettled = np.flatnonzero(flags[target] == OPEN)
+                if len(unsettled):
+                    update = rank_flags(points[day], remaining, rank, rules.point_system, unsettled, seen)
+                    flags[target][unsettled] = update[unsettled]
+                entry[target].append(flags[target].tolist())
+        output[group] = entry
+    return {
+        'version': CLINCH_VERSION,
+        'point_system': rules.point_system,
+        'promotion_count': counts.promotion_count,
+        'relegation_count': counts.relegation_count,
+        'season_teams': list(rules.teams),
+        'dates': dates,
+        'groups': output,
+    }
+
+
+def clinch_path(csv_path: str | os.PathLike) -> Path:
+    """``<csv name>.clinch.json`` next to the CSV."""
+    path = Path(csv_path)
+    return path.with_name(path.stem + '.clinch.json')
+
+
+def write_clinch_flags(csv_path: str, rules: SeasonRules = SeasonRules(),
+                       counts: SeasonCounts = SeasonCounts()) -> bool:
+    """Write the flags of a match CSV unless they are up to date.
+
+    Returns:
+        bool: True if the flag file was created or updated
+    """
+    source_sha256 = hashlib.sha256(Path(csv_path).read_bytes()).hexdigest()
+    output = clinch_path(csv_path)
+    settings = {'version': CLINCH_VERSION, 'point_system': rules.point_system,
+                'promotion_count': counts.promotion_count, 'relegation_count': counts.relegation_count,
+                'season_teams': list(rules.teams)}
+    if output.exists():
+        try:
+            stored = json.loads(output.read_text(encoding='utf-8'))
+        except ValueError:
+            stored = {}
+        if stored.get('source_sha256') == source_sha256 and all(stored.get(k) == v for k, v in settings.items()):
+            return False
+
+    flags = build_clinch_flags(mu.read_allmatches_csv(csv_path, copy=False), rules, counts)
+    logger.info("Write %s", output)
+    output.write_text(json.dumps({'source': Path(csv_path).name, 'source_sha256': source_sha256, **flags},
+                                 ensure_ascii=False, separators=(',', ':')) + '\n', encoding='utf-8')
+    return True
+
+
+def make_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Argument parser"""
+    parser = argparse.ArgumentParser(
+        description='clinch_flags.py\n'
+                    'Write the per-date clinch / elimination flags JSON next to match CSVs')
+    parser.add_argument('competition', default=['J1', 'J2', 'J3'], nargs='*',
+                        help='Competition key (e.g. J1 J2 J3)')
+    parser.add_argument('-s', '--season', help='Season name; sub-seasons (e.g. 2026East) are included [default: season in config]')
+    parser.add_argument('--all', action='store_true',
+                        help='Every match CSV listed in season_map.yaml (ignores competition / season)')
+    parser.add_argument('-d', '--debug', action='store_true',
+                        help='Debug mode (print debug information)')
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Write the flags of the CSVs given on the command line.
+
+    Relative paths in the config are resolved against the current directory,
+    which must be src/ (see __main__).
+    """
+    args = make_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+        datefmt='%H:%M:%S',
+    )
+    mu.init_config(Path(__file__).parent / '../config/jleague.yaml')
+    season = args.season or str(mu.config.season)
+    for file in MatchArchive().files():
+        if args.all or (file.competition in args.competition and file.season.startswith(season)):
+            write_clinch_flags(file.path, season_rules(file.competition, file.season_key, file.family),
+                               season_counts(file.competition, file.season_key, file.family))
+
+
+if __name__ == '__main__':
+    os.chdir(Path(__file__).parent)
+    main()
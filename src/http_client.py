@@ -0,0 +1,420 @@
+"""Shared pooled HTTP client for all scrapers.
+
+Every reader fetches its pages through the module-level singleton ``http``
+instead of calling ``requests.get`` directly, so that connections are kept
+alive and reused across requests (no new TCP+TLS handshake per page).
+
+The client provides:
+
+- one ``requests.Session`` per process with a keep-alive connection pool per host
+- a default timeout and retry policy taken from the YAML config
+  (``http_timeout``, optional ``http_retries`` and ``max_requests_per_host``)
+- gzip / deflate accepted for every request
+- a per-host request budget, so concurrent fetches never exceed
+  ``max_requests_per_host`` in-flight requests to the same host
+- an optional persistent conditional-GET cache (``http_cache_dir``): ETag /
+  Last-Modified validators and the body are stored per URL, and
+  ``get_conditional`` answers a 304 Not Modified with the cached body
+- an optional record / replay archive (``--record`` / ``--replay`` on every
+  reader): raw responses are saved gzip-compressed in a content-addressed
+  store, and a replay run serves every request from that store without
+  touching the network
+
+Usage::
+
+    from http_client import http
+
+    http.configure(config)          # done by mu.init_config()
+    resp = http.get(url)
+    resp.raise_for_status()
+
+    resp = http.get_conditional(url)
+    if resp.from_cache:             # 304: body unchanged since the last run
+        records = http.load_parsed(url, parser_version)
+
+    # CLI of a reader
+    add_archive_args(parser)
+    args = parser.parse_args()
+    http.apply_archive_args(args)   # --record / --replay
+"""
+import argparse
+from contextlib import contextmanager
+import gzip
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+from typing import Any
+from typing import Iterator
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 60
+DEFAULT_RETRIES = 3
+DEFAULT_MAX_REQUESTS_PER_HOST = 4
+# Transient server-side failures worth retrying.  404 is deliberately excluded:
+# readers such as read_jfamatch treat it as "no data yet".
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+DEFAULT_ARCHIVE_DIR = Path(__file__).resolve().parent.parent / 'local_data' / 'http_archive'
+# Response headers kept in the archive (enough to rebuild .text / .json())
+_ARCHIVED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+class ReplayMissError(requests.ConnectionError):
+    """Raised in replay mode when a URL is not in the response archive."""
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write a file via a temporary sibling and os.replace (readers never see partial data)."""
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class ValidatorCache:
+    """Persistent ETag / Last-Modified cache keyed by URL.
+
+    Each URL is stored as two files named by the SHA-256 of the URL:
+    ``<key>.json`` (validators, encoding and optional parsed records) and
+    ``<key>.body`` (raw response body).  Files are replaced atomically, so
+    concurrent readers never see a half-written entry.
+    """
+
+    def __init__(self, cache_dir: str | os.PathLike):
+        self.cache_dir = Path(cache_dir)
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f'{key}.json', self.cache_dir / f'{key}.body'
+
+    def _read_meta(self, url: str) -> dict[str, Any] | None:
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get('url') == url else None
+
+    def _write_meta(self, url: str, meta: dict[str, Any]) -> None:
+        meta_path, _ = self._paths(url)
+        _write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+    def validator_headers(self, url: str) -> dict[str, str]:
+        """Return If-None-Match / If-Modified-Since headers for a cached URL (empty if none)."""
+        meta = self._read_meta(url)
+        if meta is None or not self._paths(url)[1].exists():
+            return {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def load_body(self, url: str) -> tuple[bytes, str | None] | None:
+        """Return (body, encoding) for a cached URL, or None."""
+        meta = self._read_meta(url)
+        if meta is None:
+            return None
+        try:
+            return self._paths(url)[1].read_bytes(), meta.get('encoding')
+        except OSError:
+            return None
+
+    def store(self, url: str, resp: requests.Response) -> None:
+        """Store the body and validators of a 200 response (drops the entry without validators)."""
+        etag = resp.headers.get('ETag')
+        last_modified = resp.headers.get('Last-Modified')
+        meta_path, body_path = self._paths(url)
+        # Drop the old meta first: an interrupted store must not pair the new body
+        # with the old validators or parsed records
+        meta_path.unlink(missing_ok=True)
+        if not etag and not last_modified:
+            # The old validators would make a later 304 serve the old body
+            body_path.unlink(missing_ok=True)
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        _write_atomic(body_path, resp.content)
+        self._write_meta(url, {
+            'url': url, 'etag': etag, 'last_modified': last_modified, 'encoding': resp.encoding,
+        })
+
+    def load_parsed(self, url: str, parser: str = None) -> Any | None:
+        """Return parsed records saved for the current cached body by ``parser``, or None."""
+        meta = self._read_meta(url)
+        if meta is None or meta.get('parser') != parser:
+            return None
+        return meta.get('parsed')
+
+    def save_parsed(self, url: str, parsed: Any, parser: str = None) -> None:
+        """Attach JSON-serializable parsed records to the current cached body.
+
+        ``parser`` identifies the code that produced them (e.g. a hash of the
+        reader); records saved by another parser are not returned by load_parsed.
+        """
+        meta = self._read_meta(url)
+        if meta is None:
+            return
+        meta['parsed'] = parsed
+        meta['parser'] = parser
+        self._write_meta(url, meta)
+
+
+class ResponseArchive:
+    """Content-addressed store of raw HTTP responses for offline replay.
+
+    Bodies are stored gzip-compressed under ``objects/<sha[:2]>/<sha>.gz``,
+    where ``sha`` is the SHA-256 of the body, so identical pages are stored
+    once.  ``index.json`` maps each URL to its latest body hash, status code,
+    encoding and a few headers.
+
+    Modes:
+        'record': every network response is saved to the archive.
+        'replay': every request is answered from the archive only.
+    """
+
+    MODES = ('record', 'replay')
+
+    def __init__(self, archive_dir: str | os.PathLike, mode: str):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown archive mode: {mode} (expected one of {self.MODES})")
+        self.archive_dir = Path(archive_dir)
+        self.mode = mode
+        self._index_path = self.archive_dir / 'index.json'
+        self._lock = threading.Lock()
+        try:
+            with open(self._index_path, encoding='utf-8') as f:
+                self._index: dict[str, dict[str, Any]] = json.load(f)
+        except FileNotFoundError:
+            self._index = {}
+        logger.info("HTTP archive (%s): %s, %d URL(s)", mode, self.archive_dir, len(self._index))
+
+    def _object_path(self, sha: str) -> Path:
+        return self.archive_dir / 'objects' / sha[:2] / f'{sha}.gz'
+
+    def record(self, url: str, resp: requests.Response) -> None:
+        """Save the response body and metadata for ``url``."""
+        body = resp.content
+        sha = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(sha)
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomic(object_path, gzip.compress(body))
+        entry = {
+            'sha256': sha,
+            'status': resp.status_code,
+            'encoding': resp.encoding,
+            'headers': {k: resp.headers[k] for k in _ARCHIVED_HEADERS if k in resp.headers},
+        }
+        with self._lock:
+            self._index[url] = entry
+            payload = json.dumps(self._index, ensure_ascii=False, indent=1, sort_keys=True)
+            _write_atomic(self._index_path, payload.encode('utf-8'))
+
+    def replay(self, url: str) -> requests.Response:
+        """Rebuild the archived response for ``url``.
+
+        Raises:
+            ReplayMissError: If the URL was never recorded.
+        """
+        entry = self._index.get(url)
+        if entry is None:
+            raise ReplayMissError(f"Not in HTTP archive {self.archive_dir}: {url}")
+        resp = requests.Response()
+        resp.url = url
+        resp.status_code = entry['status']
+        resp.reason = 'OK' if entry['status'] == 200 else ''
+        resp.encoding = entry.get('encoding')
+        resp.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        resp._content = gzip.decompress(self._object_path(entry['sha256']).read_bytes())  # pylint: disable=protected-access
+        logger.debug("Replay %s", url)
+        return resp
+
+
+class HttpClient:
+    """Process-wide HTTP client with connection pooling, retries and per-host budgets."""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 max_requests_per_host: int = DEFAULT_MAX_REQUESTS_PER_HOST):
+        self.timeout = timeout
+        self.retries = retries
+        self.max_requests_per_host = max_requests_per_host
+        self._host_budgets: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self.session = self._make_session()
+        self.validator_cache: ValidatorCache | None = None
+        self.archive: ResponseArchive | None = None
+        self.pinned = False
+
+    def _make_session(self) -> requests.Session:
+        """Create a Session whose adapters pool connections and retry transient errors."""
+        session = requests.Session()
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=1.0,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=('GET', 'HEAD'),
+            raise_on_status=False,
+        )
+        # pool_maxsize must cover the per-host budget, otherwise urllib3 discards
+        # connections that concurrent requests opened beyond the pool size.
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=max(self.max_requests_per_host, 1),
+            max_retries=retry,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['Accept-Encoding'] = 'gzip, deflate'
+        return session
+
+    def configure(self, config: Any) -> None:
+        """Apply timeout / retry / budget settings from a loaded Config.
+
+        Missing keys keep their defaults.  The session is rebuilt only when the
+        retry policy or pool size changes, so pooled connections survive a
+        reconfiguration by another reader in the same process.
+
+        Args:
+            config: Config object (or any object with the optional attributes
+                ``http_timeout``, ``http_retries``, ``max_requests_per_host``
+                and ``http_cache_dir``).
+
+        Ignored while ``pinned`` is True (set by update_orchestrator.py so that
+        readers running side by side do not rebuild the shared session).
+        """
+        if self.pinned:
+            logger.debug("HTTP settings are pinned; ignore configure()")
+            return
+        self.timeout = getattr(config, 'http_timeout', self.timeout) or self.timeout
+        cache_dir = getattr(config, 'http_cache_dir', None)
+        self.validator_cache = ValidatorCache(cache_dir) if cache_dir else None
+        retries = getattr(config, 'http_retries', self.retries)
+        budget = getattr(config, 'max_requests_per_host', self.max_requests_per_host)
+        if retries != self.retries or budget != self.max_requests_per_host:
+            self.retries = retries
+            self.max_requests_per_host = budget
+            with self._lock:
+                self._host_budgets.clear()
+            self.session.close()
+            self.session = self._make_session()
+
+    @contextmanager
+    def _host_budget(self, url: str) -> Iterator[None]:
+        """Hold one slot of the per-host request budget for the given URL."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            semaphore = self._host_budgets.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(max(self.max_requests_per_host, 1))
+                self._host_budgets[host] = semaphore
+        with semaphore:
+            yield
+
+    def get(self, url: str, timeout: float = None, **kwargs) -> requests.Response:
+        """Send a GET request through the pooled session.
+
+        Args:
+            url: URL to fetch.
+            timeout: Timeout in seconds. Defaults to the configured http_timeout.
+            **kwargs: Passed through to ``requests.Session.get`` (e.g. headers).
+
+        Returns:
+            requests.Response: The response (status is not checked here).
+        """
+        if self.archive is not None and self.archive.mode == 'replay':
+            return self.archive.replay(url)
+        with self._host_budget(url):
+            logger.debug("GET %s", url)
+            resp = self.session.get(url, timeout=timeout or self.timeout, **kwargs)
+        if self.archive is not None and resp.status_code != 304:
+            self.archive.record(url, resp)
+        return resp
+
+    def get_conditional(self, url: str, timeout: float = None, **kwargs) -> requests.Response:
+        """Send a conditional GET using the validator cache.
+
+        Sends If-None-Match / If-Modified-Since for URLs cached by an earlier
+        run.  A 304 Not Modified response is turned into a 200 response carrying
+        the cached body.  The returned response has a ``from_cache`` attribute
+        that is True in that case.  Without a configured cache this is a plain GET.
+
+        Args:
+            url: URL to fetch.
+            timeout: Timeout in seconds. Defaults to the configured http_timeout.
+            **kwargs: Passed through to ``requests.Session.get`` (e.g. headers).
+
+        Returns:
+            requests.Response: The response, with ``from_cache`` set.
+        """
+        cache = self.validator_cache
+        replaying = self.archive is not None and self.archive.mode == 'replay'
+        if cache is None or replaying:
+            resp = self.get(url, timeout=timeout, **kwargs)
+            resp.from_cache = False
+            return resp
+
+        extra_headers = kwargs.pop('headers', None) or {}
+        resp = self.get(url, timeout=timeout, headers={**cache.validator_headers(url), **extra_headers}, **kwargs)
+        if resp.status_code == 304:
+            cached = cache.load_body(url)
+            if cached is not None:
+                logger.info("Not modified: %s", url)
+                resp.status_code = 200
+                resp._content = cached[0]  # pylint: disable=protected-access
+                resp.encoding = cached[1]
+                resp.from_cache = True
+                if self.archive is not None:
+                    self.archive.record(url, resp)
+                return resp
+            # The cached body is gone (e.g. removed after the validators were sent)
+            logger.info("Cached body missing, fetching again: %s", url)
+            resp = self.get(url, timeout=timeout, headers=extra_headers, **kwargs)
+        resp.from_cache = False
+        if resp.status_code == 200:
+            cache.store(url, resp)
+        return resp
+
+    def apply_archive_args(self, args: argparse.Namespace) -> None:
+        """Enable the response archive according to --record / --replay (see add_archive_args).
+
+        Without either option the current archive setting is kept, so readers
+        run in-process by the orchestrator inherit its --record / --replay.
+        """
+        if getattr(args, 'replay', False):
+            self.archive = ResponseArchive(args.archive_dir, 'replay')
+        elif getattr(args, 'record', False):
+            self.archive = ResponseArchive(args.archive_dir, 'record')
+
+    def load_parsed(self, url: str, parser: str = None) -> Any | None:
+        """Return records cached for ``url`` by ``parser`` (None without a cache or entry)."""
+        return self.validator_cache.load_parsed(url, parser) if self.validator_cache else None
+
+    def save_parsed(self, url: str, parsed: Any, parser: str = None) -> None:
+        """Cache records parsed by ``parser`` for the current body of ``url`` (no-op without a cache)."""
+        if self.validator_cache:
+            self.validator_cache.save_parsed(url, parsed, parser)
+
+
+def add_archive_args(parser: argparse.ArgumentParser) -> None:
+    """Add the --record / --replay / --archive-dir options shared by all readers."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--record', action='store_true',
+                       help='Save raw HTTP responses to the local archive')
+    group.add_argument('--replay', action='store_true',
+                       help='Serve every HTTP request from the local archive (no network)')
+    parser.add_argument('--archive-dir', default=str(DEFAULT_ARCHIVE_DIR),
+                        help=f'Response archive directory [default: {DEFAULT_ARCHIVE_DIR}]')
+
+
+# Singleton instance
+http = HttpClient()
@@ -0,0 +1,185 @@
+"""Long-running live-score poller.
+
+Instead of one-shot runs scheduled by cron at fixed offsets after kickoff,
+a reader started with ``--daemon`` keeps its config, season map and current
+match CSVs in memory and polls only the feeds that have a match in progress:
+
+- while a match is live, every ``live_poll_interval`` seconds
+- otherwise the interval backs off from ``live_idle_interval`` (doubling each
+  idle cycle) up to ``live_max_idle_interval``, but never sleeps past the
+  next kickoff
+
+A match counts as live from kickoff until ``live_match_minutes`` later, or
+until its status becomes '試合終了'.  CSVs are written through
+``mu.update_if_diff`` only when the fetched data changed.
+
+Readers provide a LiveFeed subclass per competition
+(read_jleague_matches.JLeagueLiveFeed, read_jfamatch.JfaLiveFeed).
+
+Usage::
+
+    poller = LivePoller(feeds, live_interval=60, idle_interval=300, max_idle_interval=3600)
+    poller.run()
+"""
+from datetime import datetime
+from datetime import timedelta
+from datetime import tzinfo
+import logging
+import time
+from typing import Any
+from typing import Callable
+
+import pandas as pd
+
+from match_utils import kickoff_times
+from match_utils import sections_live_between
+from timestamp_store import flush_all as flush_timestamps
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIVE_INTERVAL = 60
+DEFAULT_IDLE_INTERVAL = 300
+DEFAULT_MAX_IDLE_INTERVAL = 3600
+DEFAULT_MATCH_MINUTES = 150
+
+
+def match_duration(config: Any) -> timedelta:
+    """Return how long after kickoff a match is polled (config.live_match_minutes)."""
+    return timedelta(minutes=getattr(config, 'live_match_minutes', DEFAULT_MATCH_MINUTES))
+
+
+def pending_matches(matches: pd.DataFrame) -> pd.DataFrame:
+    """Return the rows whose status is not yet '試合終了'."""
+    if 'status' not in matches.columns:
+        return matches
+    finished = matches['status'].fillna('').astype(str).str.startswith('試合終了')
+    return matches[~finished]
+
+
+def _split_by_timezone(matches: pd.DataFrame, default_tz: str | tzinfo) -> list[tuple[pd.DataFrame, str | tzinfo]]:
+    """Split matches by their 'timezone' column (venue-local times), if present."""
+    if 'timezone' not in matches.columns:
+        return [(matches, default_tz)]
+    tz_names = matches['timezone'].fillna('').astype(str)
+    return [(matches[tz_names == name], name or default_tz) for name in tz_names.unique()]
+
+
+def live_sections(matches: pd.DataFrame, now: datetime, tz: str | tzinfo,
+                  duration: timedelta = timedelta(minutes=DEFAULT_MATCH_MINUTES)) -> set[int]:
+    """Return the sections with an unfinished match in progress at now.
+
+    Args:
+        matches (pd.DataFrame): Match data with 'section_no', 'match_date', 'start_time'
+            and optionally 'status' / 'timezone' (venue-local start times)
+        now (datetime): Current time (timezone-aware)
+        tz (str | tzinfo): Timezone of match_date / start_time for rows without 'timezone'
+        duration (timedelta): How long after kickoff a match is treated as live
+
+    Returns:
+        set[int]: Section numbers to poll
+    """
+    result = set()
+    for subset, subset_tz in _split_by_timezone(pending_matches(matches), tz):
+        result |= sections_live_between(subset, now, now, subset_tz, duration)
+    return result
+
+
+def next_kickoff(matches: pd.DataFrame, now: datetime, tz: str | tzinfo) -> datetime | None:
+    """Return the first kickoff of an unfinished match after now, or None."""
+    upcoming = []
+    for subset, subset_tz in _split_by_timezone(pending_matches(matches), tz):
+        kickoff = kickoff_times(subset.dropna(subset=['match_date']), subset_tz)
+        kickoff = kickoff[kickoff > now]
+        if not kickoff.empty:
+            upcoming.append(kickoff.min())
+    return min(upcoming) if upcoming else None
+
+
+class LiveFeed:
+    """One competition polled by LivePoller (subclassed by each reader)."""
+
+    name = ''
+
+    def is_live(self, now: datetime) -> bool:
+        """Return True if a match of this feed is in progress at now."""
+        raise NotImplementedError
+
+    def next_kickoff(self, now: datetime) -> datetime | None:
+        """Return the next kickoff after now, or None if nothing is scheduled."""
+        raise NotImplementedError
+
+    def poll(self, now: datetime) -> bool:
+        """Fetch the live part of the feed and update its CSVs; return True if anything changed."""
+        raise NotImplementedError
+
+
+class LivePoller:
+    """Poll live feeds with adaptive intervals."""
+
+    def __init__(self, feeds: list[LiveFeed],
+                 live_interval: float = DEFAULT_LIVE_INTERVAL,
+                 idle_interval: float = DEFAULT_IDLE_INTERVAL,
+                 max_idle_interval: float = DEFAULT_MAX_IDLE_INTERVAL,
+                 clock: Callable[[], datetime] = None,
+                 sleep: Callable[[float], None] = time.sleep,
+                 on_cycle: Callable[[], None] = None):
+        self.feeds = feeds
+        self.live_interval = live_interval
+        self.idle_interval = idle_interval
+        self.max_idle_interval = max_idle_interval
+        self.clock = clock or (lambda: datetime.now().astimezone())
+        self.sleep = sleep
+        self.on_cycle = on_cycle
+        self._idle_delay = idle_interval
+
+    @classmethod
+    def from_config(cls, feeds: list[LiveFeed], config: Any, **kwargs: Any) -> 'LivePoller':
+        """Create a poller with the live_* intervals of a reader config."""
+        return cls(feeds,
+                   live_interval=getattr(config, 'live_poll_interval', DEFAULT_LIVE_INTERVAL),
+                   idle_interval=getattr(config, 'live_idle_interval', DEFAULT_IDLE_INTERVAL),
+                   max_idle_interval=getattr(config, 'live_max_idle_interval', DEFAULT_MAX_IDLE_INTERVAL),
+                   **kwargs)
+
+    def poll_once(self) -> float:
+        """Poll every live feed once and return the number of seconds to wait."""
+        now = self.clock()
+        if self.on_cycle is not None:
+            self.on_cycle()
+        live = False
+        updated = False
+        for feed in self.feeds:
+            if not feed.is_live(now):
+                continue
+            live = True
+            try:
+                if feed.poll(now):
+                    logger.info("Updated %s", feed.name)
+                    updated = True
+            except Exception:
+                # A network error or a half-updated page must not stop the daemon
+                logger.exception("Poll of %s failed", feed.name)
+        if updated:
+            # Do not wait for the exit of the daemon to publish the update timestamps
+            flush_timestamps()
+        if live:
+            self._idle_delay = self.idle_interval
+            return self.live_interval
+
+        delay = self._idle_delay
+        self._idle_delay = min(self._idle_delay * 2, self.max_idle_interval)
+        kickoffs = [k for k in (feed.next_kickoff(now) for feed in self.feeds) if k is not None]
+        if kickoffs:
+            delay = min(delay, max((min(kickoffs) - now).total_seconds(), 0))
+        return delay
+
+    def run(self, max_cycles: int = None) -> None:
+        """Poll until interrupted (or for max_cycles cycles)."""
+        cycles = 0
+        while max_cycles is None or cycles < max_cycles:
+            delay = self.poll_once()
+            cycles += 1
+            if max_cycles is not None and cycles >= max_cycles:
+                break
+            logger.debug("Next poll in %.0f seconds", delay)
+            self.sleep(delay)
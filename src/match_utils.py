@@ -12,42 +12,46 @@ Usage::
     config = mu.init_config('config/jleague.yaml')
     mu.update_if_diff(match_df, csv_path)
 """
+import bisect
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from dataclasses import field
 from datetime import date
 from datetime import datetime
+from datetime import timedelta
 from datetime import tzinfo
+import hashlib
+import io
+import json
 import logging
+import os
 from os import PathLike
 from pathlib import Path
 import re
+import threading
 
 import yaml
 from typing import Any
+from typing import Iterator
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 
+from http_client import http
 from set_config import Config
+from timestamp_store import TimestampStore
 
 logger = logging.getLogger(__name__)
 
+# Assumed match length: a match is "live" from kickoff until kickoff + MATCH_DURATION
+MATCH_DURATION = timedelta(hours=2)
 _FW_DIGITS = str.maketrans('０１２３４５６７８９', '0123456789')
 _GROUP_STAGE_ROUND_RE = re.compile(r'^第(\d+)節')
 
 
-def _sort_match_rows(df: pd.DataFrame) -> pd.DataFrame:
-    """Sort match-like DataFrames using the best available stable key set."""
-    sort_keys = [
-        col for col in [
-            'group', 'section_no', 'round', 'match_number',
-            'match_date', 'home_team', 'away_team',
-        ]
-        if col in df.columns
-    ]
-    if not sort_keys:
-        return df.reset_index(drop=True)
-    return df.sort_values(sort_keys).reset_index(drop=True)
-
-
 def _ensure_tzinfo(tz: str | tzinfo) -> tzinfo:
     """Convert a timezone string to a tzinfo object if needed."""
     if isinstance(tz, str):
@@ -297,16 +301,288 @@ class SeasonEntry:
                 "only one main tree block is allowed", season_key)
 
 
+# ---------------------------------------------------------------------------
+# season_map.yaml loading (process-wide cache)
+# ---------------------------------------------------------------------------
+# LibYAML's C loader when PyYAML was built with it (much faster on the
+# 1,400+ line season map); same results as yaml.safe_load.
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@dataclass
+class _ParsedSeasonMap:
+    """A parsed season_map.yaml and the SeasonEntry objects built from it so far."""
+    mtime: int | None
+    raw: dict
+    # (family_key, competition) -> {season_key: SeasonEntry}
+    entries: dict[tuple[str, str], dict[str, SeasonEntry]] = field(default_factory=dict)
+
+
+_season_maps: dict[Path, _ParsedSeasonMap] = {}
+_season_maps_lock = threading.RLock()
+
+
+def _file_mtime(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _parsed_season_map(path: str | PathLike) -> _ParsedSeasonMap:
+    """Return the cached parse of path, re-reading it when its mtime changed."""
+    path = Path(path).resolve()
+    mtime = _file_mtime(path)
+    with _season_maps_lock:
+        parsed = _season_maps.get(path)
+        if parsed is None or parsed.mtime != mtime:
+            logger.debug("Parsing season map %s", path)
+            with open(path, 'r', encoding='utf-8') as f:
+                parsed = _ParsedSeasonMap(mtime, yaml.load(f, Loader=YAML_LOADER))
+            _season_maps[path] = parsed
+        return parsed
+
+
+def load_season_map_file(path: str | PathLike) -> dict:
+    """Parse a season_map.yaml file, memoized per process until the file changes.
+
+    The returned dict is shared between callers and must not be modified.
+
+    Args:
+        path: Path of season_map.yaml
+
+    Returns:
+        dict: The entire season_map.yaml content
+    """
+    return _parsed_season_map(path).raw
+
+
+# ---------------------------------------------------------------------------
+# Match diff
+# ---------------------------------------------------------------------------
+# Natural key of a match row (the columns present in a frame are used)
+MATCH_KEY_COLUMNS = ('group', 'section_no', 'home_team', 'away_team')
+# Columns that do not count as a change (recalculated on every read)
+DIFF_IGNORED_COLUMNS = ('match_index_in_section',)
+
+
+@dataclass
+class MatchChangeset:
+    """Row-level difference between two match DataFrames (see MatchUtils.diff_matches).
+
+    Keys are tuples of the MATCH_KEY_COLUMNS present in the frames plus an
+    occurrence counter for repeated keys.  All values are compared as strings.
+    """
+    key_columns: list[str]
+    added: pd.DataFrame  # rows only in the new frame
+    removed: pd.DataFrame  # rows only in the old frame
+    # key -> {column: (old value, new value)}
+    changed: dict[tuple, dict[str, tuple[str, str]]] = field(default_factory=dict)
+    columns_added: list[str] = field(default_factory=list)
+    columns_removed: list[str] = field(default_factory=list)
+    changed_rows: pd.DataFrame | None = None  # rows of the new frame listed in changed
+
+    def __bool__(self) -> bool:
+        return bool(len(self.added) or len(self.removed) or self.changed
+                    or self.columns_added or self.columns_removed)
+
+    def summary(self, limit: int = 10) -> str:
+        """Return a short human-readable description for logging."""
+        if not self:
+            return 'no changes'
+        parts = []
+        if self.columns_added or self.columns_removed:
+            parts.append(f'columns +{self.columns_added} -{self.columns_removed}')
+        parts.append(f'{len(self.added)} added, {len(self.removed)} removed, {len(self.changed)} changed')
+        lines = ['; '.join(parts)]
+        for key, columns in list(self.changed.items())[:limit]:
+            diffs = ', '.join(f'{col}: {old!r} -> {new!r}' for col, (old, new) in columns.items())
+            lines.append(f'  {key[:-1]}: {diffs}')
+        if len(self.changed) > limit:
+            lines.append(f'  ... {len(self.changed) - limit} more')
+        return '\n'.join(lines)
+
+    def match_dates(self) -> set[str]:
+        """Return the match_date of every added, removed and changed row (old and new dates)."""
+        dates = set()
+        for frame in (self.added, self.removed, self.changed_rows):
+            if frame is not None and 'match_date' in frame.columns:
+                dates.update(frame['match_date'].fillna('').astype(str))
+        for columns in self.changed.values():
+            dates.update(columns.get('match_date', ()))
+        return dates
+
+
+@dataclass(frozen=True)
+class CsvUpdate:
+    """A rewrite of a match CSV by MatchUtils.update_if_diff (see take_csv_updates).
+
+    Attributes:
+        old_sha256: SHA-256 of the replaced file (None if the file was created)
+        new_sha256: SHA-256 of the written file
+        match_dates: match_date of the added, removed and changed rows (old
+            and new dates); None if the change is not limited to rows
+            (new file, columns added or removed)
+    """
+    old_sha256: str | None
+    new_sha256: str
+    match_dates: frozenset[str] | None
+
+
+def _keyed_rows(df: pd.DataFrame, key_columns: list[str]) -> pd.DataFrame:
+    """Return df as strings, indexed by (key columns..., occurrence)."""
+    values = df.drop(columns=list(DIFF_IGNORED_COLUMNS), errors='ignore').fillna('').astype(str)
+    values = values.reindex(sorted(values.columns), axis=1)
+    keys = values[key_columns].copy()
+    keys['_occurrence'] = keys.groupby(key_columns).cumcount() if key_columns else range(len(keys))
+    values.index = pd.MultiIndex.from_frame(keys)
+    return values
+
+
+def _row_hashes(values: pd.DataFrame) -> pd.Series:
+    """Content hash of every row (index kept)."""
+    return pd.Series(pd.util.hash_pandas_object(values, index=False).to_numpy(), index=values.index)
+
+
+# ---------------------------------------------------------------------------
+# Upsert merge
+# ---------------------------------------------------------------------------
+@dataclass
+class MergeResult:
+    """Outcome of upsert_matches."""
+    frame: pd.DataFrame
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+    @property
+    def changed(self) -> bool:
+        """True if any row was inserted, updated or deleted."""
+        return bool(self.inserted or self.updated or self.deleted)
+
+
+def _as_strings(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """Columns of df as strings with NaN -> '' (missing columns become '')."""
+    return pd.DataFrame({col: df[col].fillna('').astype(str) if col in df.columns else '' for col in columns},
+                        index=df.index)
+
+
+def _order_keys(frames: list[pd.DataFrame], columns: list[str]) -> list[list[tuple]]:
+    """Comparable sort keys of every row of frames (numeric columns compared as numbers)."""
+    combined = pd.concat([frame[columns] for frame in frames], ignore_index=True)
+    for col in columns:
+        numeric = pd.to_numeric(combined[col], errors='coerce')
+        if numeric.notna().all():
+            combined[col] = numeric
+        else:
+            combined[col] = combined[col].fillna('').astype(str)
+    keys = list(combined.itertuples(index=False, name=None))
+    result, start = [], 0
+    for frame in frames:
+        result.append(keys[start:start + len(frame)])
+        start += len(frame)
+    return result
+
+
+def upsert_matches(current: pd.DataFrame, updates: pd.DataFrame, key_columns: list[str],
+                   scope: pd.Series = None, order_columns: list[str] = None) -> MergeResult:
+    """Merge updated rows into a match DataFrame by natural key.
+
+    Rows of current whose key appears in updates are replaced in place, but
+    only if their content changed; rows selected by scope (e.g. the fetched
+    sections) whose key is missing from updates are deleted; updates with a
+    new key are inserted where order_columns places them.  Everything else
+    keeps the file's order, so no full sort of the season is needed.
+
+    Args:
+        current (pd.DataFrame): Current match data (e.g. read from the CSV)
+        updates (pd.DataFrame): New rows; their key must be unique
+        key_columns (list[str]): Natural key, e.g. ['section_no', 'match_index_in_section']
+            or ['round', 'match_number']
+        scope (pd.Series, optional): Boolean mask over current of the rows updates replace
+            [default: none, i.e. nothing is deleted]
+        order_columns (list[str], optional): Columns current is sorted by, used to place
+            inserted rows [default: key_columns]
+
+    Returns:
+        MergeResult: Merged frame (with a fresh RangeIndex; current itself if
+            nothing changed) and the number of changed rows
+
+    Raises:
+        ValueError: If updates contain duplicate keys
+    """
+    order_columns = order_columns or key_columns
+    columns = list(current.columns) + [col for col in updates.columns if col not in current.columns]
+    current_keys = pd.MultiIndex.from_frame(_as_strings(current, key_columns))
+    update_keys = pd.MultiIndex.from_frame(_as_strings(updates, key_columns))
+    if update_keys.has_duplicates:
+        raise ValueError(f"Duplicate keys {key_columns} in updated rows")
+
+    match_pos = update_keys.get_indexer(current_keys)
+    matched = match_pos >= 0
+    compare = [col for col in columns if col not in DIFF_IGNORED_COLUMNS]
+    current_hash = _row_hashes(_as_strings(current.iloc[matched], compare)).to_numpy()
+    update_hash = _row_hashes(_as_strings(updates.iloc[match_pos[matched]], compare)).to_numpy()
+    replaced = np.zeros(len(current), dtype=bool)
+    replaced[np.flatnonzero(matched)[current_hash != update_hash]] = True
+    in_scope = np.zeros(len(current), dtype=bool) if scope is None else scope.to_numpy(dtype=bool)
+    deleted = in_scope & ~matched
+
+    # Positions in pd.concat([current, updates]): current row i -> i, update row j -> len(current) + j
+    take = np.where(replaced, len(current) + match_pos, np.arange(len(current)))[~deleted].tolist()
+    new_rows = np.setdiff1d(np.arange(len(updates)), match_pos[matched])
+    if len(new_rows):
+        kept_keys, new_keys = _order_keys([current.iloc[~deleted], updates.iloc[new_rows]], order_columns)
+        kept_keys = list(kept_keys)
+        for key, row in sorted(zip(new_keys, new_rows.tolist()), key=lambda item: item[0]):
+            pos = bisect.bisect_right(kept_keys, key)
+            kept_keys.insert(pos, key)
+            take.insert(pos, len(current) + row)
+
+    result = MergeResult(current, len(new_rows), int(replaced.sum()), int(deleted.sum()))
+    if result.changed:
+        combined = pd.concat([current, updates], ignore_index=True)[columns]
+        result.frame = combined.take(take).reset_index(drop=True)
+    return result
+
+
 class MatchUtils:
     """Stateful utilities for match CSV processing.
 
     Holds a loaded Config instance and provides methods that depend on it.
     Use the module-level singleton ``mu`` and call ``mu.init_config(path)``
     before using any other methods.
+
+    Several readers can run in one process (see update_orchestrator.py): the
+    config is context-local when set through init_config or use_config, so
+    each reader task sees its own config.  The parsed season map is shared
+    by all of them and re-read only when the file changes on disk; update
+    timestamps go through one TimestampStore per timestamp file, written
+    once at exit.
     """
 
     def __init__(self):
-        self.config: Config | None = None
+        self._default_config: Config | None = None
+        # Config of the reader running in the current context (see use_config)
+        self._context_config: ContextVar[Config | None] = ContextVar(f'config_{id(self)}', default=None)
+        self._cache_lock = threading.RLock()
+        self._timestamp_stores: dict[Path, TimestampStore] = {}
+        # Parsed match CSVs: path -> ((mtime_ns, size, date format), frame)
+        self._csv_cache: dict[Path, tuple[tuple, pd.DataFrame]] = {}
+        self.csv_cache_stats = {'hits': 0, 'misses': 0}
+        # Rewrites by update_if_diff not yet taken by take_csv_updates
+        self._csv_updates: dict[Path, list[CsvUpdate]] = {}
+
+    @property
+    def config(self) -> Config | None:
+        """Config of the current context, falling back to the last one loaded."""
+        config = self._context_config.get()
+        return config if config is not None else self._default_config
+
+    @config.setter
+    def config(self, config: Config | None) -> None:
+        self._default_config = config
+        self._context_config.set(config)
 
     def init_config(self, config_path: str | PathLike) -> Config:
         """Load a YAML config file and set it as the config.
@@ -318,20 +594,64 @@ class MatchUtils:
             Config: The loaded config object (also stored as self.config).
         """
         self.config = Config(config_path)
+        http.configure(self.config)
         return self.config
 
+    @contextmanager
+    def use_config(self, config: Config) -> Iterator[Config]:
+        """Use config for mu calls made in the current context (thread / task)."""
+        token = self._context_config.set(config)
+        try:
+            yield config
+        finally:
+            self._context_config.reset(token)
+
     # -------------------------------------------------------------------
     # Season-map loading
     # -------------------------------------------------------------------
     def load_season_map_raw(self) -> dict:
         """Load season_map.yaml and return the parsed dict.
 
+        The parsed YAML is shared process-wide (see load_season_map_file)
+        until the file changes, so callers must not modify it.
+
         Returns:
             dict: The entire season_map.yaml content.
         """
-        season_map_path = self.config.get_path('paths.season_map_file')
-        with open(season_map_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        return load_season_map_file(self.config.get_path('paths.season_map_file'))
+
+    def load_competition_seasons(self, competition: str, family_key: str = None) -> dict[str, SeasonEntry] | None:
+        """Return the parsed season entries of one competition.
+
+        SeasonEntry objects are built on first use per competition and
+        cached with the parsed season map; callers must not modify them.
+
+        Args:
+            competition: Competition key (e.g. 'J1')
+            family_key: Top-level family key in season_map.yaml.
+                        Defaults to the first family in the YAML.
+
+        Returns:
+            dict[str, SeasonEntry] | None: Season name -> SeasonEntry, or None
+                if the family has no such competition
+        """
+        raw = self.load_season_map_raw()
+        if family_key is None:
+            family_key = next(iter(raw))
+        with _season_maps_lock:
+            # Entries are cached only for maps parsed by load_season_map_file
+            cache = next((parsed.entries for parsed in _season_maps.values() if parsed.raw is raw), {})
+            entries = cache.get((family_key, competition))
+            if entries is None:
+                comp = raw.get(family_key, {}).get('competitions', {}).get(competition)
+                if comp is None:
+                    return None
+                defaults = self._get_competition_count_defaults(comp)
+                view_types = self._get_competition_view_types(comp)
+                entries = {sk: SeasonEntry(sk, entry, defaults, view_types)
+                           for sk, entry in comp.get('seasons', {}).items()}
+                cache[(family_key, competition)] = entries
+            return entries
 
     def load_season_map(self, family_key: str = None) -> dict[str, dict[str, SeasonEntry]]:
         """Load season_map.yaml and extract competitions for the given family.
@@ -353,18 +673,7 @@ class MatchUtils:
         if family_key is None:
             family_key = next(iter(raw))
         family = raw.get(family_key, {}).get('competitions', {})
-        return {
-            comp_key: {
-                sk: SeasonEntry(
-                    sk,
-                    entry,
-                    self._get_competition_count_defaults(comp),
-                    self._get_competition_view_types(comp),
-                )
-                for sk, entry in comp.get('seasons', {}).items()
-            }
-            for comp_key, comp in family.items()
-        }
+        return {comp_key: self.load_competition_seasons(comp_key, family_key) for comp_key in family}
 
     @staticmethod
     def _get_competition_count_defaults(comp: dict[str, Any]) -> dict[str, Any]:
@@ -405,11 +714,10 @@ class MatchUtils:
                 [dict,...] -- multi-group season -> use sub-season update
         """
         cfg = self.config
-        season_map = self.load_season_map(family_key)
-        if competition not in season_map:
+        comp_seasons = self.load_competition_seasons(competition, family_key)
+        if comp_seasons is None:
             return None
 
-        comp_seasons = season_map[competition]
         if hasattr(cfg, 'season'):
             season_str = str(cfg.season)
         else:
@@ -490,13 +798,11 @@ class MatchUtils:
         family_val = family.get('season_start_month', 7)  # code default
 
         season_str = str(self.config.season)
-        for comp in family.get('competitions', {}).values():
+        for comp_key, comp in family.get('competitions', {}).items():
             comp_val = comp.get('season_start_month', family_val)
-            comp_defaults = self._get_competition_count_defaults(comp)
-            comp_view_types = self._get_competition_view_types(comp)
-            for sk, raw_entry in comp.get('seasons', {}).items():
+            for sk in comp.get('seasons', {}):
                 if sk.startswith(season_str):
-                    entry = SeasonEntry(sk, raw_entry, comp_defaults, comp_view_types)
+                    entry = self.load_competition_seasons(comp_key, family_key)[sk]
                     return entry.options.get('season_start_month', comp_val)
         return family_val
 
@@ -520,14 +826,48 @@ class MatchUtils:
         except (ValueError, TypeError):
             return val
 
+    def normalize_dates(self, values: pd.Series) -> pd.Series:
+        """Vectorized to_datetime_aspossible for a whole column.
+
+        Values already in config.standard_date_format (or plain %Y-%m-%d)
+        are parsed in one pass; the remaining distinct values (times,
+        other formats, '未定', ...) go through to_datetime_aspossible, so the
+        result is the same as ``values.map(self.to_datetime_aspossible)``.
+
+        Args:
+            values (pd.Series): Date strings (NaN allowed)
+
+        Returns:
+            pd.Series: Dates in standard format, other values unchanged
+        """
+        cfg = self.config
+        result = values.to_numpy(dtype=object, copy=True)
+        remaining = np.flatnonzero(values.notna().to_numpy())
+        for date_format in dict.fromkeys((cfg.standard_date_format, '%Y-%m-%d')):
+            if not len(remaining):
+                break
+            parsed = pd.to_datetime(pd.Series(result[remaining]), format=date_format, errors='coerce')
+            ok = parsed.notna().to_numpy()
+            result[remaining[ok]] = parsed[ok].dt.strftime(cfg.standard_date_format).to_numpy(dtype=object)
+            remaining = remaining[~ok]
+        if len(remaining):
+            converted = {val: self.to_datetime_aspossible(val) for val in set(result[remaining])}
+            result[remaining] = [converted[val] for val in result[remaining]]
+        return pd.Series(result, index=values.index, name=values.name)
+
     # -------------------------------------------------------------------
     # CSV I/O
     # -------------------------------------------------------------------
-    def read_allmatches_csv(self, matches_file: str) -> pd.DataFrame:
+    def read_allmatches_csv(self, matches_file: str, copy: bool = True) -> pd.DataFrame:
         """Reconstruct the DataFrame structure by reading a match CSV file.
 
+        Parsed files are cached per process and re-read when their
+        modification time or size changes (or update_csv writes them).
+
         Args:
             matches_file: The name of the file to read
+            copy: Return a private copy (default).  With False the cached
+                frame itself is returned and must not be modified.
 
         Returns:
             pd.DataFrame: DataFrame containing match data
@@ -538,11 +878,34 @@ class MatchUtils:
             TypeError: If the date format is not recognized
             KeyError: If the DataFrame does not contain 'match_date' column
         """
+        path = Path(matches_file).resolve()
+        stat = path.stat()
+        version = (stat.st_mtime_ns, stat.st_size, self.config.standard_date_format)
+        with self._cache_lock:
+            cached = self._csv_cache.get(path)
+            hit = cached is not None and cached[0] == version
+            self.csv_cache_stats['hits' if hit else 'misses'] += 1
+        logger.debug("Match CSV cache %s for %s (hits=%d, misses=%d)", 'hit' if hit else 'miss',
+                     matches_file, self.csv_cache_stats['hits'], self.csv_cache_stats['misses'])
+        if hit:
+            all_matches = cached[1]
+        else:
+            all_matches = self._parse_allmatches_csv(matches_file)
+            with self._cache_lock:
+                self._csv_cache[path] = (version, all_matches)
+        return all_matches.copy() if copy else all_matches
+
+    def _parse_allmatches_csv(self, matches_file: str) -> pd.DataFrame:
+        """Read and normalize a match CSV file (see read_allmatches_csv)."""
         logger.info("Reading match file %s", matches_file)
         all_matches = pd.read_csv(matches_file, index_col=0, dtype=str, na_values='')
+        return self._normalize_allmatches(all_matches)
+
+    def _normalize_allmatches(self, all_matches: pd.DataFrame) -> pd.DataFrame:
+        """Normalize match CSV rows read with dtype=str (see read_allmatches_csv)."""
         if 'index' in all_matches.columns:
             all_matches = all_matches.drop(columns=['index'])
-        all_matches['match_date'] = all_matches['match_date'].map(self.to_datetime_aspossible)
+        all_matches['match_date'] = self.normalize_dates(all_matches['match_date'])
         all_matches['home_goal'] = all_matches['home_goal'].fillna('')
         all_matches['away_goal'] = all_matches['away_goal'].fillna('')
         if 'section_no' in all_matches.columns:
@@ -553,50 +916,93 @@ class MatchUtils:
         all_matches = all_matches.where(pd.notnull(all_matches), None)
         return all_matches
 
-    def update_csv(self, match_df: pd.DataFrame, filename: str) -> None:
+    def update_csv(self, match_df: pd.DataFrame, filename: str, csv_text: str = None) -> None:
         """Receive a match DataFrame and filename, and create or update the CSV file.
 
         Args:
             match_df (pd.DataFrame): DataFrame containing match data
             filename (str): Name of the file to be updated
+            csv_text (str, optional): serialize_match_csv(match_df), if already computed
 
         Raises:
             ValueError: If no filename is provided
             TypeError: If the timestamp already has a timezone
         """
         logger.info("Update %s", filename)
-        # Normalize column types (e.g. convert float-format goal strings to int strings).
-        match_df = _normalize_df_for_csv(match_df)
-        # When the match_date contains only date, it is converted and keeps the original format
-        # (date only), but when a string is also included, it seems to output both date and time,
-        # so convert the content of match_date to a string before outputting.
-        match_df['match_date'] = match_df['match_date'].map(lambda x: str(x) if isinstance(x, date) else x)
-        match_df.to_csv(filename, lineterminator='\n')
-        self.update_timestamp(filename)
+        if csv_text is None:
+            csv_text = serialize_match_csv(match_df)
+        data = csv_text.encode('utf-8')
+        with self._cache_lock:
+            self._csv_cache.pop(Path(filename).resolve(), None)
+        Path(filename).write_bytes(data)
+        self.update_timestamp(filename, content_hash=hashlib.sha256(data).hexdigest())
 
     # -------------------------------------------------------------------
     # DataFrame comparison
     # -------------------------------------------------------------------
+    def diff_matches(self, new_df: pd.DataFrame, old_df: pd.DataFrame) -> MatchChangeset:
+        """Compare two match DataFrames row by row using per-row content hashes.
+
+        Rows are matched by MATCH_KEY_COLUMNS; 'match_index_in_section' and
+        the difference between NaN and '' are ignored.  When every key and
+        row hash agrees the (empty) changeset is returned without comparing
+        individual cells.
+
+        Args:
+            new_df (pd.DataFrame): Newly read match data
+            old_df (pd.DataFrame): Current match data (e.g. from the CSV)
+
+        Returns:
+            MatchChangeset: Added, removed and changed rows (falsy if identical)
+        """
+        key_columns = [col for col in MATCH_KEY_COLUMNS if col in new_df.columns and col in old_df.columns]
+        new_rows = _keyed_rows(new_df, key_columns)
+        old_rows = _keyed_rows(old_df, key_columns)
+        columns_added = [col for col in new_rows.columns if col not in old_rows.columns]
+        columns_removed = [col for col in old_rows.columns if col not in new_rows.columns]
+        common = [col for col in new_rows.columns if col in old_rows.columns]
+
+        new_hashes = _row_hashes(new_rows[common])
+        old_hashes = _row_hashes(old_rows[common])
+        if not columns_added and not columns_removed and len(new_hashes) == len(old_hashes):
+            aligned = old_hashes.reindex(new_hashes.index)
+            if aligned.notna().all() and (aligned.to_numpy() == new_hashes.to_numpy()).all():
+                return MatchChangeset(key_columns, new_df.iloc[:0], old_df.iloc[:0])
+
+        added = new_rows.index.difference(old_rows.index, sort=False)
+        removed = old_rows.index.difference(new_rows.index, sort=False)
+        both = new_rows.index.intersection(old_rows.index, sort=False)
+        differs = new_hashes[both].to_numpy() != old_hashes[both].to_numpy()
+        changed_keys = both[differs]
+        changed = {}
+        for key in changed_keys:
+            new_row = new_rows.loc[key, common]
+            old_row = old_rows.loc[key, common]
+            changed[key] = {col: (old_row[col], new_row[col]) for col in common if old_row[col] != new_row[col]}
+        return MatchChangeset(
+            key_columns,
+            added=new_df.iloc[new_rows.index.get_indexer(added)],
+            removed=old_df.iloc[old_rows.index.get_indexer(removed)],
+            changed=changed, columns_added=columns_added, columns_removed=columns_removed,
+            changed_rows=new_df.iloc[new_rows.index.get_indexer(changed_keys)])
+
     def matches_differ(self, foo_df: pd.DataFrame, bar_df: pd.DataFrame) -> bool:
         """Return True if two match DataFrames differ (ignoring 'match_index_in_section' and NaNs)."""
-        _foo = foo_df.drop(columns=['match_index_in_section'], errors='ignore').fillna('')
-        _bar = bar_df.drop(columns=['match_index_in_section'], errors='ignore').fillna('')
-        _foo = _foo.reindex(sorted(_foo.columns), axis=1)
-        _bar = _bar.reindex(sorted(_bar.columns), axis=1)
-        _foo = _sort_match_rows(_foo)
-        _bar = _sort_match_rows(_bar)
-
-        if not _foo.equals(_bar):
-            if logger.isEnabledFor(logging.DEBUG):
-                df_comp = _foo.compare(_bar)
-                for col_name in df_comp.columns.droplevel(1).unique():
-                    logger.debug("%s\n%s", col_name, df_comp[col_name].dropna())
+        changeset = self.diff_matches(foo_df, bar_df)
+        if changeset:
+            logger.debug("%s", changeset.summary())
             return True
         return False
 
     def update_if_diff(self, match_df: pd.DataFrame, filename: str) -> bool:
         """Receive a match DataFrame and filename; overwrite the file if contents differ.
 
+        The new data is serialized once and its SHA-256 compared with the hash
+        recorded when the CSV was written (config.content_hash_path).  Only when
+        they differ (or no hash is recorded yet) is the existing CSV loaded
+        and compared row by row, so that a mere reordering does not rewrite
+        the file.
+
         Args:
             match_df (pd.DataFrame): DataFrame containing match data
             filename (str): Name of the file to be updated
@@ -611,48 +1017,100 @@ class MatchUtils:
         if not filename:
             raise ValueError("Filename is mandatory")
 
+        csv_text = serialize_match_csv(match_df)
+        data = csv_text.encode('utf-8')
+        new_hash = hashlib.sha256(data).hexdigest()
         # If the old file doesn't exist, write new CSV and exit
         if not Path(filename).exists():
-            self.update_csv(match_df, filename)
+            self.update_csv(match_df, filename, csv_text)
+            self._record_csv_update(filename, CsvUpdate(None, new_hash, None))
             return True
 
-        old_df = self.read_allmatches_csv(filename)
+        stored_hash = self.get_content_hash(filename)
+        if stored_hash == new_hash and Path(filename).stat().st_size == len(data):
+            logger.info("No changes found in %s (content hash)", filename)
+            return False
+
+        old_df = self.read_allmatches_csv(filename, copy=False)
         # Overwrite if there are differences
-        if self.matches_differ(match_df, old_df):
-            self.update_csv(match_df, filename)
+        changeset = self.diff_matches(match_df, old_df)
+        if changeset:
+            logger.debug("%s", changeset.summary())
+            old_hash = hashlib.sha256(Path(filename).read_bytes()).hexdigest()
+            self.update_csv(match_df, filename, csv_text)
+            row_level = not (changeset.columns_added or changeset.columns_removed)
+            self._record_csv_update(filename, CsvUpdate(
+                old_hash, new_hash, frozenset(changeset.match_dates()) if row_level else None))
             return True
 
-        # No changes found; do nothing
+        # No changes found; record the hash of the file as it is for the next run
         logger.info("No changes found in %s", filename)
+        file_hash = hashlib.sha256(Path(filename).read_bytes()).hexdigest()
+        if file_hash != stored_hash:
+            self.store_content_hash(filename, file_hash)
         return False
 
+    def _record_csv_update(self, filename: str, update: CsvUpdate) -> None:
+        with self._cache_lock:
+            self._csv_updates.setdefault(Path(filename).resolve(), []).append(update)
+
+    def take_csv_updates(self, filename: str) -> list[CsvUpdate]:
+        """Return and forget the rewrites of a CSV by update_if_diff in this process.
+
+        Derived files (e.g. the standings timeline) use them to redo only
+        the part affected by the changed rows.
+
+        Args:
+            filename (str): CSV path
+
+        Returns:
+            list[CsvUpdate]: Rewrites in the order they were made
+        """
+        with self._cache_lock:
+            return self._csv_updates.pop(Path(filename).resolve(), [])
+
     # -------------------------------------------------------------------
     # Timestamp management
     # -------------------------------------------------------------------
-    def update_timestamp(self, filename: str) -> None:
-        """Read the timestamp record file and update the timestamp of the given filename to the current time.
+    def update_timestamp(self, filename: str, content_hash: str = None) -> None:
+        """Set the timestamp of the given filename to the current time.
+
+        The record is written to the timestamp file by flush_timestamps()
+        (at the latest when the process exits).
 
         Args:
             filename (str): Name of the file to update the timestamp for
-
-        Raises:
-            ValueError:
-            TypeError:
+            content_hash (str, optional): SHA-256 of the written file (see update_if_diff);
+                None clears the recorded hash
         """
+        now = datetime.now().astimezone(_ensure_tzinfo(self.config.timezone))
+        self._timestamp_store().set(filename, date=now, sha256=content_hash)
+
+    def store_content_hash(self, filename: str, content_hash: str) -> None:
+        """Record the SHA-256 of an unchanged file without touching its timestamp."""
+        self._timestamp_store().set(filename, sha256=content_hash)
+
+    def get_content_hash(self, filename: str) -> str | None:
+        """Return the SHA-256 recorded for filename when it was last written, or None."""
+        entry = self._timestamp_store().get(filename)
+        return entry['sha256'] if entry is not None else None
+
+    def flush_timestamps(self) -> None:
+        """Write pending timestamp updates of the current config's timestamp file."""
+        self._timestamp_store().flush()
+
+    def _timestamp_store(self) -> TimestampStore:
+        """Return the (process-wide) store of the current config's timestamp file."""
         cfg = self.config
-        timestamp_file = cfg.get_path('paths.timestamp_file')
-        if timestamp_file.exists():
-            timestamp = pd.read_csv(timestamp_file, index_col=0, parse_dates=[1])
-            timestamp['date'] = timestamp['date'].apply(
-                lambda x: x.tz_localize(cfg.timezone) if x.tz is None else x.tz_convert(cfg.timezone))
-        else:
-            timestamp = pd.DataFrame(columns=['date'])
-            timestamp.index.name = 'file'
-        timestamp.loc[filename] = datetime.now().astimezone(_ensure_tzinfo(cfg.timezone))
-        if timestamp.index.duplicated().any():
-            logger.warning("Duplicates in timestamp file were consolidated (keeping most recent values)")
-            timestamp = drop_duplicated_indexes(timestamp)
-        timestamp.to_csv(timestamp_file, lineterminator='\n')
+        path = Path(cfg.get_path('paths.timestamp_file')).resolve()
+        with self._cache_lock:
+            store = self._timestamp_stores.get(path)
+            if store is None:
+                hash_path = getattr(cfg, 'content_hash_path', None)
+                store = TimestampStore(path, _ensure_tzinfo(cfg.timezone),
+                                       Path(hash_path).resolve() if hash_path else None)
+                self._timestamp_stores[path] = store
+            return store
 
     def get_timestamp_from_csv(self, filename: str) -> datetime:
         """Read the acquisition time from the match data update timestamp CSV.
@@ -667,16 +1125,12 @@ class MatchUtils:
             datetime: Timestamp of the file in local time
 
         Raises:
-            ValueError: If the filename is not found in the timestamp file
-            TypeError: If the timestamp already has a timezone
+            FileNotFoundError: If there is no record and the file does not exist
         """
         cfg = self.config
-        timestamp_file = cfg.get_path('paths.timestamp_file')
-        if timestamp_file.exists():
-            timestamp = pd.read_csv(timestamp_file, index_col=0, parse_dates=[1])
-            timestamp = timestamp[~timestamp.index.duplicated(keep="first")]
-            if filename in timestamp.index:
-                return timestamp.loc[filename]['date']
+        entry = self._timestamp_store().get(filename)
+        if entry is not None and entry['date'] is not None:
+            return pd.Timestamp(entry['date'])
         logger.info("Timestamp fallback to file mtime for %s", filename)
         return datetime.fromtimestamp(Path(filename).stat().st_mtime).astimezone(_ensure_tzinfo(cfg.timezone))
 
@@ -685,6 +1139,296 @@ class MatchUtils:
 mu = MatchUtils()
 
 
+# ---------------------------------------------------------------------------
+# Whole-archive match index
+# ---------------------------------------------------------------------------
+# Version of the persistent MatchArchive index format
+ARCHIVE_INDEX_VERSION = 1
+_ISO_DATE_RE = re.compile(r'^(\d{4})[/-](\d{1,2})[/-](\d{1,2})$')
+
+
+@dataclass(frozen=True)
+class ArchiveFile:
+    """A match CSV of the archive.
+
+    Attributes:
+        path: CSV path as formatted from paths.csv_format (timestamp key form)
+        family: Family key in season_map.yaml
+        competition: Competition key
+        season: Season name of the file (e.g. '2025', '2026East', '1993A')
+        season_key: Season key in season_map.yaml ('1993' for '1993A')
+    """
+    path: str
+    family: str
+    competition: str
+    season: str
+    season_key: str
+
+
+def _iso_date(text: str) -> str | None:
+    """Return 'YYYY-MM-DD' for a 'YYYY/MM/DD' or 'YYYY-MM-DD' match_date, else None."""
+    found = _ISO_DATE_RE.match(text)
+    if found is None:
+        return None
+    year, month, day = found.groups()
+    return f'{year}-{int(month):02d}-{int(day):02d}'
+
+
+def _index_rows(values: list[str]) -> dict[str, list[int]]:
+    """Map each non-empty value to the row positions where it occurs."""
+    rows: dict[str, list[int]] = {}
+    for pos, value in enumerate(values):
+        if value:
+            rows.setdefault(value, []).append(pos)
+    return rows
+
+
+class MatchArchive:
+    """Cross-season queries over every match CSV listed in season_map.yaml.
+
+    Files are discovered from season_map.yaml and paths.csv_format: each
+    (competition, season) pair maps to one CSV; a season whose own file
+    does not exist covers its stage files instead ('1993' -> 1993A, 1993B).
+
+    A secondary index (team -> rows, date -> rows, season -> file) is kept
+    per file and stored as JSON at index_path.  refresh(), which every
+    query runs first, re-indexes only the files whose content hash changed; files with the same mtime and size
+    are not even hashed.  Queries read the index and load only the files
+    with matching rows: a file that is already loaded is sliced, and a
+    selection of single rows is read line by line (the index keeps the byte
+    offsets of every row).  Whole files are parsed as read_allmatches_csv
+    does and the last max_loaded of them are kept in memory.
+
+    Usage::
+
+        archive = MatchArchive()
+        archive.matches('鹿島', '浦和')
+        archive.matches('浦和', competition='JLeagueCup', date_from='2020-01-01')
+    """
+
+    def __init__(self, utils: MatchUtils = None, index_path: str | PathLike = None, max_loaded: int = 16):
+        """Create an archive over the CSVs of utils.config (mu by default).
+
+        Args:
+            utils: MatchUtils with a config providing paths.csv_format and paths.season_map_file
+            index_path: JSON file for the persistent index
+                [default: config.archive_index_path; kept in memory only if unset]
+            max_loaded: Number of parsed CSVs kept in memory (LRU)
+        """
+        self.utils = utils if utils is not None else mu
+        if index_path is None:
+            index_path = getattr(self.utils.config, 'archive_index_path', None)
+        self.index_path = Path(index_path) if index_path is not None else None
+        self.max_loaded = max_loaded
+        self._lock = threading.RLock()
+        self._files: list[ArchiveFile] | None = None
+        self._index: dict[str, dict[str, Any]] = self._read_index()
+        self._loaded: OrderedDict[str, pd.DataFrame] = OrderedDict()
+        self.load_stats = {'hits': 0, 'misses': 0}
+
+    def _read_index(self) -> dict[str, dict[str, Any]]:
+        if self.index_path is None:
+            return {}
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignore unreadable archive index %s: %s", self.index_path, e)
+            return {}
+        if data.get('version') != ARCHIVE_INDEX_VERSION:
+            logger.info("Archive index %s has another version; rebuilding", self.index_path)
+            return {}
+        return data['files']
+
+    def _write_index(self) -> None:
+        if self.index_path is None:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_name(f'{self.index_path.name}.{os.getpid()}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': ARCHIVE_INDEX_VERSION, 'files': self._index}, f, ensure_ascii=False)
+        os.replace(tmp, self.index_path)
+
+    def files(self) -> list[ArchiveFile]:
+        """Return the existing match CSVs in season_map.yaml order."""
+        with self._lock:
+            if self._files is None:
+                self._files = self._discover()
+            return list(self._files)
+
+    def _discover(self) -> list[ArchiveFile]:
+        cfg = self.utils.config
+        files = []
+        seen = set()
+        for family_key, family in self.utils.load_season_map_raw().items():
+            for competition, comp in family.get('competitions', {}).items():
+                # Text around {season} in this competition's file name
+                prefix, _, suffix = cfg.get_format_str('paths.csv_format', season='\0',
+                                                       competition=competition).partition('\0')
+                for season_key in comp.get('seasons', {}):
+                    path = f'{prefix}{season_key}{suffix}'
+                    if Path(path).exists():
+                        paths = [path]
+                    else:
+                        pattern = Path(f'{prefix}{season_key}*{suffix}')
+                        paths = sorted(str(p) for p in pattern.parent.glob(pattern.name))
+                    for path in paths:
+                        if path in seen:
+                            continue
+                        seen.add(path)
+                        season = path[len(prefix):len(path) - len(suffix)]
+                        files.append(ArchiveFile(path, family_key, competition, season, season_key))
+        return files
+
+    def refresh(self) -> int:
+        """Bring the index up to date with the files on disk.
+
+        Returns:
+            int: Number of files (re-)indexed
+        """
+        with self._lock:
+            self._files = self._discover()
+            current = {file.path for file in self._files}
+            dirty = False
+            for path in [path for path in self._index if path not in current]:
+                del self._index[path]
+                dirty = True
+            reindexed = 0
+            for file in self._files:
+                stat = Path(file.path).stat()
+                entry = self._index.get(file.path)
+                if entry is not None and entry['stat'] == [stat.st_mtime_ns, stat.st_size]:
+                    continue
+                data = Path(file.path).read_bytes()
+                digest = hashlib.sha256(data).hexdigest()
+                if entry is None or entry['sha256'] != digest:
+                    entry = self._index_file(data)
+                    entry['sha256'] = digest
+                    self._loaded.pop(file.path, None)
+                    reindexed += 1
+                entry['stat'] = [stat.st_mtime_ns, stat.st_size]
+                self._index[file.path] = entry
+                dirty = True
+            if dirty:
+                self._write_index()
+            logger.debug("Archive index: %d files, %d re-indexed", len(self._files), reindexed)
+            return reindexed
+
+    @staticmethod
+    def _index_file(data: bytes) -> dict[str, Any]:
+        """Build the index entry of one CSV (row positions as in read_allmatches_csv)."""
+        df = pd.read_csv(io.BytesIO(data), usecols=['match_date', 'home_team', 'away_team'],
+                         dtype=str, keep_default_na=False)
+        teams = _index_rows(df['home_team'].tolist())
+        for team, rows in _index_rows(df['away_team'].tolist()).items():
+            teams[team] = sorted(teams.get(team, []) + rows)
+        dates = _index_rows([_iso_date(text) or '' for text in df['match_date']])
+        # Byte offsets of the header end and of each row end, so queries can read
+        # single rows.  Not available if a quoted cell spans lines.
+        ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord('\n')) + 1
+        offsets = ends.tolist() if len(ends) == len(df) + 1 and ends[-1] == len(data) else None
+        header = data[:ends[0]].decode('utf-8') if len(ends) else ''
+        return {'rows': len(df), 'header': header, 'offsets': offsets, 'teams': teams, 'dates': dates}
+
+    def load(self, path: str) -> pd.DataFrame:
+        """Return the parsed CSV at path (as read_allmatches_csv; shared, do not modify)."""
+        with self._lock:
+            frame = self._loaded.get(path)
+            if frame is not None:
+                self._loaded.move_to_end(path)
+                self.load_stats['hits'] += 1
+                return frame
+            self.load_stats['misses'] += 1
+        frame = self.utils._parse_allmatches_csv(path)
+        with self._lock:
+            self._loaded[path] = frame
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+        return frame
+
+    def matches(self, team: str = None, opponent: str = None, competition: str = None,
+                season: str = None, date_from: date | str = None, date_to: date | str = None) -> pd.DataFrame:
+        """Return the matches that satisfy every given condition.
+
+        Args:
+            team: Team playing (home or away)
+            opponent: Other team of the match (requires team)
+            competition: Competition key (e.g. 'J1')
+            season: File season ('1993A') or season_map key ('1993')
+            date_from: First match date (inclusive; date or 'YYYY-MM-DD')
+            date_to: Last match date (inclusive)
+
+        Returns:
+            pd.DataFrame: Matching rows with 'competition' and 'season' columns
+                added in front, in season_map.yaml order
+        """
+        if opponent is not None and team is None:
+            raise ValueError("opponent requires team")
+        self.refresh()
+        first = str(date_from) if date_from is not None else None
+        last = str(date_to) if date_to is not None else None
+        selected = []
+        # Rows read line by line, grouped by CSV header: header -> [(order, file, rows)]
+        partial: dict[str, list[tuple[int, ArchiveFile, list[int]]]] = {}
+        for order, file in enumerate(self.files()):
+            if competition is not None and file.competition != competition:
+                continue
+            if season is not None and season not in (file.season, file.season_key):
+                continue
+            entry = self._index[file.path]
+            rows = None
+            if team is not None:
+                rows = set(entry['teams'].get(team, ()))
+                if opponent is not None:
+                    rows &= set(entry['teams'].get(opponent, ()))
+            if first is not None or last is not None:
+                dated = {pos for day, positions in entry['dates'].items()
+                         if (first is None or day >= first) and (last is None or day <= last)
+                         for pos in positions}
+                rows = dated if rows is None else rows & dated
+            rows = sorted(rows) if rows is not None else None
+            if rows == []:
+                continue
+            if file.path not in self._loaded and rows is not None and entry['offsets'] is not None:
+                partial.setdefault(entry['header'], []).append((order, file, rows))
+                continue
+            frame = self.load(file.path)
+            if rows is not None:
+                frame = frame.iloc[rows]
+            selected.append((order, file, frame))
+        pieces = [frame.assign(competition=file.competition, season=file.season, _order=order)
+                  for order, file, frame in selected]
+        if partial:
+            pieces.append(self._read_rows(partial))
+        if not pieces:
+            return pd.DataFrame(columns=['competition', 'season'])
+        result = pd.concat(pieces, ignore_index=True) if len(pieces) > 1 else pieces[0]
+        result = result.sort_values('_order', kind='stable', ignore_index=True).drop(columns='_order')
+        return result[['competition', 'season'] + [col for col in result.columns
+                                                   if col not in ('competition', 'season')]]
+
+    def _read_rows(self, partial: dict[str, list[tuple[int, ArchiveFile, list[int]]]]) -> pd.DataFrame:
+        """Read single rows of several files (grouped by CSV header) and normalize them once."""
+        frames = []
+        for header, parts in partial.items():
+            lines = [header.encode('utf-8')]
+            for _, file, rows in parts:
+                offsets = self._index[file.path]['offsets']
+                with open(file.path, 'rb') as f:
+                    for pos in rows:
+                        f.seek(offsets[pos])
+                        lines.append(f.read(offsets[pos + 1] - offsets[pos]))
+            frame = pd.read_csv(io.BytesIO(b''.join(lines)), index_col=0, dtype=str, na_values='')
+            counts = [len(rows) for _, _, rows in parts]
+            frame['competition'] = np.repeat([file.competition for _, file, _ in parts], counts)
+            frame['season'] = np.repeat([file.season for _, file, _ in parts], counts)
+            frame['_order'] = np.repeat([order for order, _, _ in parts], counts)
+            frames.append(frame)
+        return self.utils._normalize_allmatches(pd.concat(frames) if len(frames) > 1 else frames[0])
+
+
 # ---------------------------------------------------------------------------
 # Standalone functions (no config dependency)
 # ---------------------------------------------------------------------------
@@ -814,31 +1558,119 @@ def get_season_from_date(reference_date: date = None, season_start_month: int =
     return f"{start_year % 100:02d}-{(start_year + 1) % 100:02d}"
 
 
-def _normalize_df_for_csv(df: pd.DataFrame) -> pd.DataFrame:
+def kickoff_times(matches: pd.DataFrame, tz: str | tzinfo) -> pd.Series:
+    """Return the kickoff time of every match as a timezone-aware Series.
+
+    Computed in one vectorized pass over the whole frame.  Any start_time not
+    matching HH:MM (e.g. '未定', '-', '中止') is treated as '00:00'; rows
+    without a match_date give NaT.
+
+    Args:
+        matches (pd.DataFrame): Match data with 'match_date' and 'start_time' columns
+        tz (str | tzinfo): Timezone the dates and times are given in
+
+    Returns:
+        pd.Series: Kickoff timestamps, aligned with matches.index
+
+    Raises:
+        KeyError: If the DataFrame does not contain 'start_time' or 'match_date' columns
+        ValueError: If a match_date is not in a recognizable date format
+    """
+    start_time = matches['start_time'].astype('string')
+    is_valid_time = start_time.str.match(r'^\d{1,2}:\d{2}$').fillna(False).astype(bool)
+    start_time = start_time.where(is_valid_time, '00:00')
+    kickoff = pd.to_datetime(matches['match_date'].astype('string') + ' ' + start_time)
+    return kickoff.dt.tz_localize(tz)
+
+
+def sections_live_between(matches: pd.DataFrame, start: datetime, end: datetime,
+                          tz: str | tzinfo, duration: timedelta = MATCH_DURATION) -> set[int]:
+    """Return the sections with a match in progress at some point between start and end.
+
+    A match is in progress from its kickoff until kickoff + duration, so a
+    section is returned when any of its [kickoff, kickoff + duration]
+    intervals overlaps [start, end].  All matches are tested at once.
+
+    Args:
+        matches (pd.DataFrame): Match data with 'section_no', 'match_date' and 'start_time'
+        start (datetime): Start of the period (timezone-aware)
+        end (datetime): End of the period (timezone-aware)
+        tz (str | tzinfo): Timezone of match_date / start_time
+        duration (timedelta): Assumed match length
+
+    Returns:
+        set[int]: Section numbers with a match live in the period
+    """
+    matches = matches.dropna(subset=['match_date'])
+    kickoff = kickoff_times(matches, tz)
+    live = (kickoff <= end) & (kickoff + duration >= start)
+    return set(matches.loc[live, 'section_no'])
+
+
+def normalize_nullable_int(values: pd.Series) -> pd.Series:
+    """Format a 'nullable_int' column as integer strings, keeping empty cells empty.
+
+    Equivalent of ``str(int(float(x))) if x != '' else ''`` per cell
+    (NaN/None count as empty): '2.0' -> '2', 3 -> '3'.  The expression is
+    evaluated once per distinct value (goals, PK scores and attendance
+    repeat heavily) and spread back with the factorized codes, so invalid
+    values still raise ValueError as before.
+
+    Args:
+        values (pd.Series): Column values (str, int, float or NaN)
+
+    Returns:
+        pd.Series: Integer strings or '' (same index)
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    # The trailing '' is picked by the NA sentinel (-1).
+    formatted = np.array([str(int(float(x))) if x != '' else '' for x in uniques] + [''], dtype=object)
+    return pd.Series(formatted[codes], index=values.index, name=values.name)
+
+
+def normalize_df_for_csv(df: pd.DataFrame, columns: list[str] = None) -> pd.DataFrame:
     """Normalize DataFrame columns to their declared types before CSV output.
 
     Converts 'nullable_int' columns from float-format strings (e.g. '2.0')
     to plain integer strings ('2'), leaving empty strings unchanged.
     Only columns present in the DataFrame and listed in CSV_COLUMN_SCHEMA
-    are processed.
+    are processed.  Shared by every CSV writer (update_csv and
+    scripts/make_old_matches_csv.py).
 
     Args:
         df (pd.DataFrame): Match DataFrame to normalize.
+        columns (list[str], optional): Restrict to these columns [default: all in the schema]
 
     Returns:
         pd.DataFrame: Normalized copy of the DataFrame.
     """
     df = df.copy()
     for col, dtype in CSV_COLUMN_SCHEMA.items():
-        if col not in df.columns:
+        if col not in df.columns or (columns is not None and col not in columns):
             continue
         if dtype == 'nullable_int':
-            df[col] = df[col].fillna('').apply(
-                lambda x: str(int(float(x))) if x != '' else x
-            )
+            df[col] = normalize_nullable_int(df[col])
     return df
 
 
+def serialize_match_csv(match_df: pd.DataFrame) -> str:
+    """Return the CSV text written by MatchUtils.update_csv (canonical serialization).
+
+    Args:
+        match_df (pd.DataFrame): DataFrame containing match data
+
+    Returns:
+        str: CSV text (LF line endings)
+    """
+    # Normalize column types (e.g. convert float-format goal strings to int strings).
+    match_df = normalize_df_for_csv(match_df)
+    # When the match_date contains only date, it is converted and keeps the original format
+    # (date only), but when a string is also included, it seems to output both date and time,
+    # so convert the content of match_date to a string before outputting.
+    match_df['match_date'] = match_df['match_date'].map(lambda x: str(x) if isinstance(x, date) else x)
+    return match_df.to_csv(lineterminator='\n')
+
+
 def drop_duplicated_indexes(df: pd.DataFrame) -> pd.DataFrame:
     """For rows in the DataFrame with duplicate 'file' indexes, keep only the latest one based on 'date'.
 
@@ -36,8 +36,8 @@ from typing import Any
 
 from bs4 import BeautifulSoup, Tag
 import pandas as pd
-import requests
 
+from http_client import add_archive_args, http
 from match_utils import mu, CSV_COLUMN_SCHEMA
 
 logger = logging.getLogger(__name__)
@@ -259,7 +259,7 @@ def _parse_page(soup: BeautifulSoup, mode: str) -> list[dict[str, Any]]:
 def fetch_and_parse(url: str, mode: str) -> list[dict[str, Any]]:
     """Fetch *url*, parse according to *mode*, and return match records."""
     logger.info('GET %s', url)
-    resp = requests.get(url, headers=_HEADERS, timeout=60)
+    resp = http.get(url, headers=_HEADERS)
     resp.raise_for_status()
     soup = BeautifulSoup(resp.text, 'lxml')
     return _parse_page(soup, mode)
@@ -286,6 +286,7 @@ def make_args() -> argparse.Namespace:
         help='Output CSV path (relative to src/ working dir, e.g. ../docs/csv/...)',
     )
     parser.add_argument('-d', '--debug', action='store_true')
+    add_archive_args(parser)
     return parser.parse_args()
 
 
@@ -300,6 +301,7 @@ if __name__ == '__main__':
         format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
         datefmt='%H:%M:%S',
     )
+    http.apply_archive_args(_args)
 
     # Use acle.yaml for timestamp tracking (both ACL competitions share the
     # same docs/csv/ directory and csv_timestamp.csv file).
@@ -24,8 +24,8 @@ from typing import Any
 
 from bs4 import BeautifulSoup
 import pandas as pd
-import requests
 
+from http_client import add_archive_args, http
 from match_utils import mu, get_season_from_date, CSV_COLUMN_SCHEMA
 
 logger = logging.getLogger(__name__)
@@ -147,9 +147,7 @@ def read_section(section_id: str, start_year: int) -> list[dict[str, Any]]:
         f"{mu.config.urls.competition_id}/{section_id}/"
     )
     logger.info("GET %s", url)
-    soup = BeautifulSoup(
-        requests.get(url, timeout=mu.config.http_timeout).text, 'lxml'
-    )
+    soup = BeautifulSoup(http.get(url).text, 'lxml')
     return _parse_page(soup, start_year)
 
 
@@ -164,6 +162,7 @@ def make_args() -> argparse.Namespace:
     )
     parser.add_argument('-d', '--debug', action='store_true',
                         help='Enable debug output')
+    add_archive_args(parser)
     return parser.parse_args()
 
 
@@ -177,6 +176,7 @@ if __name__ == '__main__':
         format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
         datefmt='%H:%M:%S',
     )
+    http.apply_archive_args(_args)
 
     _season = _args.season or get_season_from_date(
         season_start_month=mu.config.season_start_month
@@ -9,8 +9,8 @@ from typing import Any
 
 from bs4 import BeautifulSoup
 import pandas as pd
-import requests
 
+from http_client import add_archive_args, http
 from match_utils import mu
 
 logger = logging.getLogger(__name__)
@@ -30,7 +30,7 @@ def read_match(section_id: str) -> list[dict[str, Any]]:
     """
     _url = mu.config.get_format_str('urls.source_url_format', section_id)
     logger.info("Access %s", _url)
-    soup = BeautifulSoup(requests.get(_url, timeout=mu.config.http_timeout).text, 'lxml')
+    soup = BeautifulSoup(http.get(_url).text, 'lxml')
     return read_match_from_web(soup)
 
 
@@ -114,6 +114,7 @@ def make_args() -> argparse.Namespace:
                     'Read ACL group stage match data and save as CSV/JSON')
     parser.add_argument('-d', '--debug', action='store_true',
                         help='Enable debug output')
+    add_archive_args(parser)
     return parser.parse_args()
 
 
@@ -127,6 +128,7 @@ if __name__ == '__main__':
         format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
         datefmt='%H:%M:%S',
     )
+    http.apply_archive_args(_args)
 
     match_df = pd.DataFrame()
     for section in mu.config.section_ids:
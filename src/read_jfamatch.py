@@ -34,6 +34,7 @@ The `use_venue_timezone` (bool) tags each row with the source IANA timezone
   single `timezone_diff` cannot apply. start_time stays as venue-local time.
 """
 import argparse
+from datetime import datetime
 from datetime import timedelta
 import json
 import logging
@@ -45,11 +46,16 @@ from typing import Any
 import pandas as pd
 import requests
 
+from http_client import add_archive_args, http
+from live_poller import LiveFeed, LivePoller, live_sections, match_duration, next_kickoff
 from match_utils import assign_bracket_section_no, mu
 from set_config import Config
 
 logger = logging.getLogger(__name__)
 
+# Attempts at a match JSON that does not parse (transport errors are retried by http_client)
+JSON_ATTEMPTS = 2
+
 
 def _prepare_config() -> Config:
     """Reads the configuration file and prepares the config object.
@@ -161,24 +167,22 @@ def read_match_json(_url: str) -> dict[str, Any]:
         Dict[str, Any]: Parsed JSON data
                         Return an empty list if the data is not available
     """
-    result = None
-    counter = 0
-    while result is None and counter < 10:
+    for attempt in range(1, JSON_ATTEMPTS + 1):
         try:
             logger.info("Access %s", _url)
-            response = requests.get(_url, timeout=config.http_timeout)
+            response = http.get_conditional(_url)
             if response.status_code == 404:
                 logger.warning("Match data not found (404): %s", _url)
                 return json.loads('{"matchScheduleList":{"matchSchedule": []}}')
             response.raise_for_status()
-            result = json.loads(response.text)
-        except (TypeError, json.JSONDecodeError, requests.RequestException) as _ex:
-            logger.warning("Retry %d/%d: %s", counter, 10, _ex)
-
-        counter += 1
-    if result is not None:
-        return result
-    logger.error("Failed to get match data for %s after %d tries", _url, counter)
+            return json.loads(response.text)
+        except requests.RequestException as _ex:
+            logger.error("Failed to get match data for %s: %s", _url, _ex)
+            break
+        except (TypeError, json.JSONDecodeError) as _ex:
+            logger.warning("Invalid match data (%d/%d): %s", attempt, JSON_ATTEMPTS, _ex)
+    else:
+        logger.error("Failed to get match data for %s after %d tries", _url, JSON_ATTEMPTS)
     return json.loads('{"matchScheduleList":{"matchSchedule": []}}')
 
 
@@ -465,9 +469,47 @@ def calc_time_diff(org_date: pd.Series, org_time: pd.Series, diff_str: str) -> p
     return pd.to_datetime(org_date + 'T' + org_time) + time_diff
 
 
-def make_args() -> argparse.Namespace:
+class JfaLiveFeed(LiveFeed):
+    """Live-poll target for one JFA competition (e.g. WC2026), with its CSV kept in memory.
+
+    The JFA schedule JSON covers the whole competition, so a poll re-reads all
+    groups while any match is in progress.  Rows tagged with a venue
+    'timezone' are checked in their own timezone.
+    """
+
+    def __init__(self, competition: str):
+        self.name = competition
+        self.comp_conf = config.competitions[competition]
+        if 'years' in self.comp_conf:
+            raise ValueError(f"Cannot poll multi-year competition {competition}")
+        self.csv_path = self.comp_conf.csv_path
+        self.duration = match_duration(config)
+        if Path(self.csv_path).exists():
+            self.frame = mu.read_allmatches_csv(self.csv_path)
+        else:
+            logger.warning("Skip %s: no CSV yet (run once without --daemon)", self.csv_path)
+            self.frame = pd.DataFrame()
+
+    def is_live(self, now: datetime) -> bool:
+        return not self.frame.empty and bool(live_sections(self.frame, now, config.timezone, self.duration))
+
+    def next_kickoff(self, now: datetime) -> datetime | None:
+        return None if self.frame.empty else next_kickoff(self.frame, now, config.timezone)
+
+    def poll(self, now: datetime) -> bool:
+        match_df = _finalize_match_df(read_all_group(self.comp_conf), self.comp_conf, self.name)
+        if not mu.update_if_diff(match_df, self.csv_path):
+            return False
+        self.frame = match_df
+        return True
+
+
+def make_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Create command line arguments for the script.
 
+    Args:
+        argv (list[str] | None): Arguments to parse (default: sys.argv[1:])
+
     Returns:
         argparse.Namespace: Parsed command line arguments
     """
@@ -480,6 +522,8 @@ def make_args() -> argparse.Namespace:
                         f'{config.competition_names}', default=['PrincePremierE'])
     parser.add_argument('-d', '--debug', action='store_true',
                         help='Enable debug mode.')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep running and re-read competitions while their matches are in progress.')
     parser.add_argument(
         '--all-years',
         action='store_true',
@@ -491,19 +535,36 @@ def make_args() -> argparse.Namespace:
         help='Explicit years to fetch, e.g. 2014 or 2014,2024 or 2014-2024.',
     )
 
-    return parser.parse_args()
+    add_archive_args(parser)
+    return parser.parse_args(argv)
 
 
-if __name__ == '__main__':
-    os.chdir(Path(__file__).parent)
+def main(argv: list[str] | None = None) -> None:
+    """Read the competitions given on the command line and update their CSVs.
 
-    args = make_args()
+    Relative paths in the config are resolved against the current directory,
+    which must be src/ (see __main__ and update_orchestrator.py).
+    """
+    args = make_args(argv)
     logging.basicConfig(
         level=logging.DEBUG if args.debug else logging.INFO,
         format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
         datefmt='%H:%M:%S',
     )
+    http.apply_archive_args(args)
+
+    with mu.use_config(config):
+        if args.daemon:
+            try:
+                LivePoller.from_config([JfaLiveFeed(compt) for compt in args.competition], config).run()
+            except KeyboardInterrupt:
+                logger.info("Live polling stopped")
+        else:
+            requested_years = _parse_years(args.years) if args.years else None
+            for compt in args.competition:
+                read_group(compt, requested_years=requested_years, fetch_all_years=args.all_years)
+
 
-    requested_years = _parse_years(args.years) if args.years else None
-    for compt in args.competition:
-        read_group(compt, requested_years=requested_years, fetch_all_years=args.all_years)
+if __name__ == '__main__':
+    os.chdir(Path(__file__).parent)
+    main()
@@ -1,21 +1,39 @@
 """Read match information of J-League and save as CSV"""
 import argparse
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import contextvars
 from datetime import datetime
 from datetime import timedelta
+import hashlib
 import logging
 import os
 from pathlib import Path
 import re
+import threading
 from typing import Any
 
 from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
 import pandas as pd
 import pytz
-import requests
 
+from http_client import add_archive_args
+from http_client import http
+from live_poller import LiveFeed
+from live_poller import LivePoller
+from live_poller import live_sections
+from live_poller import match_duration
+from live_poller import next_kickoff
 from match_utils import mu
 from match_utils import get_season_from_date
+from match_utils import kickoff_times
 from match_utils import parse_range_args
+from match_utils import sections_live_between
+from match_utils import upsert_matches
+from section_ledger import SectionLedger
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +42,48 @@ config = mu.init_config(Path(__file__).parent / '../config/jleague.yaml')
 # Type conversion of config values
 config.timezone = pytz.timezone(config.timezone)
 
+# Per-run registry of section pages already fetched in this process (URL -> records).
+# Sub-seasons of different competitions may share a url_category page (e.g. j2j3),
+# so the page is requested once and every competition filters the same records.
+# Cleared when the outermost fetch_run exits.
+_fetched_sections: dict[str, Future] = {}
+_fetched_sections_lock = threading.Lock()
+_fetch_runs = 0
+
+# Identifies the parser of records kept in the HTTP validator cache: any change to
+# this module invalidates records parsed by an older version of the page parser.
+_PARSER_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+
+# Settled-section ledger used by forced refreshes (-f); set up by __main__
+# when config.section_ledger_path is given.  None disables the ledger.
+section_ledger: SectionLedger | None = None
+
+
+def clear_fetch_registry() -> None:
+    """Forget section pages fetched so far, so the next read_match goes to the web."""
+    with _fetched_sections_lock:
+        _fetched_sections.clear()
+
+
+@contextmanager
+def fetch_run():
+    """Share fetched section pages within the block (also usable as a decorator).
+
+    Nested runs join the outermost one, which clears the registry on exit, so
+    a long-lived process never serves pages fetched by an earlier run.
+    """
+    global _fetch_runs  # pylint: disable=global-statement
+    with _fetched_sections_lock:
+        _fetch_runs += 1
+    try:
+        yield
+    finally:
+        with _fetched_sections_lock:
+            _fetch_runs -= 1
+            if _fetch_runs == 0:
+                _fetched_sections.clear()
+
 
 def read_teams(competition: str) -> list[str]:
     """Get the list of teams from the web.
@@ -40,7 +100,7 @@ def read_teams(competition: str) -> list[str]:
     _url = config.get_format_str('urls.standing_url_format',
                                  competition.lower())
     logger.info("Access %s", _url)
-    soup = BeautifulSoup(requests.get(_url, timeout=config.http_timeout).text, 'lxml')
+    soup = BeautifulSoup(http.get(_url).text, 'lxml')
     teams = read_teams_from_web(soup, competition)
     logger.info("Read %d teams for %s", len(teams), competition)
     return teams
@@ -67,7 +127,7 @@ def read_teams_from_web(soup: BeautifulSoup, competition: str) -> list[str]:
     return [list(_td.stripped_strings)[1] for _td in td_teams]
 
 
-def read_match(competition: str, sec: int, url_category: str = None) -> pd.DataFrame:
+def read_match(competition: str, sec: int, url_category: str = None) -> list[dict[str, Any]]:
     """Read match data for a specified competition and section from the web.
 
     Args:
@@ -78,17 +138,55 @@ def read_match(competition: str, sec: int, url_category: str = None) -> pd.DataF
             competition key, e.g. 'j1/1/'. When url_category='j2j3', it
             becomes 'j2j3/1/' instead.
 
+    When the page is unchanged since the last run (HTTP 304 via the
+    conditional-GET cache), the records parsed in that run are reused
+    without parsing the page again.  A page already fetched in this process
+    (e.g. the shared j2j3 page read once per competition) is not requested
+    again while the current fetch_run lasts.
+
     Returns:
-        pd.DataFrame: DataFrame containing match data
+        list[dict[str, Any]]: List of dictionaries containing match information
 
     Raises:
         KeyError: If the key 'urls.source_url_format' is not found in the config file
     """
+    _url = _section_url(competition, sec, url_category)
+    with _fetched_sections_lock:
+        future = _fetched_sections.get(_url)
+        is_owner = future is None
+        if is_owner:
+            future = _fetched_sections[_url] = Future()
+    if is_owner:
+        try:
+            future.set_result(_read_section_page(_url))
+        except Exception as e:
+            with _fetched_sections_lock:
+                del _fetched_sections[_url]
+            future.set_exception(e)
+    else:
+        logger.info("Reuse %s fetched in this run", _url)
+    # Copy so that callers cannot modify the records held by the registry
+    return [dict(record) for record in future.result()]
+
+
+def _section_url(competition: str, sec: int, url_category: str = None) -> str:
+    """Return the match-list page URL of a section (see read_match for url_category)."""
     cat_for_url = url_category if url_category else competition.lower()
-    _url = config.get_format_str('urls.source_url_format', cat_for_url, sec)
+    return config.get_format_str('urls.source_url_format', cat_for_url, sec)
+
+
+def _read_section_page(_url: str) -> list[dict[str, Any]]:
+    """Fetch and parse one section page, reusing the parsed records on HTTP 304."""
     logger.info("Access %s", _url)
-    soup = BeautifulSoup(requests.get(_url, timeout=config.http_timeout).text, 'lxml')
-    return read_match_from_web(soup)
+    resp = http.get_conditional(_url)
+    result_list = http.load_parsed(_url, _PARSER_VERSION) if resp.from_cache else None
+    if result_list is None:
+        result_list = read_match_from_html(resp.text)
+        http.save_parsed(_url, result_list, _PARSER_VERSION)
+    if section_ledger is not None:
+        section_ledger.observe(_url, result_list, finished=bool(result_list) and all(
+            _match['status'].startswith('試合終了') for _match in result_list))
+    return result_list
 
 
 def read_match_from_web(soup: BeautifulSoup) -> list[dict[str, Any]]:
@@ -163,6 +261,124 @@ def read_match_from_web(soup: BeautifulSoup) -> list[dict[str, Any]]:
     return result_list
 
 
+def _has_class(name: str) -> str:
+    """Return an XPath predicate equivalent to BeautifulSoup's class_=name match."""
+    if ' ' in name:
+        return f"normalize-space(@class)='{name}'"
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Selectors for read_match_from_html, compiled once at import time
+_XP_SECTIONS = etree.XPath(f"//section[{_has_class('matchlistWrap')}]")
+_XP_DATE = etree.XPath(f"string((.//div[{_has_class('timeStamp')}])[1]//h4[1])")
+_XP_HAS_DATE = etree.XPath(f"boolean(.//div[{_has_class('timeStamp')}])")
+_XP_SECTION_TITLE = etree.XPath(f"string((.//div[{_has_class('leagAccTit')}])[1]//h5[1])")
+_XP_HAS_HOME_TEAM = etree.XPath(f"boolean(.//td[{_has_class('clubName leftside')}])")
+_XP_ROWS = etree.XPath('.//tr')
+_XP_GROUP = etree.XPath(f"(.//th[{_has_class('groupHead')}])[1]")
+_XP_STADIUM = etree.XPath(f"(.//td[{_has_class('stadium')}])[1]")
+_XP_STATUS = etree.XPath(f"(.//td[{_has_class('status')}])[1]")
+_XP_ROW_TEXTS = {
+    key: etree.XPath(f"(.//td[{_has_class(css_class)}])[1]")
+    for key, css_class in (('home_team', 'clubName leftside'),
+                           ('home_goal', 'point leftside'),
+                           ('away_goal', 'point rightside'),
+                           ('away_team', 'clubName rightside'))}
+_ASCII_SPACES = str.maketrans('', '', ' \n\t\x0c\r')
+_RE_SECTION_NO = re.compile('第(.+)節')
+_RE_START_TIME = re.compile(r'([^\>]+)\<br')
+_RE_STADIUM = re.compile(r'([^\>]+)\<\/a')
+_RE_PK = re.compile(r'試合終了\((\d+) PK (\d+)\)')
+
+
+def _collapse_blank_text(element: etree._Element) -> None:
+    """Collapse whitespace-only text nodes under element the way BeautifulSoup does.
+
+    BeautifulSoup replaces each all-whitespace string with a single newline
+    (or a space when it has none), which affects .text of cells such as the
+    status.
+    """
+    for node in element.iter():
+        if node.text is not None and not node.text.translate(_ASCII_SPACES):
+            node.text = '\n' if '\n' in node.text else ' '
+        if node is not element and node.tail is not None and not node.tail.translate(_ASCII_SPACES):
+            node.tail = '\n' if '\n' in node.tail else ' '
+
+
+def read_match_from_html(html: str) -> list[dict[str, Any]]:
+    """Read and return match information from J-League match list HTML.
+
+    Produces the same records as read_match_from_web, but parses the page
+    with lxml directly and walks only the section.matchlistWrap subtrees
+    with precompiled XPath selectors, instead of building a BeautifulSoup
+    tree for the whole page.
+
+    Args:
+        html (str): HTML text of the section page
+
+    Returns:
+        list[dict[str, Any]]: List of dictionaries containing match information
+    """
+    if not html.strip():
+        return []
+    root = lxml_html.document_fromstring(html)
+    result_list = []
+    section_no = None
+    _index = 1
+    for _section in _XP_SECTIONS(root):
+        _collapse_blank_text(_section)
+        match_date = convert_jleague_date(_XP_DATE(_section).strip()) \
+            if _XP_HAS_DATE(_section) else None
+        section_no_text = _XP_SECTION_TITLE(_section).strip()
+        section_no_match = _RE_SECTION_NO.search(section_no_text)
+        if section_no_match is None:
+            if _XP_HAS_HOME_TEAM(_section):
+                raise ValueError(
+                    f'Could not parse section_no from "{section_no_text}" '
+                    'but match data exists on the page')
+            logger.warning("No match data in section \"%s\", skipping", section_no_text)
+            continue
+        section_no = section_no_match[1]
+        group = None
+        for _tr in _XP_ROWS(_section):
+            group_th = _XP_GROUP(_tr)
+            if group_th:
+                group = group_th[0].text_content().strip()
+                continue
+
+            match_dict = {}
+            match_dict['match_date'] = match_date
+            match_dict['section_no'] = int(section_no)
+            match_dict['match_index_in_section'] = _index
+            if group:
+                match_dict['group'] = group
+            stadium_td = _XP_STADIUM(_tr)
+            if not stadium_td:
+                continue
+            # Same regexes as read_match_from_web, over this <td> only
+            stadium_html = etree.tostring(stadium_td[0], method='html',
+                                          encoding='unicode', with_tail=False)
+            _match = _RE_START_TIME.search(stadium_html)
+            match_dict['start_time'] = _match[1] if _match else ""
+            _match = _RE_STADIUM.search(stadium_html)
+            match_dict['stadium'] = _match[1] if _match else ""
+            for key, xpath in _XP_ROW_TEXTS.items():
+                match_dict[key] = xpath(_tr)[0].text_content().strip()
+
+            _status = _XP_STATUS(_tr)
+            match_dict['status'] = \
+                _status[0].text_content().strip().replace('\n', '') if _status else '不明'
+            pk_match = _RE_PK.search(match_dict['status'])
+            match_dict['home_pk_score'] = str(int(pk_match[1])) if pk_match else ''
+            match_dict['away_pk_score'] = str(int(pk_match[2])) if pk_match else ''
+
+            logger.debug("%s", match_dict)
+            result_list.append(match_dict)
+            _index += 1
+    logger.info("Read %d matches in section %s", len(result_list), section_no)
+    return result_list
+
+
 def convert_jleague_date(match_date: str) -> str:
     """Convert J-League match date to standard format
 
@@ -196,16 +412,23 @@ def _team_count_to_section_range(team_count: int) -> range:
     return range(1, (team_count - 1) * 2 + 1)
 
 
+@fetch_run()
 def read_matches(competition: str, sections: list[int] = None,
-                 url_category: str = None) -> pd.DataFrame:
+                 url_category: str = None, max_workers: int = None) -> pd.DataFrame:
     """Read match data for specified competition from the web.
 
     When sections is None, fetches all sections (derived from team count).
+    Section pages are fetched concurrently with at most ``max_workers`` requests
+    in flight.  All section pages live on the same host, so this is the per-host
+    request budget.  Results are concatenated in section order, so the output is
+    identical to a sequential fetch.
 
     Args:
         competition (str): Competition key (e.g. 'J1', 'J2', 'J3')
         sections (list[int], optional): Section numbers to fetch. Defaults to all.
         url_category (str, optional): Override category value for URL construction.
+        max_workers (int, optional): Concurrent request budget.
+            Defaults to config.max_requests_per_host (1 = sequential).
 
     Returns:
         pd.DataFrame: DataFrame containing match data
@@ -214,9 +437,23 @@ def read_matches(competition: str, sections: list[int] = None,
     if not sections:
         teams_count = len(read_teams(competition))
         sections = _team_count_to_section_range(teams_count)
-
-    for _i in sections:
-        result_list = read_match(competition, _i, url_category=url_category)
+    sections = list(sections)
+    if max_workers is None:
+        max_workers = getattr(config, 'max_requests_per_host', 1)
+
+    def _read(_sec: int) -> list[dict[str, Any]]:
+        return read_match(competition, _sec, url_category=url_category)
+
+    if max_workers > 1 and len(sections) > 1:
+        # Worker threads keep the caller's mu config (see MatchUtils.use_config)
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(sections))) as executor:
+            # executor.map yields results in submission (= section) order
+            result_lists = list(executor.map(lambda _sec: context.copy().run(_read, _sec), sections))
+    else:
+        result_lists = [_read(_i) for _i in sections]
+
+    for result_list in result_lists:
         _matches = pd.concat([_matches, pd.DataFrame(result_list)])
     # A common mistake is not saving the result of sort or reset_index operations
     _matches = _matches.sort_values(['section_no', 'match_index_in_section']).reset_index(drop=True)
@@ -255,9 +492,10 @@ def get_match_dates_of_section(all_matches: pd.DataFrame) -> dict[str, list[pd.T
         KeyError: DataFrame does not contain 'start_time' or 'match_date' columns
    """
     matches_with_date = all_matches.dropna(subset=['match_date'])
-    grouped_by_section = matches_with_date.groupby('section_no')
-    kickoff_times = grouped_by_section.apply(make_kickoff_time, include_groups=False)
-    return kickoff_times.to_dict()
+    kickoffs = pd.DataFrame({'section_no': matches_with_date['section_no'],
+                             'kickoff': kickoff_times(matches_with_date, config.timezone)})
+    kickoffs = kickoffs.drop_duplicates().sort_values(['section_no', 'kickoff'])
+    return kickoffs.groupby('section_no')['kickoff'].agg(list).to_dict()
 
 
 def make_kickoff_time(_subset: pd.DataFrame) -> list[pd.Timestamp]:
@@ -280,11 +518,7 @@ def make_kickoff_time(_subset: pd.DataFrame) -> list[pd.Timestamp]:
         TypeError: If the timestamp already has a timezone
         KeyError: If the DataFrame does not contain 'start_time' or 'match_date' columns
     """
-    is_valid_time = _subset['start_time'].str.match(r'^\d{1,2}:\d{2}$')
-    start_time = _subset['start_time'].where(is_valid_time, '00:00')
-    result = pd.to_datetime(_subset['match_date'] + ' ' + start_time)
-    result = result.dt.tz_localize(config.timezone).sort_values().drop_duplicates()
-    return list(result)
+    return list(kickoff_times(_subset, config.timezone).sort_values().drop_duplicates())
 
 
 def get_sections_to_update(all_matches: pd.DataFrame,
@@ -306,14 +540,10 @@ def get_sections_to_update(all_matches: pd.DataFrame,
         TypeError: If the timestamp already has a timezone
         KeyError: If the DataFrame does not contain 'start_time' or 'match_date' columns
     """
-    target_sec = set()
-    for (_sec, _dates) in get_match_dates_of_section(all_matches).items():
-        for _start in _dates:
-            _end = _start + timedelta(hours=2)
-            if lastupdate <= _end and _start <= current_time:
-                logger.info("Add section \"%s\" (match at %s-%s) between %s - %s",
-                            _sec, _start, _end, lastupdate, current_time)
-                target_sec.add(_sec)
+    target_sec = sections_live_between(all_matches, lastupdate, current_time, config.timezone)
+    if target_sec:
+        logger.info("Add sections %s with matches between %s - %s",
+                    sorted(target_sec), lastupdate, current_time)
     return target_sec
 
 
@@ -350,6 +580,22 @@ def _calc_section_range(sub_seasons: list[dict]) -> range:
     return _team_count_to_section_range(max_team_count)
 
 
+def _select_forced_sections(competition: str, sections: list[int],
+                            url_category: str = None) -> list[int]:
+    """Narrow a forced refresh to open sections plus a rotation of settled ones.
+
+    Args:
+        competition (str): Competition key (e.g. 'J1', 'J2', 'J3')
+        sections (list[int]): All section numbers of the season
+        url_category (str, optional): Override category value for URL construction.
+
+    Returns:
+        list[int]: Section numbers to fetch (see SectionLedger.select_sections)
+    """
+    return section_ledger.select_sections(
+        {_sec: _section_url(competition, _sec, url_category) for _sec in sections})
+
+
 def _get_sections_since(csv_path: str, current: pd.DataFrame, now: datetime) -> set[int]:
     """Get sections that started since the last CSV update.
 
@@ -380,11 +626,12 @@ def _get_sections_for_sub_group(subs: list[dict]) -> set[int] | None:
         csv_path = mu.get_csv_path(sub['competition'], sub['name'])
         if not Path(csv_path).exists():
             return None  # Missing CSV -> need full fetch
-        current = mu.read_allmatches_csv(csv_path)
+        current = mu.read_allmatches_csv(csv_path, copy=False)
         sections_needed |= _get_sections_since(csv_path, current, _now)
     return sections_needed
 
 
+@fetch_run()
 def update_sub_season_matches(competition: str, sub_seasons: list[dict],
                               force_update: bool = False,
                               need_update: set[int] = None) -> None:
@@ -397,7 +644,8 @@ def update_sub_season_matches(competition: str, sub_seasons: list[dict],
     Args:
         competition (str): Competition key (e.g. 'J1', 'J2', 'J3')
         sub_seasons (list[dict]): Sub-season info from get_sub_seasons().
-        force_update (bool): If True, re-fetch all sections regardless of timestamps.
+        force_update (bool): If True, re-fetch all sections regardless of timestamps
+            (only open and rotation sections when the section ledger is enabled).
         need_update (set[int]): If given, fetch only these sections (differential update).
     """
     # Attach competition to each sub for _get_sections_for_sub_group
@@ -415,6 +663,12 @@ def update_sub_season_matches(competition: str, sub_seasons: list[dict],
         if force_update:
             fetch_range = _calc_section_range(subs)
             do_merge = False
+            if section_ledger is not None and all(
+                    Path(mu.get_csv_path(competition, sub['name'])).exists() for sub in subs):
+                fetch_range = _select_forced_sections(competition, fetch_range, url_cat)
+                do_merge = True
+                if not fetch_range:
+                    continue
         elif need_update is not None:
             fetch_range = need_update
             do_merge = True
@@ -435,36 +689,67 @@ def update_sub_season_matches(competition: str, sub_seasons: list[dict],
 
         # Distribute fetched data to each sub-season CSV
         for sub in subs:
-            group_display = sub.get('group_display')
-            if group_display:
-                sub_data = fetched[fetched['group'] == group_display].copy()
-            else:
-                sub_data = fetched.copy()
-
-            # Drop 'group' column -- sub-season is identified by filename
-            if 'group' in sub_data.columns:
-                sub_data = sub_data.drop(columns=['group'])
-
-            # Recalculate match_index_in_section within each sub-season
-            sub_data = sub_data.sort_values(['section_no', 'match_date', 'home_team'])
-            sub_data['match_index_in_section'] = sub_data.groupby('section_no').cumcount() + 1
-            sub_data = sub_data.reset_index(drop=True)
-
+            sub_data = _rows_for_sub_season(fetched, sub.get('group_display'))
             csv_path = mu.get_csv_path(competition, sub['name'])
             if do_merge and Path(csv_path).exists():
-                current = mu.read_allmatches_csv(csv_path)
-                old = current[current['section_no'].isin(fetch_range)]
-                if not mu.matches_differ(sub_data, old):
+                merged = _merge_sections(mu.read_allmatches_csv(csv_path), sub_data, fetch_range)
+                if merged is None:
                     logger.info("No changes detected for %s", sub["name"])
                     continue
-                merged = pd.concat([current[~current['section_no'].isin(fetch_range)], sub_data]) \
-                           .sort_values(['section_no', 'match_index_in_section']) \
-                           .reset_index(drop=True)
                 mu.update_if_diff(merged, csv_path)
             else:
                 mu.update_if_diff(sub_data, csv_path)
 
 
+def _rows_for_sub_season(fetched: pd.DataFrame, group_display: str = None) -> pd.DataFrame:
+    """Select one sub-season's rows from a shared url_category fetch.
+
+    Args:
+        fetched (pd.DataFrame): Matches read from the shared section pages
+        group_display (str, optional): Group header of the sub-season (e.g. 'EAST-A').
+            None keeps all rows.
+
+    Returns:
+        pd.DataFrame: Rows without the 'group' column, with match_index_in_section
+            recalculated within the sub-season
+    """
+    if group_display:
+        sub_data = fetched[fetched['group'] == group_display].copy()
+    else:
+        sub_data = fetched.copy()
+
+    # Drop 'group' column -- sub-season is identified by filename
+    if 'group' in sub_data.columns:
+        sub_data = sub_data.drop(columns=['group'])
+
+    # Recalculate match_index_in_section within each sub-season
+    sub_data = sub_data.sort_values(['section_no', 'match_date', 'home_team'])
+    sub_data['match_index_in_section'] = sub_data.groupby('section_no').cumcount() + 1
+    return sub_data.reset_index(drop=True)
+
+
+def _merge_sections(current: pd.DataFrame, fetched: pd.DataFrame,
+                    sections: set[int]) -> pd.DataFrame | None:
+    """Replace the given sections of current with fetched rows.
+
+    Args:
+        current (pd.DataFrame): Match data of the whole season
+        fetched (pd.DataFrame): Newly read matches of the given sections
+        sections (set[int]): Section numbers that were fetched
+
+    Returns:
+        pd.DataFrame | None: Merged season data, or None if the sections are unchanged
+    """
+    in_sections = current['section_no'].isin(sections)
+    changeset = mu.diff_matches(fetched, current[in_sections])
+    if not changeset:
+        return None
+    logger.info("Sections %s: %s", sorted(sections), changeset.summary())
+    return upsert_matches(current, fetched, ['section_no', 'match_index_in_section'],
+                          scope=in_sections).frame
+
+
+@fetch_run()
 def update_all_matches(competition: str, force_update: bool = False,
                        need_update: set[int] = None,
                        url_category: str = None) -> pd.DataFrame:
@@ -472,6 +757,8 @@ def update_all_matches(competition: str, force_update: bool = False,
     Fetch incremental match data from the web and apply it to the existing dataset.
 
     - If no CSV exists yet, download and save all matches.
+    - With force_update and the section ledger enabled, fetch only open
+      sections plus a rotation of settled ones and merge them like need_update.
     - If `need_update` is provided, update only those sections.
     - Otherwise, update sections that have started since the last file timestamp.
     - When changes are detected, save a new timestamped CSV.
@@ -495,6 +782,14 @@ def update_all_matches(competition: str, force_update: bool = False,
     """
     latest_file = mu.get_csv_path(competition)
 
+    # A forced refresh with the ledger fetches only open and re-verified sections
+    if force_update and section_ledger is not None and Path(latest_file).exists():
+        sections = _team_count_to_section_range(len(read_teams(competition)))
+        need_update = set(_select_forced_sections(competition, sections, url_category))
+        force_update = False
+        if not need_update:
+            return mu.read_allmatches_csv(latest_file)
+
     # If the file does not exist, read all matches and save them
     if (not Path(latest_file).exists()) or force_update:
         all_matches = read_matches(competition, url_category=url_category)
@@ -512,17 +807,92 @@ def update_all_matches(competition: str, force_update: bool = False,
             return current
 
     diff_matches = read_matches(competition, need_update, url_category=url_category)
-    old_matches = current[current['section_no'].isin(need_update)]
-    if mu.matches_differ(diff_matches, old_matches):
-        new_matches = pd.concat([current[~current['section_no'].isin(need_update)], diff_matches]) \
-                        .sort_values(['section_no', 'match_index_in_section']) \
-                        .reset_index(drop=True)
+    new_matches = _merge_sections(current, diff_matches, need_update)
+    if new_matches is not None:
         mu.update_if_diff(new_matches, latest_file)
-        return new_matches
-    return None
+    return new_matches
+
+
+class JLeagueLiveFeed(LiveFeed):
+    """Live-poll target for one J-League competition, with its CSVs kept in memory.
 
+    Only the sections with a match in progress are fetched; sub-seasons that
+    share a url_category page are fetched together and split by group_display,
+    as in update_sub_season_matches.
+    """
 
-def make_args() -> argparse.Namespace:
+    def __init__(self, competition: str, duration: timedelta = None):
+        self.name = competition
+        self.competition = competition
+        self.duration = duration or match_duration(config)
+        sub_seasons = mu.get_sub_seasons(competition)
+        self.split_groups = bool(sub_seasons)
+        # url_category (None = competition default) -> [(csv_path, group_display)]
+        self.outputs: dict[str | None, list[tuple[str, str | None]]] = {}
+        if sub_seasons:
+            for sub in sub_seasons:
+                self.outputs.setdefault(sub.get('url_category', competition.lower()), []).append(
+                    (mu.get_csv_path(competition, sub['name']), sub.get('group_display')))
+        elif sub_seasons is not None:
+            self.outputs[None] = [(mu.get_csv_path(competition), None)]
+        self.frames: dict[str, pd.DataFrame] = {}
+        for paths in self.outputs.values():
+            for csv_path, _ in paths:
+                if Path(csv_path).exists():
+                    self.frames[csv_path] = mu.read_allmatches_csv(csv_path)
+                else:
+                    logger.warning("Skip %s: no CSV yet (run once without --daemon)", csv_path)
+
+    def _live_sections(self, url_cat: str | None, now: datetime) -> set[int]:
+        sections = set()
+        for csv_path, _ in self.outputs[url_cat]:
+            if csv_path in self.frames:
+                sections |= live_sections(self.frames[csv_path], now, config.timezone, self.duration)
+        return sections
+
+    def is_live(self, now: datetime) -> bool:
+        return any(self._live_sections(url_cat, now) for url_cat in self.outputs)
+
+    def next_kickoff(self, now: datetime) -> datetime | None:
+        kickoffs = [k for k in (next_kickoff(frame, now, config.timezone) for frame in self.frames.values())
+                    if k is not None]
+        return min(kickoffs) if kickoffs else None
+
+    def poll(self, now: datetime) -> bool:
+        changed = False
+        for url_cat, paths in self.outputs.items():
+            sections = self._live_sections(url_cat, now)
+            if not sections:
+                continue
+            fetched = read_matches(self.competition, sorted(sections), url_category=url_cat)
+            for csv_path, group_display in paths:
+                if csv_path not in self.frames:
+                    continue
+                rows = _rows_for_sub_season(fetched, group_display) if self.split_groups else fetched
+                merged = _merge_sections(self.frames[csv_path], rows, sections)
+                if merged is None:
+                    continue
+                mu.update_if_diff(merged, csv_path)
+                self.frames[csv_path] = merged
+                changed = True
+        return changed
+
+
+def run_daemon(competitions: list[str]) -> None:
+    """Poll live sections of the given competitions until interrupted."""
+    poller = LivePoller.from_config(
+        [JLeagueLiveFeed(_comp) for _comp in competitions], config,
+        clock=lambda: datetime.now().astimezone(config.timezone),
+        on_cycle=clear_fetch_registry)
+    try:
+        # One run for the daemon's lifetime; the registry is cleared every poll cycle instead
+        with fetch_run():
+            poller.run()
+    except KeyboardInterrupt:
+        logger.info("Live polling stopped")
+
+
+def make_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Argument parser"""
     parser = argparse.ArgumentParser(
         description='read_jleague_matches.py\n'
@@ -535,38 +905,71 @@ def make_args() -> argparse.Namespace:
     parser.add_argument('-s', '--sections', type=parse_range_args,
                         help='Update specific sections (comma-separated numbers, range specified with'
                         ' - ex) 1,10-15,20) [default: all sections]')
+    parser.add_argument('-j', '--jobs', type=int,
+                        help='Concurrent section requests (1 = sequential)'
+                        ' [default: max_requests_per_host in config]')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep running and poll sections with matches in progress'
+                        ' (intervals: live_* in config)')
+    parser.add_argument('--no-ledger', action='store_true',
+                        help='With -f, re-fetch every section instead of skipping settled ones')
     parser.add_argument('-d', '--debug', action='store_true',
                         help='Debug mode (print debug information)')
 
-    return parser.parse_args()
+    add_archive_args(parser)
+    return parser.parse_args(argv)
 
 
-if __name__ == '__main__':
-    os.chdir(Path(__file__).parent)
+def main(argv: list[str] | None = None) -> None:
+    """Read the competitions given on the command line and update their CSVs.
 
-    _args = make_args()
+    Relative paths in the config are resolved against the current directory,
+    which must be src/ (see __main__ and update_orchestrator.py).
+    """
+    global section_ledger  # pylint: disable=global-statement
+
+    args = make_args(argv)
     logging.basicConfig(
-        level=logging.DEBUG if _args.debug else logging.INFO,
+        level=logging.DEBUG if args.debug else logging.INFO,
         format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
         datefmt='%H:%M:%S',
     )
-
-    _start_month = mu.resolve_season_start_month()
-    _expected = get_season_from_date(season_start_month=_start_month)
-    if str(config.season) != _expected:
-        logger.warning("config.season=%r does not match expected season %r",
-                        config.season, _expected)
-
-    for _comp in _args.competition:
-        logger.info("Start read %s matches", _comp)
-        _sub_seasons = mu.get_sub_seasons(_comp)
-        if _sub_seasons is None:
-            logger.info("No %s season entry for %s in season_map, skipping",
-                        config.season, _comp)
-        elif _sub_seasons:
-            update_sub_season_matches(_comp, _sub_seasons,
-                                      force_update=_args.force_update_all,
-                                      need_update=_args.sections)
+    http.apply_archive_args(args)
+    if args.jobs is not None:
+        config.max_requests_per_host = args.jobs
+    if getattr(config, 'section_ledger_path', None) and not (args.no_ledger or args.replay):
+        section_ledger = SectionLedger(config.section_ledger_path,
+                                       getattr(config, 'ledger_settle_fetches', 3),
+                                       getattr(config, 'ledger_reverify_per_run', 3))
+
+    with mu.use_config(config):
+        start_month = mu.resolve_season_start_month()
+        expected = get_season_from_date(season_start_month=start_month)
+        if str(config.season) != expected:
+            logger.warning("config.season=%r does not match expected season %r",
+                           config.season, expected)
+
+        if args.daemon:
+            run_daemon(args.competition)
         else:
-            update_all_matches(_comp, force_update=_args.force_update_all,
-                               need_update=_args.sections)
+            with fetch_run():
+                for comp in args.competition:
+                    logger.info("Start read %s matches", comp)
+                    sub_seasons = mu.get_sub_seasons(comp)
+                    if sub_seasons is None:
+                        logger.info("No %s season entry for %s in season_map, skipping",
+                                    config.season, comp)
+                    elif sub_seasons:
+                        update_sub_season_matches(comp, sub_seasons,
+                                                  force_update=args.force_update_all,
+                                                  need_update=args.sections)
+                    else:
+                        update_all_matches(comp, force_update=args.force_update_all,
+                                           need_update=args.sections)
+    if section_ledger is not None:
+        section_ledger.save()
+
+
+if __name__ == '__main__':
+    os.chdir(Path(__file__).parent)
+    main()
@@ -33,6 +33,7 @@ from typing import Any
 
 import pandas as pd
 
+from http_client import add_archive_args, http
 from match_utils import mu
 
 logger = logging.getLogger(__name__)
@@ -55,9 +56,8 @@ def load_source(source: str, timeout: int = 60) -> dict[str, Any]:
         logger.info("Reading local openfootball source %s", source)
         with open(source, encoding='utf-8') as handle:
             return json.load(handle)
-    import requests  # local import so unit tests with a local --source need no network stub
     logger.info("Fetching openfootball source %s", source)
-    resp = requests.get(source, timeout=timeout)
+    resp = http.get_conditional(source, timeout=timeout)
     resp.raise_for_status()
     return resp.json()
 
@@ -181,19 +181,21 @@ def patch_csv(csv_path: str, patch_fn, label: str, dry_run: bool) -> int:
     return changed
 
 
-def make_args() -> argparse.Namespace:
+def make_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
         description="Patch WC2026 CSV scores from openfootball/worldcup.json")
     parser.add_argument('--source', help='Local worldcup.json path or URL override')
     parser.add_argument('--dry-run', action='store_true',
                         help='Log changes without writing the CSV files')
-    return parser.parse_args()
+    add_archive_args(parser)
+    return parser.parse_args(argv)
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
     """Fetch openfootball data and patch the WC2026 group-stage and knockout CSVs."""
-    args = make_args()
+    args = make_args(argv)
+    http.apply_archive_args(args)
     config = mu.init_config(CONFIG_PATH)
     source = args.source or config.source_url
     timeout = getattr(config, 'http_timeout', 60)
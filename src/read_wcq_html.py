@@ -14,21 +14,23 @@ import re
 from pathlib import Path
 
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 
+from http_client import add_archive_args, http
 from match_utils import mu
+from match_utils import upsert_matches
 
 logger = logging.getLogger(__name__)
 
 URL = 'https://www.jfa.jp/samuraiblue/worldcup_2026/final_q_2026/result/'
 CSV_PATH = '../docs/csv/2026_allmatch_result-WC_AFC.csv'
+MATCH_KEY = ['group', 'section_no', 'match_index_in_section']
 
 
 def fetch_html(url: str) -> BeautifulSoup:
     """Fetch the HTML page and return a BeautifulSoup object."""
     logger.info("Fetching %s", url)
-    resp = requests.get(url, timeout=60)
+    resp = http.get(url)
     resp.raise_for_status()
     resp.encoding = 'utf-8'  # requests misdetects as ISO-8859-1
     return BeautifulSoup(resp.text, 'html.parser')
@@ -168,24 +170,15 @@ def merge_with_existing(new_df: pd.DataFrame, csv_path: str) -> pd.DataFrame:
     Returns:
         Merged DataFrame sorted by group, section_no, match_index_in_section.
     """
-    new_groups = set(new_df['group'].unique())
+    if not Path(csv_path).exists():
+        return new_df.sort_values(MATCH_KEY).reset_index(drop=True)
 
-    if Path(csv_path).exists():
-        existing_df = mu.read_allmatches_csv(csv_path)
-        # Keep only groups NOT in the new data
-        keep_df = existing_df[~existing_df['group'].isin(new_groups)]
-        logger.info("Keeping %d existing rows (groups: %s)",
-                     len(keep_df),
-                     sorted(keep_df['group'].unique()) if len(keep_df) > 0 else 'none')
-        merged = pd.concat([keep_df, new_df], ignore_index=True)
-    else:
-        merged = new_df
-
-    merged = merged.sort_values(
-        ['group', 'section_no', 'match_index_in_section']
-    ).reset_index(drop=True)
-
-    return merged
+    existing_df = mu.read_allmatches_csv(csv_path)
+    result = upsert_matches(existing_df, new_df, MATCH_KEY,
+                            scope=existing_df['group'].isin(set(new_df['group'].unique())))
+    logger.info("Merged groups %s: %d inserted, %d updated, %d deleted",
+                sorted(new_df['group'].unique()), result.inserted, result.updated, result.deleted)
+    return result.frame
 
 
 def main():
@@ -195,6 +188,7 @@ def main():
                         help='Enable debug logging')
     parser.add_argument('-g', '--groups', type=str, default='A,B',
                         help='Comma-separated group letters to scrape (default: A,B)')
+    add_archive_args(parser)
     args = parser.parse_args()
 
     logging.basicConfig(
@@ -202,6 +196,7 @@ def main():
         format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
         datefmt='%H:%M:%S',
     )
+    http.apply_archive_args(args)
 
     target_groups = [g.strip().upper() for g in args.groups.split(',')]
 
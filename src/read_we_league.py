@@ -25,8 +25,8 @@ from typing import Any
 
 import bs4
 import pandas as pd
-import requests
 
+from http_client import add_archive_args, http
 from match_utils import mu, get_season_from_date, CSV_COLUMN_SCHEMA
 
 logger = logging.getLogger(__name__)
@@ -52,7 +52,7 @@ def init() -> None:
 def _get(url: str) -> bs4.BeautifulSoup:
     """Fetch URL and return parsed BeautifulSoup."""
     logger.debug("GET %s", url)
-    resp = requests.get(url, timeout=mu.config.http_timeout)
+    resp = http.get(url)
     resp.raise_for_status()
     return bs4.BeautifulSoup(resp.text, 'lxml')
 
@@ -278,7 +278,7 @@ def _to_df(matches: list[dict]) -> pd.DataFrame:
     return df[ordered + extras]
 
 
-def make_args() -> argparse.Namespace:
+def make_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Argument parser."""
     parser = argparse.ArgumentParser(
         description='Read WE League match data and save as CSV'
@@ -289,38 +289,45 @@ def make_args() -> argparse.Namespace:
     )
     parser.add_argument('-d', '--debug', action='store_true',
                         help='Enable debug output')
-    return parser.parse_args()
+    add_archive_args(parser)
+    return parser.parse_args(argv)
 
 
-if __name__ == '__main__':
-    os.chdir(Path(__file__).parent)
+def main(argv: list[str] | None = None) -> None:
+    """Read the season given on the command line and update the WE League CSVs."""
     init()
 
-    _args = make_args()
+    args = make_args(argv)
     logging.basicConfig(
-        level=logging.DEBUG if _args.debug else logging.INFO,
+        level=logging.DEBUG if args.debug else logging.INFO,
         format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
         datefmt='%H:%M:%S',
     )
+    http.apply_archive_args(args)
 
-    _season = _args.season or get_season_from_date(
+    season = args.season or get_season_from_date(
         season_start_month=mu.config.season_start_month
     )
-    logger.info("Processing season %s", _season)
+    logger.info("Processing season %s", season)
+
+    we, cup = read_season(season)
 
-    _we, _cup = read_season(_season)
+    we_csv = mu.config.get_format_str('paths.csv_format', season=season)
+    mu.update_if_diff(_to_df(we), we_csv)
 
-    _we_csv = mu.config.get_format_str('paths.csv_format', season=_season)
-    mu.update_if_diff(_to_df(_we), _we_csv)
+    if cup:
+        cup_df = _to_df(cup)
+        cup_gs_df = cup_df[cup_df['section_no'] < 97].reset_index(drop=True)
+        cup_ko_df = cup_df[cup_df['section_no'] >= 97].reset_index(drop=True)
 
-    if _cup:
-        _cup_df = _to_df(_cup)
-        _cup_gs_df = _cup_df[_cup_df['section_no'] < 97].reset_index(drop=True)
-        _cup_ko_df = _cup_df[_cup_df['section_no'] >= 97].reset_index(drop=True)
+        cup_csv = mu.config.get_format_str('paths.cup_csv_format', season=season)
+        mu.update_if_diff(cup_gs_df, cup_csv)
 
-        _cup_csv = mu.config.get_format_str('paths.cup_csv_format', season=_season)
-        mu.update_if_diff(_cup_gs_df, _cup_csv)
+        if not cup_ko_df.empty:
+            cup_ko_csv = mu.config.get_format_str('paths.cup_ko_csv_format', season=season)
+            mu.update_if_diff(cup_ko_df, cup_ko_csv)
 
-        if not _cup_ko_df.empty:
-            _cup_ko_csv = mu.config.get_format_str('paths.cup_ko_csv_format', season=_season)
-            mu.update_if_diff(_cup_ko_df, _cup_ko_csv)
+
+if __name__ == '__main__':
+    os.chdir(Path(__file__).parent)
+    main()
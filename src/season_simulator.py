@@ -0,0 +1,248 @@
+"""Monte Carlo finishing positions of league seasons.
+
+Plays the rest of a season many times and counts where every team
+finishes.  The matches still to be played are the rows whose status is
+not 試合終了 (cancelled rows are ignored as in standings_timeline); the
+others give the current points.
+
+Each remaining match ends with one of the results of the season's point
+system (POINT_SYSTEM_RESULTS, both ways round except draws) with the
+frequency that result has among the season's finished matches, home
+side first, plus one (so results not seen yet stay possible).  Team
+strength is not modelled.  Teams level on points are ordered by their
+current goal_diff / goal_get as far as tiebreak_order uses them (goals
+are not simulated), then at random.
+
+All matches of a batch of simulations are drawn as one array, and the
+simulations are split into chunks of SIMULATION_CHUNK run by a process
+pool.  Chunk i of group g draws from SeedSequence(seed, spawn_key=(g, i)),
+so the result depends on the seed only, not on the number of workers.
+
+Usage::
+
+    python season_simulator.py J1 -s 2025                # config.season if -s is omitted
+    python season_simulator.py J2 -n 1000000 -j 8 --seed 1 -o j2_positions.csv
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from match_utils import MatchArchive
+from match_utils import mu
+from standings_timeline import CANCELLED_STATUS
+from standings_timeline import DEFAULT_GROUP
+from standings_timeline import POINT_MAPS
+from standings_timeline import POINT_SYSTEM_RESULTS
+from standings_timeline import RESULT_COUNTERPART
+from standings_timeline import RESULT_TYPES
+from standings_timeline import SeasonRules
+from standings_timeline import match_results
+from standings_timeline import season_rules
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUS = '試合終了'
+SIMULATION_CHUNK = 10_000
+
+# tiebreak_order keys fixed at their current values
+_GOAL_TIEBREAKERS = ('goal_diff', 'goal_get')
+
+
+@dataclass(frozen=True)
+class SeasonState:
+    """The part of a group's season the simulation needs.
+
+    Attributes:
+        teams: Team names (standings_timeline order)
+        points: Current points per team
+        tiebreak: Current standing by the goal tiebreakers (0 = best; level teams share a value)
+        home: Home team index of every remaining match
+        away: Away team index of every remaining match
+        outcome_points: (home, away) points of every possible outcome
+        cumulative: Cumulative probability of the outcomes
+    """
+    teams: list[str]
+    points: np.ndarray
+    tiebreak: np.ndarray
+    home: np.ndarray
+    away: np.ndarray
+    outcome_points: np.ndarray
+    cumulative: np.ndarray
+
+
+def outcome_probabilities(matches: pd.DataFrame, point_system: str = 'standard') -> pd.Series:
+    """Probability of each (home result, away result) of a remaining match.
+
+    Uses the frequencies among the finished matches plus one for every
+    result of POINT_SYSTEM_RESULTS[point_system] and every result found in
+    the finished matches.
+    """
+    results = match_results(matches, point_system)
+    rows = len(matches)
+    finished = _finished(matches) & results['played'][:rows]
+    home_results = [RESULT_TYPES[code] for code in results['result'][:rows][finished]]
+    outcomes = {}
+    for result in (*POINT_SYSTEM_RESULTS.get(point_system, RESULT_TYPES), *home_results):
+        outcomes.setdefault((result, RESULT_COUNTERPART[result]), 1)
+        outcomes.setdefault((RESULT_COUNTERPART[result], result), 1)
+    for result in home_results:
+        outcomes[(result, RESULT_COUNTERPART[result])] += 1
+    counts = pd.Series(outcomes)
+    return counts / counts.sum()
+
+
+def _finished(matches: pd.DataFrame) -> np.ndarray:
+    return matches['status'].fillna('').astype(str).str.startswith(FINISHED_STATUS).to_numpy()
+
+
+def season_states(matches: pd.DataFrame, rules: SeasonRules = SeasonRules()) -> dict[str, SeasonState]:
+    """Current standings and remaining matches of every group."""
+    point_map = POINT_MAPS[rules.point_system]
+    probabilities = outcome_probabilities(matches, rules.point_system)
+    outcome_points = np.array([(point_map[home], point_map[away]) for home, away in probabilities.index])
+    cumulative = np.cumsum(probabilities.to_numpy())
+    cumulative[-1] = 1.0
+
+    rows = len(matches)
+    results = match_results(matches, rules.point_system)
+    columns = {name: (matches[name].fillna('').astype(str).to_numpy() if name in matches.columns
+                      else np.full(rows, '', dtype=object))
+               for name in ('home_team', 'away_team', 'status', 'group')}
+    groups = np.where(columns['group'] == '', DEFAULT_GROUP, columns['group'])
+    active = columns['status'] != CANCELLED_STATUS
+    finished = _finished(matches) & results['played'][:rows]
+    states = {}
+    for group in dict.fromkeys(groups[active]):
+        in_group = (groups == group) & active
+        teams = list(dict.fromkeys([*rules.teams, *np.column_stack(
+            [columns['home_team'][in_group], columns['away_team'][in_group]]).ravel()]))
+        index = pd.Index(teams)
+        home = index.get_indexer(columns['home_team'])
+        away = index.get_indexer(columns['away_team'])
+        done = in_group & finished
+        sides = np.concatenate([home[done], away[done]])
+        stats = {name: np.bincount(sides, weights=values, minlength=len(teams)).astype(np.int64)
+                 for name, values in (
+                     ('point', np.concatenate([results['point'][:rows][done], results['point'][rows:][done]])),
+                     ('goal_get', np.concatenate([results['goal_get'][:rows][done],
+                                                  results['goal_get'][rows:][done]])),
+                     ('goal_lose', np.concatenate([results['goal_lose'][:rows][done],
+                                                   results['goal_lose'][rows:][done]])))}
+        stats['goal_diff'] = stats['goal_get'] - stats['goal_lose']
+        keys = [-stats[key] for key in rules.tiebreak_order if key in _GOAL_TIEBREAKERS]
+        order = np.lexsort(keys[::-1]) if keys else np.arange(len(teams))
+        tiebreak = np.zeros(len(teams), dtype=np.int64)
+        if keys:
+            ranked = np.column_stack([key[order] for key in keys])
+            tiebreak[order] = np.cumsum(np.r_[False, (ranked[1:] != ranked[:-1]).any(axis=1)])
+        pending = in_group & ~finished
+        states[group] = SeasonState(teams, stats['point'], tiebreak, home[pending], away[pending],
+                                    outcome_points, cumulative)
+    return states
+
+
+def _simulate_chunk(state: SeasonState, seed: np.random.SeedSequence, simulations: int) -> np.ndarray:
+    """Position counts ([team, position]) of simulations random completions."""
+    rng = np.random.default_rng(seed)
+    team_count = len(state.teams)
+    outcome = np.searchsorted(state.cumulative, rng.random((simulations, len(state.home))), side='right')
+    gained = np.zeros((len(state.home), team_count))
+    gained[np.arange(len(state.home)), state.home] = 1
+    points = state.outcome_points[outcome, 0] @ gained
+    gained[:] = 0
+    gained[np.arange(len(state.away)), state.away] = 1
+    points += state.outcome_points[outcome, 1] @ gained
+    points += state.points
+    tiebreak = np.broadcast_to(state.tiebreak, points.shape)
+    order = np.lexsort((rng.random(points.shape), tiebreak, -points), axis=-1)
+    positions = order * team_count + np.arange(team_count)
+    return np.bincount(positions.ravel(), minlength=team_count * team_count).reshape(team_count, team_count)
+
+
+def simulate_positions(matches: pd.DataFrame, rules: SeasonRules = SeasonRules(), simulations: int = 100_000,
+                       seed: int = 0, workers: int = None) -> dict[str, pd.DataFrame]:
+    """Finishing-position probabilities of every team.
+
+    Args:
+        matches: Match data as returned by mu.read_allmatches_csv
+        rules: Season settings (see standings_timeline.season_rules)
+        simulations: Number of simulated completions
+        seed: Seed of the random numbers (the result depends on nothing else)
+        workers: Worker processes (default os.cpu_count(); 1 runs in this process)
+
+    Returns:
+        dict: Group -> DataFrame of probabilities, one row per team and one
+            column per finishing position (1, 2, ...)
+    """
+    chunks = [min(SIMULATION_CHUNK, simulations - start) for start in range(0, simulations, SIMULATION_CHUNK)]
+    states = season_states(matches, rules)
+    executor = ProcessPoolExecutor(workers) if workers != 1 and len(chunks) > 1 else None
+    try:
+        output = {}
+        for number, (group, state) in enumerate(states.items()):
+            seeds = [np.random.SeedSequence(seed, spawn_key=(number, chunk)) for chunk in range(len(chunks))]
+            run = executor.map if executor is not None else map
+            counts = sum(run(_simulate_chunk, repeat(state), seeds, chunks))
+            output[group] = pd.DataFrame(counts / simulations, index=pd.Index(state.teams, name='team'),
+                                         columns=range(1, len(state.teams) + 1))
+        return output
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def make_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Argument parser"""
+    parser = argparse.ArgumentParser(
+        description='season_simulator.py\n'
+                    'Print the finishing-position probabilities of a season')
+    parser.add_argument('competition', help='Competition key (e.g. J1)')
+    parser.add_argument('-s', '--season', help='Season name (e.g. 2025, 2026East) [default: season in config]')
+    parser.add_argument('-n', '--simulations', type=int, default=100_000,
+                        help='Number of simulated seasons [default: 100000]')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed [default: 0]')
+    parser.add_argument('-j', '--workers', type=int, help='Worker processes [default: CPU count]')
+    parser.add_argument('-o', '--output', help='Also write the probabilities to this CSV')
+    parser.add_argument('-d', '--debug', action='store_true',
+                        help='Debug mode (print debug information)')
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Simulate the season given on the command line.
+
+    Relative paths in the config are resolved against the current directory,
+    which must be src/ (see __main__).
+    """
+    args = make_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+        datefmt='%H:%M:%S',
+    )
+    mu.init_config(Path(__file__).parent / '../config/jleague.yaml')
+    season = args.season or str(mu.config.season)
+    file = next((file for file in MatchArchive().files()
+                 if file.competition == args.competition and file.season == season), None)
+    if file is None:
+        raise SystemExit(f'No match CSV for {args.competition} {season}')
+    matches = mu.read_allmatches_csv(file.path)
+    positions = simulate_positions(matches, season_rules(file.competition, file.season_key, file.family),
+                                   args.simulations, args.seed, args.workers)
+    for group, table in positions.items():
+        print(f'{args.competition} {season} {group} ({args.simulations} simulations, seed {args.seed})')
+        print((table * 100).round(1).to_string())
+    if args.output:
+        pd.concat(positions, names=['group']).to_csv(args.output)
+
+
+if __name__ == '__main__':
+    os.chdir(Path(__file__).parent)
+    main()
@@ -0,0 +1,125 @@
+"""Persistent ledger of settled match-list sections.
+
+A section is *settled* when every match on its page has finished and the
+parsed records have been identical for ``settle_after`` consecutive fetches.
+A forced refresh (``read_jleague_matches.py -f``) then fetches every open
+section but re-verifies settled sections only on a slow rotation: at most
+``reverify_per_run`` per run, least recently verified first.  A re-verify
+that finds a changed page (a late correction) re-opens the section.
+
+The ledger is keyed by section page URL and stored as one JSON file::
+
+    {"https://www.jleague.jp/match/section/j1/1/":
+        {"digest": "<sha256 of the records>", "stable": 4,
+         "verified": "2026-10-17T01:00:05+09:00"}}
+
+Usage::
+
+    ledger = SectionLedger(path, settle_after=3, reverify_per_run=3)
+    to_fetch = ledger.select_sections({sec: url, ...})
+    ledger.observe(url, records, finished=True)
+    ledger.save()
+"""
+from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTLE_AFTER = 3
+DEFAULT_REVERIFY_PER_RUN = 3
+
+
+def records_digest(records: list[dict[str, Any]]) -> str:
+    """Return a stable SHA-256 digest of parsed section records."""
+    data = json.dumps(records, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class SectionLedger:
+    """Track which sections are settled and pick the ones a forced refresh must fetch."""
+
+    def __init__(self, path: str | os.PathLike,
+                 settle_after: int = DEFAULT_SETTLE_AFTER,
+                 reverify_per_run: int = DEFAULT_REVERIFY_PER_RUN):
+        self.path = Path(path)
+        self.settle_after = settle_after
+        self.reverify_per_run = reverify_per_run
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self._entries: dict[str, dict[str, Any]] = json.load(f)
+        except FileNotFoundError:
+            self._entries = {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignore unreadable section ledger %s: %s", self.path, e)
+            self._entries = {}
+
+    def is_settled(self, url: str) -> bool:
+        """Return True if the section page at url is settled."""
+        entry = self._entries.get(url)
+        return entry is not None and entry['stable'] >= self.settle_after
+
+    def observe(self, url: str, records: list[dict[str, Any]], finished: bool) -> None:
+        """Record one fetch of a section page.
+
+        Args:
+            url (str): Section page URL
+            records (list[dict[str, Any]]): Parsed match records of the page
+            finished (bool): True if every match on the page has finished
+        """
+        digest = records_digest(records)
+        with self._lock:
+            entry = self._entries.get(url)
+            if not finished:
+                stable = 0
+            elif entry is not None and entry['digest'] == digest:
+                stable = entry['stable'] + 1
+            else:
+                stable = 1
+            if entry is not None and entry['stable'] >= self.settle_after and stable < entry['stable']:
+                logger.info("Section %s changed after it was settled; re-open it", url)
+            self._entries[url] = {
+                'digest': digest,
+                'stable': stable,
+                'verified': datetime.now().astimezone().isoformat(timespec='seconds'),
+            }
+            self._dirty = True
+
+    def select_sections(self, section_urls: dict[int, str]) -> list[int]:
+        """Return the sections a forced refresh must fetch.
+
+        All open sections are returned, plus up to reverify_per_run settled
+        sections that were verified least recently.
+
+        Args:
+            section_urls (dict[int, str]): Section number -> section page URL
+
+        Returns:
+            list[int]: Sorted section numbers to fetch
+        """
+        open_sections = [sec for sec, url in section_urls.items() if not self.is_settled(url)]
+        settled = sorted((sec for sec, url in section_urls.items() if self.is_settled(url)),
+                         key=lambda sec: (self._entries[section_urls[sec]]['verified'], sec))
+        reverify = settled[:self.reverify_per_run]
+        logger.info("Ledger: %d open sections, re-verify %s of %d settled",
+                    len(open_sections), reverify, len(settled))
+        return sorted(open_sections + reverify)
+
+    def save(self) -> None:
+        """Write the ledger atomically if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+            tmp.write_text(json.dumps(self._entries, ensure_ascii=False, indent=1, sort_keys=True),
+                           encoding='utf-8')
+            os.replace(tmp, self.path)
+            self._dirty = False
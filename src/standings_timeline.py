@@ -0,0 +1,665 @@
+"""Precomputed per-date standings of a season.
+
+The viewer recomputes every team's points, max possible points, W/D/L
+and goals from the CSV each time the date slider moves.  This module
+does the same accumulation once per season in a vectorized NumPy pass
+and publishes the result next to the CSV as ``<csv name>.timeline.json``
+so that the viewer only has to index into it::
+
+    {"version":2,"source":"2025_allmatch_result-J1.csv","source_sha256":"...",
+     "point_system":"standard","tiebreak_order":["goal_diff","goal_get"],"season_teams":[...],
+     "groups":{"DefaultGroup":{"teams":["鹿島",...],"games":[38,...]}},"dates":[
+    {"date":"1970/01/01","groups":{"DefaultGroup":{"point":[0,...],"avlbl_pt":[114,...],...,"order":[0,1,...]}}},
+    {"date":"2025/02/14","groups":{...}},
+    ...
+    ]}
+
+Each entry of ``dates`` holds, per group, the values shown with the slider
+at that date (TeamStats.displayStats on the TypeScript side) indexed like
+the group's ``teams``, one line per date.  ``order`` lists team indices
+sorted by point and tiebreak_order; teams still tied keep team order.
+head_to_head ranks the teams level at that point by a mini-table of
+their matches against each other (points, goal difference, goals
+scored), again among the teams still level, until no group splits.  A
+group is split only when every pair in it has played (as computeH2H in
+sorter.ts, which compares points and goal difference once).
+
+The semantics follow the frontend (csv-parser.ts, point-calculator.ts,
+stats-calculator.ts, date-slider.ts):
+
+- rows with status '試合中止' are ignored
+- a match counts at a slider date when it has a result and its
+  match_date <= that date; other matches add the win points to avlbl_pt
+- slider dates are PRESEASON_SENTINEL plus every non-empty match_date
+- teams are the season's teams list followed by the teams in CSV order,
+  per group ('group' column, else DefaultGroup)
+
+Goals are compared as numbers (the TypeScript compares the CSV strings).
+
+A timeline is rewritten only when its CSV or rules changed.  After a rewrite by
+MatchUtils.update_if_diff in the same process, the dates before the
+earliest changed match keep their stored lines and only the later dates
+are recomputed (patch_timeline); otherwise the season is rebuilt.
+
+Usage::
+
+    python standings_timeline.py J1 J2 J3           # config.season
+    python standings_timeline.py J1 -s 2025
+    python standings_timeline.py --all              # every CSV of the archive
+"""
+import argparse
+import bisect
+from dataclasses import dataclass
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from match_utils import CsvUpdate
+from match_utils import MatchArchive
+from match_utils import mu
+
+logger = logging.getLogger(__name__)
+
+TIMELINE_VERSION = 2
+
+# Points per result type.  Must match POINT_MAPS in frontend/src/types/config.ts
+# (verified by scripts/check_type_sync.py).
+POINT_MAPS: dict[str, dict[str, int]] = {
+    'standard':        {'win': 3, 'ex_win': 3, 'pk_win': 0, 'pk_loss': 0, 'draw': 1, 'ex_loss': 0, 'loss': 0},
+    'victory-count':   {'win': 1, 'ex_win': 1, 'pk_win': 1, 'pk_loss': 0, 'draw': 0, 'ex_loss': 0, 'loss': 0},
+    'win3all-pkloss1': {'win': 3, 'ex_win': 3, 'pk_win': 3, 'pk_loss': 1, 'draw': 0, 'ex_loss': 0, 'loss': 0},
+    'graduated-win':   {'win': 3, 'ex_win': 2, 'pk_win': 1, 'pk_loss': 0, 'draw': 0, 'ex_loss': 0, 'loss': 0},
+    'ex-win-2':        {'win': 3, 'ex_win': 2, 'pk_win': 0, 'pk_loss': 0, 'draw': 1, 'ex_loss': 0, 'loss': 0},
+    'pk-win2-loss1':   {'win': 3, 'ex_win': 3, 'pk_win': 2, 'pk_loss': 1, 'draw': 0, 'ex_loss': 0, 'loss': 0},
+}
+
+# MatchResult literals, in TeamStats.resultCounts order
+RESULT_TYPES = ('win', 'ex_win', 'pk_win', 'draw', 'pk_loss', 'ex_loss', 'loss')
+
+# Results a league match can end with under each point system (the comments
+# on POINT_MAPS in frontend/src/types/config.ts); the losing side gets the
+# counterpart (RESULT_COUNTERPART).
+POINT_SYSTEM_RESULTS: dict[str, tuple[str, ...]] = {
+    'standard':        ('win', 'draw'),
+    'victory-count':   ('win', 'ex_win', 'pk_win'),
+    'win3all-pkloss1': ('win', 'ex_win', 'pk_win'),
+    'graduated-win':   ('win', 'ex_win', 'pk_win'),
+    'ex-win-2':        ('win', 'ex_win', 'draw'),
+    'pk-win2-loss1':   ('win', 'pk_win'),
+}
+
+# Result of the other side
+RESULT_COUNTERPART: dict[str, str] = {'win': 'loss', 'ex_win': 'ex_loss', 'pk_win': 'pk_loss', 'draw': 'draw',
+                                      'loss': 'win', 'ex_loss': 'ex_win', 'pk_loss': 'pk_win'}
+
+# Per-team values stored for every slider date
+STAT_FIELDS = ('point', 'avlbl_pt', 'all_game', 'goal_get', 'goal_diff') + RESULT_TYPES
+
+PRESEASON_SENTINEL = '1970/01/01'
+DEFAULT_GROUP = 'DefaultGroup'
+DEFAULT_TIEBREAK_ORDER = ('goal_diff', 'goal_get')
+CANCELLED_STATUS = '試合中止'
+
+# tiebreak_order keys read from the stats (head_to_head is computed from the matches)
+_STAT_TIEBREAKERS = {'goal_diff': 'goal_diff', 'goal_get': 'goal_get', 'wins': 'win'}
+
+
+@dataclass(frozen=True)
+class SeasonRules:
+    """Season settings the standings depend on (resolved from season_map.yaml).
+
+    Attributes:
+        point_system: POINT_MAPS key
+        tiebreak_order: Tiebreaker keys after points
+        teams: Season team list; these teams come first in every group
+    """
+    point_system: str = 'standard'
+    tiebreak_order: tuple[str, ...] = DEFAULT_TIEBREAK_ORDER
+    teams: tuple[str, ...] = ()
+
+
+def season_rules(competition: str, season_key: str, family_key: str = None) -> SeasonRules:
+    """Resolve the SeasonRules of a season with the frontend's cascade (season -> competition -> default).
+
+    Args:
+        competition: Competition key (e.g. 'J1')
+        season_key: Season key in season_map.yaml (e.g. '2025', '1993' for 1993A)
+        family_key: Top-level family key; defaults to the first family containing the competition
+
+    Returns:
+        SeasonRules: Resolved settings (defaults if the season is not in the map)
+    """
+    raw = mu.load_season_map_raw()
+    families = [family_key] if family_key else list(raw)
+    for key in families:
+        comp = raw.get(key, {}).get('competitions', {}).get(competition)
+        if comp is None:
+            continue
+        entry = comp.get('seasons', {}).get(season_key) or {}
+        return SeasonRules(
+            point_system=entry.get('point_system') or comp.get('point_system') or 'standard',
+            tiebreak_order=tuple(entry.get('tiebreak_order') or comp.get('tiebreak_order')
+                                 or DEFAULT_TIEBREAK_ORDER),
+            teams=tuple(entry.get('teams') or ()))
+    return SeasonRules()
+
+
+# CSV columns read by the engine (missing ones count as blank)
+_TEXT_COLUMNS = ('match_date', 'home_team', 'away_team', 'home_goal', 'away_goal', 'home_score_ex',
+                 'away_score_ex', 'home_pk_score', 'away_pk_score', 'status', 'group')
+
+
+def _text(matches: pd.DataFrame, column: str) -> np.ndarray:
+    """Column as an object array of str ('' for blanks and missing columns)."""
+    if column not in matches.columns:
+        return np.full(len(matches), '', dtype=object)
+    values = matches[column].to_numpy(dtype=object, copy=True)
+    values[pd.isna(values)] = ''
+    return values
+
+
+def _numbers(text: np.ndarray) -> np.ndarray:
+    """Parse text as float (NaN for blanks and non-numbers); each distinct text is parsed once."""
+    codes, uniques = pd.factorize(text)
+    parsed = np.full(len(uniques), np.nan)
+    for i, value in enumerate(uniques):
+        try:
+            parsed[i] = float(value)
+        except ValueError:
+            pass
+    return parsed[codes]
+
+
+def _results(text: dict[str, np.ndarray], point_system: str) -> dict[str, np.ndarray]:
+    """match_results on the columns of _TEXT_COLUMNS."""
+    point_map = POINT_MAPS[point_system]
+    played = np.concatenate([(text['home_goal'] != '') & (text['away_goal'] != '')] * 2)
+
+    def both_sides(home: str, away: str) -> tuple[np.ndarray, np.ndarray]:
+        values = _numbers(np.concatenate([text[home], text[away]]))
+        return values, np.roll(values, len(values) // 2)
+
+    goal_get, goal_lose = both_sides('home_goal', 'away_goal')
+    ex_get, ex_lose = both_sides('home_score_ex', 'away_score_ex')
+    pk_get, pk_lose = both_sides('home_pk_score', 'away_pk_score')
+    has_ex = ~np.isnan(ex_get) & ~np.isnan(ex_lose)
+    has_pk = ~np.isnan(pk_get) & ~np.isnan(pk_lose)
+    win = goal_get > goal_lose
+    loss = goal_get < goal_lose
+
+    # getPointFromResult
+    point = np.select(
+        [~played, win & has_ex, win, loss & has_ex, loss, has_pk & (pk_get > pk_lose), has_pk],
+        [0, point_map['ex_win'], point_map['win'], point_map['ex_loss'], point_map['loss'],
+         point_map['pk_win'], point_map['pk_loss']],
+        point_map['draw'])
+    # classifyResult
+    ex_decided = has_ex & (ex_get != ex_lose)
+    result = np.select(
+        [has_pk & (pk_get > pk_lose), has_pk, ex_decided & (ex_get > ex_lose), ex_decided,
+         point >= point_map['win'], point >= 1],
+        [RESULT_TYPES.index(name) for name in ('pk_win', 'pk_loss', 'ex_win', 'ex_loss', 'win', 'draw')],
+        RESULT_TYPES.index('loss'))
+    return {
+        'played': played,
+        'point': point.astype(np.int64),
+        'result': result,
+        'goal_get': np.nan_to_num(goal_get).astype(np.int64),
+        'goal_lose': np.nan_to_num(goal_lose).astype(np.int64),
+    }
+
+
+def match_results(matches: pd.DataFrame, point_system: str = 'standard') -> dict[str, np.ndarray]:
+    """Points and result type of every match, from both teams' side.
+
+    Element i < len(matches) is the home team of row i, element
+    len(matches) + i its away team.
+
+    Returns:
+        dict: 'played' (bool), 'point' (int), 'result' (index into
+            RESULT_TYPES), 'goal_get' and 'goal_lose' (int, 0 if blank)
+    """
+    return _results({name: _text(matches, name) for name in _TEXT_COLUMNS}, point_system)
+
+
+def slider_dates(matches: pd.DataFrame) -> list[str]:
+    """PRESEASON_SENTINEL followed by the sorted non-empty match dates."""
+    return _slider_dates(_text(matches, 'match_date'))
+
+
+def _slider_dates(match_dates: np.ndarray) -> list[str]:
+    dates = set(match_dates)
+    dates.discard('')
+    dates.add(PRESEASON_SENTINEL)
+    return sorted(dates)
+
+
+@dataclass
+class _Season:
+    """A season's match columns with the stat matrix column of every team side.
+
+    Attributes:
+        text: _TEXT_COLUMNS as object arrays of str
+        dates: Slider dates
+        group_teams: Group -> team list in frontend order
+        columns: (group, team) -> stat matrix column (groups are contiguous)
+        column: Column of every side; home sides of all rows, then away sides
+        active: Rows that are not cancelled
+    """
+    text: dict[str, np.ndarray]
+    dates: list[str]
+    group_teams: dict[str, list[str]]
+    columns: dict[tuple[str, str], int]
+    column: np.ndarray
+    active: np.ndarray
+
+    @classmethod
+    def from_matches(cls, matches: pd.DataFrame, teams: tuple[str, ...]) -> '_Season':
+        text = {name: _text(matches, name) for name in _TEXT_COLUMNS}
+        groups = text['group'].copy()
+        groups[groups == ''] = DEFAULT_GROUP
+        # Sides in CSV order (home, away of row 0, home, away of row 1, ...)
+        sides = np.empty(2 * len(groups), dtype=object)
+        sides[0::2] = text['home_team']
+        sides[1::2] = text['away_team']
+        codes, uniques = pd.factorize(np.repeat(groups, 2) + '\t' + sides)
+        keys = [tuple(key.split('\t')) for key in uniques]
+        team_lists: dict[str, dict[str, None]] = {}
+        for group, team in keys:
+            team_lists.setdefault(group, dict.fromkeys(teams)).setdefault(team)
+        group_teams = {group: list(names) for group, names in team_lists.items()}
+        columns = {}
+        for group, names in group_teams.items():
+            for name in names:
+                columns[(group, name)] = len(columns)
+        column = np.array([columns[key] for key in keys], dtype=np.int64)[codes]
+        return cls(text, _slider_dates(text['match_date']), group_teams, columns,
+                   np.concatenate([column[0::2], column[1::2]]), text['status'] != CANCELLED_STATUS)
+
+    def span(self, group: str) -> slice:
+        """Stat matrix columns of a group."""
+        names = self.group_teams[group]
+        return slice(self.columns[(group, names[0])], self.columns[(group, names[-1])] + 1)
+
+
+def _accumulate(season: _Season, rules: SeasonRules, start: int = 0,
+                base: dict[str, np.ndarray] = None) -> tuple[dict[str, np.ndarray], np.ndarray]:
+    """Stat matrices ([date, column]) for season.dates[start:] and the games of every column.
+
+    With start > 0 only the matches dated dates[start] or later are
+    evaluated; base holds the stats at dates[start - 1] (one value per
+    column) which already include every earlier match.
+    """
+    max_point = POINT_MAPS[rules.point_system]['win']
+    dates = season.dates
+    rows_count = len(season.active)
+    games = np.bincount(season.column[np.concatenate([season.active, season.active])],
+                        minlength=len(season.columns))
+
+    rows = season.active if start == 0 else season.active & (season.text['match_date'] >= dates[start])
+    rows = np.flatnonzero(rows)
+    results = _results({name: values[rows] for name, values in season.text.items()}, rules.point_system)
+    column = np.concatenate([season.column[rows], season.column[rows_count + rows]])
+    side_dates = np.concatenate([season.text['match_date'][rows]] * 2)
+    # First slider date at which each match counts; len(dates) = never ('' counts from the start)
+    first = np.searchsorted(np.array(dates, dtype=object), side_dates, side='left')
+    counted = results['played'] & (first < len(dates))
+    shape = (len(dates) - start, len(season.columns))
+    at = (first[counted] - start, column[counted])
+
+    def cumulative(name: str, values: np.ndarray) -> np.ndarray:
+        delta = np.zeros(shape, dtype=np.int64)
+        if base is not None:
+            delta[0] = base[name]
+        np.add.at(delta, at, values[counted])
+        return np.cumsum(delta, axis=0)
+
+    stats = {
+        'point': cumulative('point', results['point']),
+        'all_game': cumulative('all_game', np.ones(len(column), dtype=np.int64)),
+        'goal_get': cumulative('goal_get', results['goal_get']),
+        'goal_diff': cumulative('goal_diff', results['goal_get'] - results['goal_lose']),
+    }
+    stats['avlbl_pt'] = stats['point'] + max_point * (games - stats['all_game'])
+    for code, name in enumerate(RESULT_TYPES):
+        stats[name] = cumulative(name, (results['result'] == code).astype(np.int64))
+    return stats, games
+
+
+def _date_rows(season: _Season, stats: dict[str, np.ndarray], rules: SeasonRules,
+               start: int = 0) -> list[dict[str, Any]]:
+    """Timeline entries of season.dates[start:] (stats hold those dates only)."""
+    matches = _head_to_head(season, rules, start) if 'head_to_head' in rules.tiebreak_order else None
+    groups = {}
+    for group in season.group_teams:
+        span = season.span(group)
+        values = {name: stats[name][:, span].tolist() for name in STAT_FIELDS}
+        values['order'] = _order({name: stats[name][:, span] for name in STAT_FIELDS}, rules.tiebreak_order,
+                                 matches.within(span) if matches is not None else None).tolist()
+        groups[group] = values
+    return [{'date': date, 'groups': {group: {name: values[name][i] for name in values}
+                                      for group, values in groups.items()}}
+            for i, date in enumerate(season.dates[start:])]
+
+
+def build_timeline(matches: pd.DataFrame, rules: SeasonRules = SeasonRules()) -> dict[str, Any]:
+    """Compute the per-date standings of one season.
+
+    Args:
+        matches: Match data as returned by mu.read_allmatches_csv
+        rules: Season settings (see season_rules)
+
+    Returns:
+        dict: Timeline without the source fields (see the module docstring)
+    """
+    season = _Season.from_matches(matches, rules.teams)
+    stats, games = _accumulate(season, rules)
+    return {
+        'version': TIMELINE_VERSION,
+        'point_system': rules.point_system,
+        'tiebreak_order': list(rules.tiebreak_order),
+        'season_teams': list(rules.teams),
+        'groups': {group: {'teams': names, 'games': games[season.span(group)].tolist()}
+                   for group, names in season.group_teams.items()},
+        'dates': _date_rows(season, stats, rules),
+    }
+
+
+_DECODER = json.JSONDecoder()
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def dump_timeline(timeline: dict[str, Any]) -> str:
+    """Serialize a timeline as published: compact JSON with one line per date.
+
+    The first line holds every field but the dates; patch_timeline keeps
+    the lines of unchanged dates as they are.
+    """
+    header = _dumps({key: value for key, value in timeline.items() if key != 'dates'})
+    rows = ',\n'.join(_dumps(row) for row in timeline['dates'])
+    return f'{header[:-1]},"dates":[\n{rows}\n]}}\n'
+
+
+def _same_rules(timeline: dict[str, Any], rules: SeasonRules) -> bool:
+    """True if timeline was built by this version with rules."""
+    return (timeline.get('version') == TIMELINE_VERSION
+            and timeline.get('point_system') == rules.point_system
+            and timeline.get('tiebreak_order') == list(rules.tiebreak_order)
+            and timeline.get('season_teams') == list(rules.teams))
+
+
+def _read_header(text: str) -> tuple[dict[str, Any], list[str]] | None:
+    """Fields but the dates, and the date lines (without separators) of a dumped timeline."""
+    lines = text.split('\n')
+    if len(lines) < 4 or not lines[0].endswith('"dates":[') or lines[-2:] != [']}', '']:
+        return None
+    try:
+        header = json.loads(lines[0] + ']}')
+    except ValueError:
+        return None
+    del header['dates']
+    return header, [line.removesuffix(',') for line in lines[1:-2]]
+
+
+def patch_timeline(text: str, matches: pd.DataFrame, since: str, rules: SeasonRules = SeasonRules(),
+                   source_sha256: str = None) -> str | None:
+    """Bring a dumped timeline up to date with matches changed on or after a date.
+
+    The lines of the dates before ``since`` are kept as they are (they are
+    parsed and rewritten only when the number of games changed, which
+    changes avlbl_pt); the later dates are recomputed from the matches
+    dated ``since`` or later.
+
+    Args:
+        text: Timeline of the matches before the change (see dump_timeline)
+        matches: Match data after the change
+        since: Earliest match_date of the changed rows, before or after the change
+            (see MatchChangeset.match_dates)
+        rules: Season settings the timeline was built with
+        source_sha256: New value of the source_sha256 field (kept if None)
+
+    Returns:
+        str | None: The patched timeline text, or None if it cannot be patched
+            (other rules or teams, a change before the first match date, or
+            no match left on or after ``since``)
+    """
+    parsed = _read_header(text)
+    if parsed is None or not _same_rules(parsed[0], rules):
+        return None
+    header, lines = parsed
+    season = _Season.from_matches(matches, rules.teams)
+    dates = season.dates
+    start = bisect.bisect_left(dates, since)
+    # Each line starts with {"date":<date>
+    if start == 0 or start == len(dates) or [_DECODER.raw_decode(line, 8)[0] for line in lines[:start]] != dates[:start]:
+        return None
+    if [(group, entry['teams']) for group, entry in header['groups'].items()] != list(season.group_teams.items()):
+        return None
+
+    before = json.loads(lines[start - 1])['groups']
+    base = {name: np.array([value for group in season.group_teams for value in before[group][name]])
+            for name in STAT_FIELDS}
+    stats, games = _accumulate(season, rules, start, base)
+    kept = lines[:start]
+    stored_games = [value for entry in header['groups'].values() for value in entry['games']]
+    if stored_games != games.tolist():
+        max_point = POINT_MAPS[rules.point_system]['win']
+        rows = [json.loads(line) for line in kept]
+        for group, entry in header['groups'].items():
+            entry['games'] = games[season.span(group)].tolist()
+            for row in rows:
+                values = row['groups'][group]
+                values['avlbl_pt'] = [point + max_point * (count - played) for point, count, played
+                                      in zip(values['point'], entry['games'], values['all_game'])]
+        kept = [_dumps(row) for row in rows]
+    if source_sha256 is not None:
+        header['source_sha256'] = source_sha256
+    rows = kept + [_dumps(row) for row in _date_rows(season, stats, rules, start)]
+    return f'{_dumps(header)[:-1]},"dates":[\n' + ',\n'.join(rows) + '\n]}\n'
+
+
+def _dense(keys: list[np.ndarray]) -> np.ndarray:
+    """Number the distinct key tuples of every date in sort order (keys[0] first; lower is better).
+
+    Labels are unique across dates, so two teams compare equal only at the same date.
+    """
+    shape = keys[0].shape
+    flat = [np.repeat(np.arange(shape[0]), shape[1])] + [key.ravel() for key in keys]
+    order = np.lexsort(flat[::-1])
+    ordered = np.stack(flat)[:, order]
+    labels = np.empty(len(order), dtype=np.int64)
+    labels[order] = np.cumsum(np.r_[True, (ordered[:, 1:] != ordered[:, :-1]).any(axis=0)]) - 1
+    return labels.reshape(shape)
+
+
+@dataclass(frozen=True)
+class _HeadToHead:
+    """Played matches of a group for head-to-head mini-tables.
+
+    Attributes:
+        first: Date index from which each match counts
+        home / away: Team index (within the group) of each side
+        home_point / away_point, home_goal / away_goal: Each side's points and goals
+    """
+    first: np.ndarray
+    home: np.ndarray
+    away: np.ndarray
+    home_point: np.ndarray
+    away_point: np.ndarray
+    home_goal: np.ndarray
+    away_goal: np.ndarray
+
+    def within(self, span: slice) -> '_HeadToHead':
+        """The matches of one group with team indices relative to the group."""
+        # Both sides of a match are in the same group
+        rows = (self.home >= span.start) & (self.home < span.stop)
+        return _HeadToHead(self.first[rows], self.home[rows] - span.start, self.away[rows] - span.start,
+                           self.home_point[rows], self.away_point[rows], self.home_goal[rows], self.away_goal[rows])
+
+    def refine(self, labels: np.ndarray) -> np.ndarray:
+        """Split tied teams by their mini-table, again among the teams still tied until nothing changes.
+
+        A mini-table ranks by points, goal difference and goals scored in the
+        matches between the tied teams only.  Teams stay tied (for the next
+        tiebreaker) unless every pair of them has played at least once, as
+        computeH2H in frontend/src/core/sorter.ts.
+        """
+        dates, teams = labels.shape
+        counted = np.arange(dates)[:, None] >= self.first
+        while True:
+            # Matches between two teams of the same class, per date
+            day, match = np.nonzero(counted & (labels[:, self.home] == labels[:, self.away]))
+            home, away = self.home[match], self.away[match]
+
+            def total(side: np.ndarray, values: np.ndarray) -> np.ndarray:
+                return np.bincount(day * teams + side, weights=values[match],
+                                   minlength=dates * teams).reshape(dates, teams)
+
+            point = total(home, self.home_point) + total(away, self.away_point)
+            goal_get = total(home, self.home_goal) + total(away, self.away_goal)
+            goal_lose = total(home, self.away_goal) + total(away, self.home_goal)
+            # Classes in which every pair has met
+            size = np.bincount(labels.ravel(), minlength=labels.max() + 1)
+            pairs = np.unique(day * teams * teams + np.minimum(home, away) * teams + np.maximum(home, away))
+            met = np.bincount(labels[pairs // (teams * teams), pairs // teams % teams], minlength=len(size))
+            complete = ((size > 1) & (met == size * (size - 1) // 2))[labels]
+            refined = _dense([labels] + [np.where(complete, -value, 0)
+                                         for value in (point, goal_get - goal_lose, goal_get)])
+            if refined.max() == labels.max():
+                return refined
+            labels = refined
+
+
+def _head_to_head(season: _Season, rules: SeasonRules, start: int = 0) -> _HeadToHead:
+    """Every played match of the season for dates[start:] (team indices are stat matrix columns)."""
+    rows = np.flatnonzero(season.active)
+    results = _results({name: values[rows] for name, values in season.text.items()}, rules.point_system)
+    count = len(rows)
+    first = np.searchsorted(np.array(season.dates, dtype=object), season.text['match_date'][rows], side='left')
+    first = np.where(results['played'][:count], np.maximum(first - start, 0), len(season.dates))
+    return _HeadToHead(first, season.column[rows], season.column[len(season.active) + rows],
+                       results['point'][:count], results['point'][count:],
+                       results['goal_get'][:count], results['goal_get'][count:])
+
+
+def _order(stats: dict[str, np.ndarray], tiebreak_order: tuple[str, ...],
+           head_to_head: _HeadToHead = None) -> np.ndarray:
+    """Team indices per date, sorted by point then tiebreak_order (tied teams in team order).
+
+    head_to_head holds the group's matches (team indices within the group);
+    without it the head_to_head key is skipped.
+    """
+    labels = _dense([-stats['point']])
+    for key in tiebreak_order:
+        if key in _STAT_TIEBREAKERS:
+            labels = _dense([labels, -stats[_STAT_TIEBREAKERS[key]]])
+        elif key == 'head_to_head' and head_to_head is not None:
+            labels = head_to_head.refine(labels)
+    return np.lexsort((np.broadcast_to(np.arange(labels.shape[1]), labels.shape), labels), axis=-1)
+
+
+def timeline_path(csv_path: str | os.PathLike) -> Path:
+    """Timeline JSON published next to a match CSV."""
+    path = Path(csv_path)
+    return path.with_name(f'{path.stem}.timeline.json')
+
+
+def _patch_since(header: dict[str, Any], updates: list[CsvUpdate], source_sha256: str) -> str | None:
+    """Earliest changed match_date if updates lead from the timeline's source to the current CSV."""
+    if not updates or any(update.match_dates is None for update in updates):
+        return None
+    chain = [header.get('source_sha256')] + [update.new_sha256 for update in updates]
+    if [update.old_sha256 for update in updates] != chain[:-1] or chain[-1] != source_sha256:
+        return None
+    return min(date for update in updates for date in update.match_dates)
+
+
+def write_timeline(csv_path: str, rules: SeasonRules = SeasonRules(), updates: list[CsvUpdate] = None) -> bool:
+    """Bring the timeline of a match CSV up to date.
+
+    Nothing is computed when the stored timeline was built from the
+    current CSV with the same rules.  When updates (see
+    MatchUtils.take_csv_updates) lead from the stored timeline's CSV to the
+    current one, only the dates from the earliest changed match onward are
+    recomputed (patch_timeline); otherwise the timeline is rebuilt.
+
+    Args:
+        csv_path: Match CSV path
+        rules: Season settings (see season_rules)
+        updates: Rewrites of the CSV since the timeline was written
+
+    Returns:
+        bool: True if the timeline file was created or updated
+    """
+    source_sha256 = hashlib.sha256(Path(csv_path).read_bytes()).hexdigest()
+    output = timeline_path(csv_path)
+    stored = output.read_text(encoding='utf-8') if output.exists() else ''
+    parsed = _read_header(stored)
+    if parsed is not None and parsed[0].get('source_sha256') == source_sha256 and _same_rules(parsed[0], rules):
+        return False
+
+    matches = mu.read_allmatches_csv(csv_path, copy=False)
+    text = None
+    since = _patch_since(parsed[0], updates, source_sha256) if parsed is not None else None
+    if since is not None:
+        text = patch_timeline(stored, matches, since, rules, source_sha256)
+    if text is not None:
+        logger.info("Patch %s from %s", output, since)
+    else:
+        logger.info("Rebuild %s", output)
+        text = dump_timeline({'source': Path(csv_path).name, 'source_sha256': source_sha256,
+                              **build_timeline(matches, rules)})
+    output.write_text(text, encoding='utf-8')
+    return True
+
+
+def make_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Argument parser"""
+    parser = argparse.ArgumentParser(
+        description='standings_timeline.py\n'
+                    'Write the per-date standings timeline JSON next to match CSVs')
+    parser.add_argument('competition', default=['J1', 'J2', 'J3'], nargs='*',
+                        help='Competition key (e.g. J1 J2 J3)')
+    parser.add_argument('-s', '--season', help='Season name; sub-seasons (e.g. 2026East) are included [default: season in config]')
+    parser.add_argument('--all', action='store_true',
+                        help='Every match CSV listed in season_map.yaml (ignores competition / season)')
+    parser.add_argument('-d', '--debug', action='store_true',
+                        help='Debug mode (print debug information)')
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Write the timelines of the CSVs given on the command line.
+
+    Relative paths in the config are resolved against the current directory,
+    which must be src/ (see __main__).
+    """
+    args = make_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+        datefmt='%H:%M:%S',
+    )
+    mu.init_config(Path(__file__).parent / '../config/jleague.yaml')
+    targets = []
+    season = args.season or str(mu.config.season)
+    for file in MatchArchive().files():
+        if args.all or (file.competition in args.competition and file.season.startswith(season)):
+            targets.append(file)
+    for file in targets:
+        write_timeline(file.path, season_rules(file.competition, file.season_key, file.family),
+                       mu.take_csv_updates(file.path))
+
+
+if __name__ == '__main__':
+    os.chdir(Path(__file__).parent)
+    main()
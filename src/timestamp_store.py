@@ -0,0 +1,200 @@
+"""In-memory store for the CSV update timestamps (docs/csv/csv_timestamp.csv).
+
+The timestamp file is loaded once per process.  Lookups are dict accesses,
+and updates are kept in memory until flush(), which normally runs once at
+interpreter exit.  A flush takes an exclusive lock on ``<file>.lock``,
+re-reads the file, applies only this process's pending changes and
+replaces the file atomically, so readers running as separate processes
+never drop each other's rows.
+
+The committed CSV keeps its ``file,date`` format, which the frontend
+reads.  The content hashes of MatchUtils.update_if_diff go to a separate
+``file,sha256`` file (hash_path, under local_data/), written the same
+way; without hash_path they are kept for the process only.
+
+Usage::
+
+    store = TimestampStore('../docs/csv/csv_timestamp.csv', 'Asia/Tokyo',
+                           '../local_data/csv_content_hash.csv')
+    store.set('../docs/csv/2026_allmatch_result-J1.csv', date=now, sha256=digest)
+    store.get('../docs/csv/2026_allmatch_result-J1.csv')['date']
+    store.flush()
+"""
+import atexit
+from contextlib import contextmanager
+import csv
+from datetime import datetime
+from datetime import tzinfo
+import io
+import logging
+import os
+from pathlib import Path
+import threading
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from zoneinfo import ZoneInfo
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('date', 'sha256')
+
+_stores: list['TimestampStore'] = []
+_stores_lock = threading.Lock()
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on path (created if missing) across processes."""
+    with open(path, 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _parse_date(text: str, tz: tzinfo) -> datetime | None:
+    """Parse a date written by pandas / str(datetime); naive values are localized to tz."""
+    if not text:
+        return None
+    value = datetime.fromisoformat(text)
+    return value.replace(tzinfo=tz) if value.tzinfo is None else value.astimezone(tz)
+
+
+def _read_rows(path: Path, tz: tzinfo) -> dict[str, datetime | None]:
+    """Read the timestamp CSV; for duplicated files the most recent date wins."""
+    rows: dict[str, datetime | None] = {}
+    try:
+        with open(path, encoding='utf-8', newline='') as f:
+            for record in csv.DictReader(f):
+                date = _parse_date(record.get('date') or '', tz)
+                old = rows.get(record['file'])
+                if old is not None and (date is None or old >= date):
+                    logger.warning("Duplicate %s in timestamp file (keeping most recent)", record['file'])
+                    continue
+                rows[record['file']] = date
+    except FileNotFoundError:
+        pass
+    return rows
+
+
+def _read_hashes(path: Path) -> dict[str, str]:
+    """Read the content hash CSV (file,sha256)."""
+    try:
+        with open(path, encoding='utf-8', newline='') as f:
+            return {record['file']: record['sha256'] for record in csv.DictReader(f) if record.get('sha256')}
+    except FileNotFoundError:
+        return {}
+
+
+def _format_rows(column: str, rows: dict[str, Any]) -> str:
+    """Serialize rows as a two-column CSV (file, column)."""
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(('file', column))
+    for filename, value in rows.items():
+        writer.writerow((filename, str(value)))
+    return out.getvalue()
+
+
+def _merge_into(path: Path, column: str, read: Callable[[Path], dict[str, Any]],
+                pending: dict[str, Any]) -> dict[str, Any]:
+    """Apply pending values to the file under its lock, replace it atomically and return its rows."""
+    with _file_lock(path.with_name(path.name + '.lock')):
+        rows = read(path)
+        rows.update(pending)
+        # None clears a value
+        rows = {filename: value for filename, value in rows.items() if value is not None}
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        tmp.write_text(_format_rows(column, rows), encoding='utf-8', newline='')
+        os.replace(tmp, path)
+    return rows
+
+
+class TimestampStore:
+    """Timestamp records of one timestamp file, flushed in a batch."""
+
+    def __init__(self, path: str | os.PathLike, tz: str | tzinfo, hash_path: str | os.PathLike = None):
+        self.path = Path(path)
+        self.hash_path = Path(hash_path) if hash_path is not None else None
+        self.tz = ZoneInfo(tz) if isinstance(tz, str) else tz
+        self._lock = threading.RLock()
+        self._values: dict[str, dict[str, Any]] = {
+            'date': _read_rows(self.path, self.tz),
+            'sha256': _read_hashes(self.hash_path) if self.hash_path is not None else {},
+        }
+        self._pending: dict[str, dict[str, Any]] = {column: {} for column in COLUMNS}
+        with _stores_lock:
+            _stores.append(self)
+
+    def get(self, filename: str) -> dict[str, Any] | None:
+        """Return {'date': datetime | None, 'sha256': str | None} for filename, or None."""
+        with self._lock:
+            if not any(filename in values for values in self._values.values()):
+                return None
+            return {column: values.get(filename) for column, values in self._values.items()}
+
+    def set(self, filename: str, **values: Any) -> None:
+        """Update columns ('date', 'sha256') of filename's record; written by flush() if they changed."""
+        unknown = set(values) - set(COLUMNS)
+        if unknown:
+            raise KeyError(f"Unknown timestamp columns {sorted(unknown)}")
+        with self._lock:
+            for column, value in values.items():
+                # Values already recorded are not written again
+                if filename not in self._values[column] or self._values[column][filename] != value:
+                    self._values[column][filename] = value
+                    self._pending[column][filename] = value
+
+    @property
+    def dirty(self) -> bool:
+        """True if there are updates not yet flushed."""
+        return any(self._pending.values())
+
+    def flush(self) -> None:
+        """Merge pending updates into the timestamp (and hash) file under the file lock."""
+        with self._lock:
+            files = {'date': (self.path, lambda path: _read_rows(path, self.tz)),
+                     'sha256': (self.hash_path, _read_hashes)}
+            for column, (path, read) in files.items():
+                pending = self._pending[column]
+                if not pending:
+                    continue
+                if path is None:
+                    pending.clear()
+                    continue
+                if column == 'sha256':
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                elif not path.parent.is_dir():
+                    logger.warning("Directory %s is gone; dropping %d updates", path.parent, len(pending))
+                    pending.clear()
+                    continue
+                self._values[column] = _merge_into(path, column, read, pending)
+                logger.debug("Flushed %d %s updates to %s", len(pending), column, path)
+                pending.clear()
+
+
+@atexit.register
+def flush_all() -> None:
+    """Flush every store of this process (registered to run at exit)."""
+    with _stores_lock:
+        stores = list(_stores)
+    for store in stores:
+        try:
+            store.flush()
+        except OSError as e:
+            logger.error("Could not write timestamps to %s: %s", store.path, e)
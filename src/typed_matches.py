@@ -0,0 +1,224 @@
+"""Compact typed in-memory form of the match CSVs.
+
+MatchUtils.read_allmatches_csv keeps every column as str/object, which is
+what the scrapers and the diff/merge code expect.  For whole-archive
+analysis (all seasons under docs/csv) this module loads the same files
+with dtypes derived from CSV_COLUMN_SCHEMA:
+
+- 'str' columns (teams, stadium, status, round, group, ...): category
+- 'int' / 'nullable_int' columns: nullable small ints (TYPED_INT_DTYPES)
+- match_date: datetime64 (the file's date format is remembered)
+
+The conversion is lossless: TypedMatchTable.to_csv() reproduces the
+published file byte for byte.  Cells whose text does not come back from
+the typed value (e.g. '未定' in match_date, '4.0' in a PK column) keep
+their original text in ``raw_cells``; their typed value is the parsed
+value when there is one and NA otherwise.
+
+Usage::
+
+    table = read_typed_matches_csv('../docs/csv/2025_allmatch_result-J1.csv')
+    table.frame.groupby('home_team', observed=True)['home_goal'].sum()
+    table.to_csv()  # == the file contents
+"""
+from dataclasses import dataclass
+from dataclasses import field
+from os import PathLike
+import re
+
+import numpy as np
+import pandas as pd
+
+from match_utils import CSV_COLUMN_SCHEMA
+
+# Integer dtypes for the 'int' / 'nullable_int' columns of CSV_COLUMN_SCHEMA.
+# Integer columns missing here use DEFAULT_INT_DTYPE.
+TYPED_INT_DTYPES: dict[str, str] = {
+    'section_no': 'Int16',
+    'match_index_in_section': 'Int16',
+    'home_goal': 'Int8',
+    'away_goal': 'Int8',
+    'home_pk_score': 'Int8',
+    'away_pk_score': 'Int8',
+    'home_score_ex': 'Int8',
+    'away_score_ex': 'Int8',
+    'leg': 'Int8',
+    'attendance': 'Int32',
+    'match_number': 'Int32',
+}
+DEFAULT_INT_DTYPE = 'Int32'
+
+# Formats tried for match_date; the one parsing most cells is used for output.
+DATE_FORMATS = ('%Y/%m/%d', '%Y-%m-%d')
+
+_CANONICAL_INT_RE = re.compile(r'^(0|-?[1-9][0-9]*)$')
+
+
+def typed_dtype(column: str) -> str:
+    """Return the typed dtype of a CSV column: an Int dtype, 'datetime64' or 'category'."""
+    if column == 'match_date':
+        return 'datetime64'
+    if CSV_COLUMN_SCHEMA.get(column) in ('int', 'nullable_int'):
+        return TYPED_INT_DTYPES.get(column, DEFAULT_INT_DTYPE)
+    return 'category'
+
+
+def _format_ints(values: pd.Series) -> pd.Series:
+    """Format a nullable int column as CSV text ('' for NA)."""
+    return values.astype('string').fillna('').astype(object)
+
+
+def _format_dates(values: pd.Series, date_format: str) -> pd.Series:
+    """Format a datetime column as CSV text ('' for NaT)."""
+    return values.dt.strftime(date_format).fillna('').astype(object)
+
+
+def _format_categories(values: pd.Series) -> pd.Series:
+    """Format a category column as CSV text ('' for NA)."""
+    return values.astype(object).fillna('')
+
+
+def _to_ints(text: pd.Series, dtype: str) -> tuple[pd.Series, np.ndarray]:
+    """Parse integer text into dtype.
+
+    Blanks, non-integers and out-of-range values become NA.  Returns the
+    values and a mask of the cells that do not format back to their text.
+    Each distinct text is parsed once.
+    """
+    codes, uniques = pd.factorize(text)
+    info = np.iinfo(dtype.lower())
+    parsed = []
+    exact = np.ones(len(uniques), dtype=bool)
+    for value in uniques:
+        number = None
+        if _CANONICAL_INT_RE.match(value):
+            number = int(value)
+        elif value:
+            exact[len(parsed)] = False
+            try:
+                number = float(value)
+            except ValueError:
+                pass
+            if number is not None and not (np.isfinite(number) and number == int(number)):
+                number = None
+        if number is not None and not info.min <= number <= info.max:
+            exact[len(parsed)] = False
+            number = None
+        parsed.append(None if number is None else int(number))
+    values = pd.array(parsed, dtype=dtype).take(codes)
+    return pd.Series(values, index=text.index, name=text.name), ~exact[codes]
+
+
+def _to_dates(text: pd.Series) -> tuple[pd.Series, str, np.ndarray]:
+    """Parse date text with the most common of DATE_FORMATS (others fill the gaps).
+
+    Returns the dates, the format and a mask of the cells that do not
+    format back to their text.  Each distinct text is parsed once.
+    """
+    codes, uniques = pd.factorize(text)
+    uniques = pd.Series(uniques, dtype=object)
+    parsed = [pd.to_datetime(uniques, format=fmt, errors='coerce') for fmt in DATE_FORMATS]
+    counts = np.bincount(codes, minlength=len(uniques))
+    order = sorted(range(len(DATE_FORMATS)), key=lambda i: -counts[parsed[i].notna().to_numpy()].sum())
+    dates = parsed[order[0]]
+    for i in order[1:]:
+        dates = dates.fillna(parsed[i])
+    date_format = DATE_FORMATS[order[0]]
+    exact = (_format_dates(dates, date_format) == uniques).to_numpy()
+    values = pd.Series(dates.to_numpy()[codes], index=text.index, name=text.name)
+    return values, date_format, ~exact[codes]
+
+
+def _to_categories(text: pd.Series) -> tuple[pd.Series, np.ndarray]:
+    """Convert text to a category column ('' becomes NA; always exact)."""
+    codes, uniques = pd.factorize(text, sort=True)
+    blank = np.asarray(uniques == '')
+    if blank.any():
+        remap = np.cumsum(~blank) - 1
+        remap[blank] = -1
+        codes = remap[codes]
+        uniques = uniques[~blank]
+    values = pd.Categorical.from_codes(codes, categories=uniques)
+    return pd.Series(values, index=text.index, name=text.name), np.zeros(len(text), dtype=bool)
+
+
+@dataclass
+class TypedMatchTable:
+    """A match CSV held with compact dtypes, convertible back to the exact CSV text.
+
+    Attributes:
+        frame: Typed match data (see typed_dtype for the column dtypes)
+        date_format: strftime format used to write match_date back
+        int_index: True if the CSV index was converted to int64
+        raw_cells: Column -> {row position: original text} for cells that
+            do not format back from their typed value.  Positions refer to
+            the rows as loaded, so they apply only while frame keeps that
+            row order.
+    """
+    frame: pd.DataFrame
+    date_format: str = DATE_FORMATS[0]
+    int_index: bool = False
+    raw_cells: dict[str, dict[int, str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_strings(cls, df: pd.DataFrame) -> 'TypedMatchTable':
+        """Convert a frame of CSV text (read with dtype=str, keep_default_na=False)."""
+        typed = {}
+        raw_cells = {}
+        date_format = DATE_FORMATS[0]
+        for col in df.columns:
+            text = df[col]
+            dtype = typed_dtype(col)
+            if dtype == 'datetime64':
+                values, date_format, inexact = _to_dates(text)
+            elif dtype == 'category':
+                values, inexact = _to_categories(text)
+            else:
+                values, inexact = _to_ints(text, dtype)
+            if inexact.any():
+                raw_cells[col] = {int(pos): text.iat[pos] for pos in np.flatnonzero(inexact)}
+            typed[col] = values
+        frame = pd.DataFrame(typed, index=df.index, columns=df.columns)
+        int_index = bool(len(df.index)) and all(_CANONICAL_INT_RE.match(label) for label in df.index)
+        if int_index:
+            frame.index = df.index.astype('int64')
+        return cls(frame, date_format, int_index, raw_cells)
+
+    def to_strings(self) -> pd.DataFrame:
+        """Return the frame as CSV text, the inverse of from_strings."""
+        columns = {}
+        for col in self.frame.columns:
+            values = self.frame[col]
+            dtype = typed_dtype(col)
+            if dtype == 'datetime64':
+                text = _format_dates(values, self.date_format)
+            elif dtype == 'category':
+                text = _format_categories(values)
+            else:
+                text = _format_ints(values)
+            text = text.to_numpy(copy=True)
+            for pos, raw in self.raw_cells.get(col, {}).items():
+                text[pos] = raw
+            columns[col] = text
+        index = self.frame.index.astype(str) if self.int_index else self.frame.index
+        return pd.DataFrame(columns, index=index, columns=self.frame.columns, dtype=str)
+
+    def to_csv(self) -> str:
+        """Return the CSV text as published under docs/csv."""
+        return self.to_strings().to_csv(lineterminator='\n')
+
+
+def read_typed_matches_csv(matches_file: str | PathLike) -> TypedMatchTable:
+    """Read a match CSV into a TypedMatchTable.
+
+    Args:
+        matches_file: Match CSV path
+
+    Returns:
+        TypedMatchTable: Typed data; ``.to_csv()`` returns the file contents unchanged
+
+    Raises:
+        FileNotFoundError: If the specified file does not exist
+    """
+    df = pd.read_csv(matches_file, index_col=0, dtype=str, keep_default_na=False)
+    return TypedMatchTable.from_strings(df)
@@ -0,0 +1,218 @@
+"""Run the scheduled CSV readers in one process.
+
+Replaces the sequence of ``uv run python src/read_*.py`` calls in
+scripts/call_update_csv.sh: the interpreter, pandas / lxml imports, configs
+and season_map.yaml are loaded once, HTTP connections are pooled across
+readers, and independent readers run side by side.
+
+Plans (``--mode``):
+
+- ``daily``: every CSV (jleague -f, JFA competitions, WE League), with the
+  openfootball score patch after the JFA run
+- ``ongame``: J-League and the WC2026 JFA feed, then the openfootball patch
+- ``auto`` (default): ``daily`` in the 01:00 JST run, ``ongame`` otherwise
+
+Both plans rewrite the J-League standings timelines (standings_timeline.py)
+and clinch flags (clinch_flags.py) after the J-League run.
+
+A task runs after the tasks listed in its ``after`` have finished, whether
+they succeeded or not (as the shell script did).  Each task runs in its own
+context, so ``mu.config`` is the config of the reader that is running.
+Exits with 1 if any task failed, after printing a timing summary.
+
+Usage::
+
+    uv run python src/update_orchestrator.py [--mode daily|ongame|auto] [--record|--replay]
+"""
+import argparse
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+import contextvars
+from datetime import datetime
+import importlib
+import logging
+import os
+from pathlib import Path
+import sys
+import time
+from types import ModuleType
+from types import SimpleNamespace
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
+
+from http_client import add_archive_args
+from http_client import http
+
+logger = logging.getLogger(__name__)
+
+DAILY_HOUR = 1  # JST hour of the daily full update
+
+
+class Task(NamedTuple):
+    """One reader run: ``module.main(argv)`` after the tasks named in ``after``."""
+    name: str
+    module: str
+    argv: tuple[str, ...] = ()
+    after: tuple[str, ...] = ()
+
+
+class TaskResult(NamedTuple):
+    """Outcome of one Task."""
+    name: str
+    ok: bool
+    seconds: float
+    error: str = ''
+
+
+PLANS: dict[str, list[Task]] = {
+    'daily': [
+        Task('jleague', 'read_jleague_matches', ('-f',)),
+        Task('jfamatch', 'read_jfamatch',
+             ('PrincePremierE', 'PrincePremierW', 'PrinceKanto', 'WC2026', 'WC2026KO')),
+        # JFAでスケジュール生成後、openfootballで日次スコアを上書き (JFA反映遅延の補完)
+        Task('openfootball', 'read_openfootball_wc', after=('jfamatch',)),
+        Task('we_league', 'read_we_league'),
+        Task('timeline', 'standings_timeline', after=('jleague',)),
+        Task('clinch', 'clinch_flags', after=('jleague',)),
+    ],
+    'ongame': [
+        Task('jleague', 'read_jleague_matches'),
+        Task('jfamatch', 'read_jfamatch', ('WC2026', 'WC2026KO')),
+        Task('openfootball', 'read_openfootball_wc', after=('jfamatch',)),
+        Task('timeline', 'standings_timeline', after=('jleague',)),
+        Task('clinch', 'clinch_flags', after=('jleague',)),
+    ],
+}
+
+
+def resolve_mode(mode: str, now: datetime = None) -> str:
+    """Return 'daily' or 'ongame' for mode ('auto' picks by the JST hour of now)."""
+    if mode != 'auto':
+        return mode
+    now = now or datetime.now(ZoneInfo('Asia/Tokyo'))
+    return 'daily' if now.astimezone(ZoneInfo('Asia/Tokyo')).hour == DAILY_HOUR else 'ongame'
+
+
+def pin_http_settings(modules: list[ModuleType]) -> None:
+    """Configure the shared HTTP client once for all readers and pin it.
+
+    Uses the largest timeout / retries / per-host budget and the first cache
+    directory among the reader configs loaded at import time.
+    """
+    configs = [m.config for m in modules if getattr(m, 'config', None) is not None]
+    settings = SimpleNamespace(
+        http_timeout=max((getattr(c, 'http_timeout', 0) or 0 for c in configs), default=0) or None,
+        http_retries=max((getattr(c, 'http_retries', http.retries) for c in configs), default=http.retries),
+        max_requests_per_host=max((getattr(c, 'max_requests_per_host', http.max_requests_per_host)
+                                   for c in configs), default=http.max_requests_per_host),
+        http_cache_dir=next((c.http_cache_dir for c in configs
+                             if getattr(c, 'http_cache_dir', None)), None),
+    )
+    http.pinned = False
+    http.configure(settings)
+    http.pinned = True
+
+
+def _run_task(task: Task, module: ModuleType) -> TaskResult:
+    """Run one reader's main() and catch its failure."""
+    logger.info("Start %s: %s %s", task.name, task.module, ' '.join(task.argv))
+    start = time.perf_counter()
+    try:
+        module.main(list(task.argv))
+    except (Exception, SystemExit) as e:  # pylint: disable=broad-exception-caught
+        logger.exception("%s failed", task.name)
+        return TaskResult(task.name, False, time.perf_counter() - start, f'{type(e).__name__}: {e}')
+    return TaskResult(task.name, True, time.perf_counter() - start)
+
+
+def run_tasks(tasks: list[Task], modules: dict[str, ModuleType],
+              max_workers: int = None) -> list[TaskResult]:
+    """Run tasks concurrently, each after the tasks in its ``after``.
+
+    Args:
+        tasks (list[Task]): Tasks to run (``after`` must name earlier tasks)
+        modules (dict[str, ModuleType]): Imported reader modules by module name
+        max_workers (int): Thread count [default: number of tasks]
+
+    Returns:
+        list[TaskResult]: Results in the order of tasks
+    """
+    names = {task.name for task in tasks}
+    for task in tasks:
+        unknown = set(task.after) - names
+        if unknown:
+            raise ValueError(f"Task {task.name} waits for unknown tasks {sorted(unknown)}")
+
+    results: dict[str, TaskResult] = {}
+    pending = list(tasks)
+    running: dict[Future, str] = {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(tasks) or 1) as executor:
+        while pending or running:
+            for task in [t for t in pending if all(dep in results for dep in t.after)]:
+                pending.remove(task)
+                # A fresh context per task: mu.use_config / init_config stay local to it
+                context = contextvars.Context()
+                running[executor.submit(context.run, _run_task, task, modules[task.module])] = task.name
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+    return [results[task.name] for task in tasks]
+
+
+def format_summary(results: list[TaskResult], total: float) -> str:
+    """Return the per-task timing table printed at the end of a run."""
+    lines = [f'{"task":<14} {"status":<7} {"seconds":>8}']
+    for result in results:
+        status = 'ok' if result.ok else 'FAILED'
+        line = f'{result.name:<14} {status:<7} {result.seconds:>8.1f}'
+        if result.error:
+            line += f'  {result.error}'
+        lines.append(line)
+    lines.append(f'{"total":<14} {"":<7} {total:>8.1f}')
+    return '\n'.join(lines)
+
+
+def make_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Argument parser"""
+    parser = argparse.ArgumentParser(
+        description='update_orchestrator.py\n'
+                    'Run the scheduled CSV readers in one process')
+    parser.add_argument('-m', '--mode', choices=['auto', *PLANS], default='auto',
+                        help='Update plan [default: auto (daily at 01:00 JST, otherwise ongame)]')
+    parser.add_argument('--schedule', default='',
+                        help='Cron expression of the triggering schedule (logged only)')
+    parser.add_argument('-d', '--debug', action='store_true',
+                        help='Debug mode (print debug information)')
+    add_archive_args(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the selected plan and return the exit status."""
+    args = make_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+        datefmt='%H:%M:%S',
+    )
+    mode = resolve_mode(args.mode)
+    logger.info("Called by schedule %r: %s update", args.schedule, mode)
+    tasks = PLANS[mode]
+
+    start = time.perf_counter()
+    modules = {name: importlib.import_module(name) for name in dict.fromkeys(t.module for t in tasks)}
+    http.apply_archive_args(args)
+    pin_http_settings(list(modules.values()))
+    logger.info("Imported %d readers in %.1f s", len(modules), time.perf_counter() - start)
+
+    results = run_tasks(tasks, modules)
+    print(format_summary(results, time.perf_counter() - start))
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == '__main__':
+    # Reader configs use paths relative to src/
+    os.chdir(Path(__file__).parent)
+    sys.exit(main())
@@ -462,7 +462,8 @@ class TestUpdateSubSeasonMatches(unittest.TestCase):
 
         with patch('read_jleague_matches.Path') as mock_path_cls, \
              patch.object(mu, 'read_allmatches_csv', return_value=existing_east), \
-             patch.object(mu, 'matches_differ', return_value=True):
+             patch.object(mu, 'diff_matches') as mock_diff:
+            mock_diff.return_value.summary.return_value = 'changed'
             mock_path_cls.return_value.exists.return_value = True
 
             update_sub_season_matches('J1', self._make_sub_seasons(), need_update={3, 4})
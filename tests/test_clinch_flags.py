@@ -0,0 +1,150 @@
+import itertools
+import random
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from clinch_flags import CLINCHED
+from clinch_flags import ELIMINATED
+from clinch_flags import OPEN
+from clinch_flags import SeasonCounts
+from clinch_flags import _max_flow
+from clinch_flags import build_clinch_flags
+from clinch_flags import rank_flags
+from match_utils import mu
+from standings_timeline import POINT_MAPS
+from standings_timeline import POINT_SYSTEM_RESULTS
+from standings_timeline import RESULT_COUNTERPART
+from standings_timeline import build_timeline
+
+CSV_DIR = Path(__file__).resolve().parent.parent / 'docs' / 'csv'
+
+
+def _remaining(team_count: int, pairs: list[tuple[int, int]]) -> np.ndarray:
+    remaining = np.zeros((team_count, team_count), dtype=np.int64)
+    for i, j in pairs:
+        remaining[i, j] += 1
+        remaining[j, i] += 1
+    return remaining
+
+
+def test_shared_fixtures_settle_what_max_points_cannot():
+    # B and C (12 points) meet once: whatever happens one of them passes A's max of 12
+    points = np.array([9, 12, 12, 0])
+    flags = rank_flags(points, _remaining(4, [(0, 3), (1, 2)]), 1)
+    assert flags[0] == ELIMINATED
+    # B and C (11 points) cannot both reach A's 13: their match hands out 3 points at most
+    points = np.array([13, 11, 11, 0])
+    flags = rank_flags(points, _remaining(4, [(1, 2)]), 2)
+    assert flags.tolist() == [CLINCHED, OPEN, OPEN, ELIMINATED]
+
+
+def _reference_flow(pairs: dict[tuple[int, int], tuple[int, int]], capacity: list[int]) -> int:
+    """Edmonds-Karp on a dense capacity matrix: source, pairs, teams, sink."""
+    nodes = len(pairs)
+    size = nodes + len(capacity) + 2
+    source, sink = size - 2, size - 1
+    residual = np.zeros((size, size), dtype=np.int64)
+    for node, ((i, j), (points, side)) in enumerate(pairs.items()):
+        residual[source, node] = points
+        residual[node, nodes + i] = residual[node, nodes + j] = side
+    for team, limit in enumerate(capacity):
+        residual[nodes + team, sink] = limit
+    flow = 0
+    while True:
+        parent = [-1] * size
+        parent[source] = source
+        queue = [source]
+        for u in queue:
+            for v in np.flatnonzero(residual[u] > 0):
+                if parent[v] < 0:
+                    parent[v] = u
+                    queue.append(v)
+        if parent[sink] < 0:
+            return flow
+        path = [sink]
+        while path[-1] != source:
+            path.append(parent[path[-1]])
+        pushed = min(residual[u, v] for v, u in zip(path, path[1:]))
+        for v, u in zip(path, path[1:]):
+            residual[u, v] -= pushed
+            residual[v, u] += pushed
+        flow += pushed
+
+
+def test_max_flow_matches_a_plain_max_flow():
+    rng = random.Random(0)
+    for _ in range(2000):
+        team_count = rng.randint(2, 6)
+        pairs = {}
+        for _ in range(rng.randint(0, 8)):
+            i, j = sorted(rng.sample(range(team_count), 2))
+            side = rng.randint(1, 6)
+            pairs[(i, j)] = (rng.randint(1, 2 * side), side)
+        capacity = [rng.randint(0, 10) for _ in range(team_count)]
+        assert _max_flow(pairs, capacity) == _reference_flow(pairs, capacity), (pairs, capacity)
+
+
+def _assert_flags_hold(point_system: str, points: np.ndarray, pairs: list[tuple[int, int]]) -> None:
+    """Check every flag of every rank against all completions of the remaining pairs."""
+    point_map = POINT_MAPS[point_system]
+    results = np.array(sorted({(point_map[a], point_map[b]) for result in POINT_SYSTEM_RESULTS[point_system]
+                               for a, b in ((result, RESULT_COUNTERPART[result]),
+                                            (RESULT_COUNTERPART[result], result))}))
+    team_count = len(points)
+    combos = np.array(list(itertools.product(range(len(results)), repeat=len(pairs))), dtype=np.int64)
+    finals = np.tile(points, (len(combos), 1))
+    for column, (i, j) in enumerate(pairs):
+        finals[:, i] += results[combos[:, column], 0]
+        finals[:, j] += results[combos[:, column], 1]
+    for rank in range(1, team_count):
+        flags = rank_flags(points, _remaining(team_count, pairs), rank, point_system)
+        for team in range(team_count):
+            others = np.delete(finals, team, axis=1)
+            own = finals[:, [team]]
+            if flags[team] == CLINCHED:
+                assert ((others >= own).sum(axis=1) < rank).all(), (point_system, points, pairs, rank, team)
+            if flags[team] == ELIMINATED:
+                assert ((others > own).sum(axis=1) >= rank).all(), (point_system, points, pairs, rank, team)
+
+
+@pytest.mark.parametrize('points, pairs', [
+    ([6, 5, 4, 0], [(1, 3), (1, 3), (3, 0), (2, 0), (1, 0), (1, 0), (3, 2)]),
+    ([3, 7, 6, 5, 11, 0], [(5, 2), (5, 0), (3, 2), (3, 5)]),
+])
+def test_flags_hold_where_greedy_routing_failed(points, pairs):
+    for point_system in POINT_MAPS:
+        _assert_flags_hold(point_system, np.array(points), pairs)
+
+
+def test_flags_hold_in_every_completion():
+    rng = random.Random(0)
+    for _ in range(150):
+        point_system = rng.choice(list(POINT_MAPS))
+        team_count = rng.randint(3, 6)
+        points = np.array([rng.randint(0, 12) for _ in range(team_count)])
+        pairs = [tuple(rng.sample(range(team_count), 2)) for _ in range(rng.randint(0, 7))]
+        _assert_flags_hold(point_system, points, pairs)
+
+
+def test_published_season_is_settled_in_order():
+    path = CSV_DIR / '2025_allmatch_result-J1.csv'
+    if not path.exists():
+        pytest.skip('2025_allmatch_result-J1.csv not available')
+    with mu.use_config(SimpleNamespace(standard_date_format='%Y/%m/%d')):
+        matches = mu.read_allmatches_csv(str(path))
+    flags = build_clinch_flags(matches, counts=SeasonCounts(promotion_count=3, relegation_count=3))
+    group = flags['groups']['DefaultGroup']
+    assert group['teams'] == build_timeline(matches)['groups']['DefaultGroup']['teams']
+    for target in ('title', 'promotion', 'safety'):
+        values = np.array(group[target])
+        # Set flags stay set
+        assert (np.abs(np.diff(values, axis=0))[values[:-1] != OPEN] == 0).all()
+    final = {target: dict(zip(group['teams'], group[target][-1])) for target in ('title', 'promotion', 'safety')}
+    assert [team for team, flag in final['title'].items() if flag == CLINCHED] == ['鹿島']
+    assert OPEN not in final['title'].values()
+    # 広島 and 京都 finished level on points in 3rd place
+    assert {team for team, flag in final['promotion'].items() if flag == OPEN} == {'広島', '京都'}
+    assert {team for team, flag in final['safety'].items() if flag == ELIMINATED} == {'新潟', '横浜FC', '湘南'}
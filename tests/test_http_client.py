@@ -0,0 +1,231 @@
+"""Tests for the shared pooled HTTP client."""
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from http_client import HttpClient
+from http_client import ReplayMissError
+from http_client import ResponseArchive
+from http_client import ValidatorCache
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve a gzip body and record connections / concurrency on the server."""
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):  # noqa: N802 (BaseHTTPRequestHandler API)
+        if self.path.startswith('/etag'):
+            self._send_etag()
+            return
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        time.sleep(self.server.delay)
+        body = gzip.compress(f'path={self.path} ae={self.headers.get("Accept-Encoding")}'.encode())
+        self.send_response(200)
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.in_flight -= 1
+
+    def _send_etag(self):
+        etag = f'"v{self.server.version}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = f'body v{self.server.version}'.encode()
+        self.send_response(200)
+        if self.server.send_etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    srv.connections = 0
+    srv.in_flight = 0
+    srv.max_in_flight = 0
+    srv.delay = 0.0
+    srv.version = 1
+    srv.send_etag = True
+    srv.lock = threading.Lock()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _url(srv, path='/'):
+    return f'http://127.0.0.1:{srv.server_address[1]}{path}'
+
+
+def test_connection_is_reused_across_requests(server):
+    client = HttpClient()
+    for i in range(5):
+        resp = client.get(_url(server, f'/{i}'))
+        assert resp.status_code == 200
+    assert server.connections == 1
+
+
+def test_gzip_is_requested_and_decoded(server):
+    resp = HttpClient().get(_url(server, '/x'))
+    assert resp.text.startswith('path=/x')
+    assert 'gzip' in resp.text
+
+
+def test_per_host_budget_limits_concurrency(server):
+    server.delay = 0.05
+    client = HttpClient(max_requests_per_host=2)
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        list(executor.map(lambda i: client.get(_url(server, f'/{i}')), range(6)))
+    assert server.max_in_flight <= 2
+
+
+def test_configure_reads_config_values():
+    client = HttpClient()
+    session = client.session
+    client.configure(SimpleNamespace(http_timeout=15))
+    assert client.timeout == 15
+    assert client.session is session  # pool kept when only the timeout changes
+
+    client.configure(SimpleNamespace(http_timeout=15, http_retries=5, max_requests_per_host=8))
+    assert client.retries == 5
+    assert client.max_requests_per_host == 8
+    assert client.session is not session
+
+
+def test_conditional_get_returns_cached_body_on_304(server, tmp_path):
+    client = HttpClient()
+    client.validator_cache = ValidatorCache(tmp_path)
+    url = _url(server, '/etag')
+
+    first = client.get_conditional(url)
+    assert (first.text, first.from_cache) == ('body v1', False)
+    client.save_parsed(url, [{'section_no': 1}])
+
+    second = client.get_conditional(url)
+    assert (second.status_code, second.text, second.from_cache) == (200, 'body v1', True)
+    assert client.load_parsed(url) == [{'section_no': 1}]
+
+
+def test_conditional_get_refreshes_changed_body(server, tmp_path):
+    client = HttpClient()
+    client.validator_cache = ValidatorCache(tmp_path)
+    url = _url(server, '/etag')
+    client.get_conditional(url)
+    client.save_parsed(url, ['old'])
+
+    server.version = 2
+    resp = client.get_conditional(url)
+    assert (resp.text, resp.from_cache) == ('body v2', False)
+    assert client.load_parsed(url) is None
+
+
+def test_parsed_records_of_another_parser_are_a_miss(server, tmp_path):
+    client = HttpClient()
+    client.validator_cache = ValidatorCache(tmp_path)
+    url = _url(server, '/etag')
+    client.get_conditional(url)
+    client.save_parsed(url, ['records'], 'parser-1')
+
+    assert client.get_conditional(url).from_cache
+    assert client.load_parsed(url, 'parser-1') == ['records']
+    assert client.load_parsed(url, 'parser-2') is None
+
+
+def test_conditional_get_refetches_when_cached_body_is_gone(server, tmp_path, monkeypatch):
+    client = HttpClient()
+    client.validator_cache = ValidatorCache(tmp_path)
+    url = _url(server, '/etag')
+    client.get_conditional(url)
+
+    # The validators are sent but the body disappears before the 304 is answered
+    monkeypatch.setattr(client.validator_cache, 'load_body', lambda url: None)
+    resp = client.get_conditional(url)
+    assert (resp.status_code, resp.text, resp.from_cache) == (200, 'body v1', False)
+
+
+def test_interrupted_store_drops_old_validators(server, tmp_path, monkeypatch):
+    client = HttpClient()
+    client.validator_cache = ValidatorCache(tmp_path)
+    url = _url(server, '/etag')
+    client.get_conditional(url)
+    client.save_parsed(url, ['old'])
+
+    server.version = 2
+    monkeypatch.setattr(client.validator_cache, '_write_meta', _raise_os_error)
+    with pytest.raises(OSError):
+        client.get_conditional(url)
+    assert client.validator_cache.validator_headers(url) == {}
+    assert client.load_parsed(url) is None
+
+
+def _raise_os_error(*args):
+    raise OSError('disk full')
+
+
+def test_response_without_validators_drops_the_cached_entry(server, tmp_path):
+    client = HttpClient()
+    client.validator_cache = ValidatorCache(tmp_path)
+    url = _url(server, '/etag')
+    client.get_conditional(url)
+    client.save_parsed(url, ['old'])
+
+    server.version, server.send_etag = 2, False
+    assert client.get_conditional(url).text == 'body v2'
+    client.save_parsed(url, ['new'])
+    assert client.validator_cache.validator_headers(url) == {}
+    assert client.load_parsed(url) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_conditional_get_without_cache_is_plain_get(server):
+    resp = HttpClient().get_conditional(_url(server, '/etag'))
+    assert (resp.text, resp.from_cache) == ('body v1', False)
+
+
+def test_recorded_responses_replay_without_network(server, tmp_path):
+    recorder = HttpClient()
+    recorder.archive = ResponseArchive(tmp_path, 'record')
+    urls = [_url(server, '/etag'), _url(server, '/a'), _url(server, '/etag?same=1')]
+    recorded = [recorder.get(url) for url in urls]
+    server.shutdown()
+
+    replayer = HttpClient()
+    replayer.archive = ResponseArchive(tmp_path, 'replay')
+    for url, original in zip(urls, recorded):
+        resp = replayer.get(url)
+        assert (resp.status_code, resp.text) == (original.status_code, original.text)
+        resp.raise_for_status()
+    # '/etag' and '/etag?same=1' return the same body -> stored once
+    assert len(list((tmp_path / 'objects').rglob('*.gz'))) == 2
+
+
+def test_replay_miss_raises(tmp_path):
+    client = HttpClient()
+    client.archive = ResponseArchive(tmp_path, 'replay')
+    with pytest.raises(ReplayMissError):
+        client.get('http://127.0.0.1:9/never-recorded')
@@ -0,0 +1,196 @@
+"""Tests for the live-score poller and the J-League live feed."""
+from datetime import datetime
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import json
+import threading
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import pytest
+import requests
+
+from http_client import http
+from live_poller import LiveFeed
+from live_poller import LivePoller
+from live_poller import live_sections
+from live_poller import next_kickoff
+from match_utils import mu
+import read_jleague_matches
+from read_jleague_matches import JLeagueLiveFeed
+from read_jleague_matches import clear_fetch_registry
+
+JST = ZoneInfo('Asia/Tokyo')
+
+
+def _frame(**overrides):
+    data = {
+        'section_no': [1, 1, 2],
+        'match_date': ['2026/03/01', '2026/03/01', '2026/03/08'],
+        'start_time': ['14:00', '19:00', '14:00'],
+        'status': ['', '', ''],
+    }
+    data.update(overrides)
+    return pd.DataFrame(data)
+
+
+def test_live_sections_skip_finished_matches():
+    now = datetime(2026, 3, 1, 15, 0, tzinfo=JST)
+    assert live_sections(_frame(), now, JST) == {1}
+    assert live_sections(_frame(status=['試合終了', '', '']), now, JST) == set()
+
+
+def test_live_sections_use_venue_timezone():
+    frame = _frame(timezone=['America/New_York', '', ''])
+    # 14:00 in New York is 04:00 next day in Tokyo
+    assert live_sections(frame, datetime(2026, 3, 1, 15, 0, tzinfo=JST), JST) == set()
+    assert live_sections(frame, datetime(2026, 3, 2, 4, 30, tzinfo=JST), JST) == {1}
+
+
+def test_next_kickoff():
+    frame = _frame()
+    assert next_kickoff(frame, datetime(2026, 3, 1, 15, 0, tzinfo=JST), JST) == \
+        pd.Timestamp('2026-03-01 19:00', tz=JST)
+    assert next_kickoff(frame, datetime(2026, 3, 9, tzinfo=JST), JST) is None
+
+
+class _FakeFeed(LiveFeed):
+    name = 'fake'
+
+    def __init__(self, live_until=None, kickoff=None, error=None):
+        self.live_until = live_until
+        self.kickoff = kickoff
+        self.error = error
+        self.polls = 0
+
+    def is_live(self, now):
+        return self.live_until is not None and now < self.live_until
+
+    def next_kickoff(self, now):
+        return self.kickoff
+
+    def poll(self, now):
+        self.polls += 1
+        if self.error:
+            raise self.error
+        return True
+
+
+def test_poller_backs_off_when_idle_and_wakes_for_kickoff():
+    now = datetime(2026, 3, 1, 12, 0, tzinfo=JST)
+    feed = _FakeFeed(kickoff=now + timedelta(seconds=1000))
+    poller = LivePoller([feed], live_interval=30, idle_interval=100, max_idle_interval=800,
+                        clock=lambda: now)
+    assert [poller.poll_once() for _ in range(5)] == [100, 200, 400, 800, 800]
+    feed.kickoff = now + timedelta(seconds=250)
+    assert poller.poll_once() == 250
+    assert feed.polls == 0
+
+
+def test_poller_polls_live_feeds_at_short_interval():
+    now = datetime(2026, 3, 1, 14, 30, tzinfo=JST)
+    live, idle = _FakeFeed(live_until=now + timedelta(hours=1)), _FakeFeed()
+    poller = LivePoller([live, idle], live_interval=30, idle_interval=100, clock=lambda: now)
+    poller._idle_delay = 800
+    assert poller.poll_once() == 30
+    assert (live.polls, idle.polls) == (1, 0)
+    assert poller._idle_delay == 100  # back-off restarts after live period
+
+
+@pytest.mark.parametrize('error', [requests.ConnectionError('down'), KeyError('matchSchedule'),
+                                   json.JSONDecodeError('truncated', '{"a": ', 6)])
+def test_poller_survives_feed_errors(error):
+    now = datetime(2026, 3, 1, 14, 30, tzinfo=JST)
+    feed = _FakeFeed(live_until=now + timedelta(hours=1), error=error)
+    sleeps = []
+    LivePoller([feed], live_interval=30, clock=lambda: now, sleep=sleeps.append).run(max_cycles=3)
+    assert feed.polls == 3
+    assert sleeps == [30, 30]
+
+
+SECTION_PAGE = """<html><body>
+<section class="matchlistWrap">
+  <div class="timeStamp"><h4>2026年3月1日(日)</h4></div>
+  <div class="leagAccTit"><h5>明治安田Ｊ１リーグ　第1節</h5></div>
+  <table><tr>
+    <td class="stadium">14:00<br><a href="/">国立</a></td>
+    <td class="clubName leftside">Home</td>
+    <td class="point leftside">{home}</td>
+    <td class="status">{status}</td>
+    <td class="point rightside">0</td>
+    <td class="clubName rightside">Away</td>
+  </tr></table>
+</section></body></html>"""
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802 (BaseHTTPRequestHandler API)
+        self.server.requests.append(self.path)
+        body = SECTION_PAGE.format(**self.server.page).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def section_server():
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), _PageHandler)
+    srv.requests = []
+    srv.page = {'home': '1', 'status': '前半'}
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_jleague_feed_polls_live_section_against_local_server(section_server, tmp_path):
+    csv_path = tmp_path / 'j1.csv'
+    pd.DataFrame([{
+        'match_date': '2026/03/01', 'section_no': 1, 'match_index_in_section': 1,
+        'start_time': '14:00', 'stadium': '国立', 'home_team': 'Home', 'home_goal': '',
+        'away_goal': '', 'away_team': 'Away', 'status': 'ＶＳ', 'home_pk_score': '',
+        'away_pk_score': '',
+    }, {
+        'match_date': '2026/03/08', 'section_no': 2, 'match_index_in_section': 1,
+        'start_time': '14:00', 'stadium': '国立', 'home_team': 'Away', 'home_goal': '',
+        'away_goal': '', 'away_team': 'Home', 'status': 'ＶＳ', 'home_pk_score': '',
+        'away_pk_score': '',
+    }]).to_csv(csv_path)
+    port = section_server.server_address[1]
+    now = datetime(2026, 3, 1, 14, 30, tzinfo=JST)
+
+    with patch.object(mu, 'get_sub_seasons', return_value=[]), \
+         patch.object(mu, 'get_csv_path', return_value=str(csv_path)), \
+         patch.object(mu, 'update_timestamp'), \
+         patch.object(http, 'validator_cache', None), \
+         patch.object(read_jleague_matches, '_section_url',
+                      lambda comp, sec, cat=None: f'http://127.0.0.1:{port}/{comp.lower()}/{sec}/'):
+        clear_fetch_registry()
+        feed = JLeagueLiveFeed('J1')
+        poller = LivePoller([feed], live_interval=30, clock=lambda: now,
+                            on_cycle=clear_fetch_registry)
+
+        assert feed.is_live(now)
+        assert poller.poll_once() == 30
+        assert section_server.requests == ['/j1/1/']  # only the live section
+        assert mu.read_allmatches_csv(str(csv_path)).iloc[0]['home_goal'] == '1'
+
+        mtime = csv_path.stat().st_mtime_ns
+        assert feed.poll(now) is False  # unchanged page: CSV not rewritten
+        assert csv_path.stat().st_mtime_ns == mtime
+
+        section_server.page = {'home': '2', 'status': '試合終了'}
+        clear_fetch_registry()
+        assert feed.poll(now) is True
+        saved = mu.read_allmatches_csv(str(csv_path))
+        assert (saved.iloc[0]['home_goal'], saved.iloc[0]['status']) == ('2', '試合終了')
+        assert not feed.is_live(now)  # finished: nothing left to poll
+        assert feed.next_kickoff(now) == pd.Timestamp('2026-03-08 14:00', tz=JST)
+    clear_fetch_registry()
@@ -1,9 +1,22 @@
+from datetime import timedelta
 import logging
+import os
+from pathlib import Path
+from types import SimpleNamespace
 
 import pandas as pd
 import pytest
-
+import yaml
+
+from match_utils import YAML_LOADER
+from match_utils import MatchArchive
+from match_utils import MatchUtils
+from match_utils import mu
+from match_utils import normalize_nullable_int
+from match_utils import serialize_match_csv
+from match_utils import upsert_matches
 from match_utils import assign_bracket_section_no, normalize_round_label
+from match_utils import kickoff_times, sections_live_between
 
 
 def test_normalize_round_label_removes_leg_suffixes():
@@ -173,3 +186,358 @@ def test_season_entry_rejects_non_list_bracket_blocks():
 def test_season_entry_rejects_block_without_label():
     with pytest.raises(TypeError, match="dict with a str 'label'"):
         _bracket_entry({'bracket_blocks': [{'bracket_order': ['A', 'B']}]})
+
+
+def _kickoff_frame():
+    return pd.DataFrame({
+        'section_no': [1, 1, 2, 3, 4],
+        'match_date': ['2026/03/01', '2026/03/01', '2026/03/08', '2026/03/08', None],
+        'start_time': ['14:00', '19:03', '未定', '9:30', '14:00'],
+    })
+
+
+def test_kickoff_times_treats_non_hhmm_as_midnight():
+    kickoff = kickoff_times(_kickoff_frame(), 'Asia/Tokyo')
+    assert kickoff[1] == pd.Timestamp('2026-03-01 19:03', tz='Asia/Tokyo')
+    assert kickoff[2] == pd.Timestamp('2026-03-08 00:00', tz='Asia/Tokyo')
+    assert kickoff[3] == pd.Timestamp('2026-03-08 09:30', tz='Asia/Tokyo')
+    assert pd.isna(kickoff[4])
+
+
+@pytest.mark.parametrize('start, end, expected', [
+    ('2026-03-01 15:30', '2026-03-01 16:00', {1}),      # first match still in progress
+    ('2026-03-01 16:01', '2026-03-01 19:00', set()),    # between matches
+    ('2026-03-01 20:00', '2026-03-08 10:00', {1, 2, 3}),
+    ('2026-03-09 00:00', '2026-03-10 00:00', set()),
+])
+def test_sections_live_between(start, end, expected):
+    tz = 'Asia/Tokyo'
+    assert sections_live_between(_kickoff_frame(), pd.Timestamp(start, tz=tz),
+                                 pd.Timestamp(end, tz=tz), tz) == expected
+
+
+def test_sections_live_between_custom_duration():
+    tz = 'Asia/Tokyo'
+    start = pd.Timestamp('2026-03-01 16:30', tz=tz)
+    assert sections_live_between(_kickoff_frame(), start, start, tz) == set()
+    assert sections_live_between(_kickoff_frame(), start, start, tz, duration=timedelta(hours=3)) == {1}
+
+
+def test_use_config_is_local_to_the_block():
+    utils = MatchUtils()
+    default = SimpleNamespace(name='default')
+    utils.config = default
+    with utils.use_config(SimpleNamespace(name='task')):
+        assert utils.config.name == 'task'
+    assert utils.config is default
+
+
+def test_timestamps_are_written_on_flush(tmp_path):
+    utils = MatchUtils()
+    timestamp_file = tmp_path / 'csv_timestamp.csv'
+    config = SimpleNamespace(timezone='Asia/Tokyo', get_path=lambda key: timestamp_file,
+                             content_hash_path=tmp_path / 'csv_content_hash.csv')
+    with utils.use_config(config):
+        utils.update_timestamp('a.csv', content_hash='abc')
+        first = utils.get_timestamp_from_csv('a.csv')
+        assert not timestamp_file.exists()
+        utils.update_timestamp('b.csv')
+        assert utils.get_timestamp_from_csv('a.csv') == first
+        assert utils.get_timestamp_from_csv('b.csv') >= first
+        utils.flush_timestamps()
+    written = pd.read_csv(timestamp_file, index_col=0, parse_dates=[1])
+    assert written.index.tolist() == ['a.csv', 'b.csv']
+    assert written.columns.tolist() == ['date']
+    assert written.loc['a.csv', 'date'] == first
+    hashes = pd.read_csv(tmp_path / 'csv_content_hash.csv', index_col=0)
+    assert hashes.to_dict()['sha256'] == {'a.csv': 'abc'}
+
+
+CSV_DIR = Path(__file__).resolve().parent.parent / 'docs' / 'csv'
+
+
+def _date_utils():
+    utils = MatchUtils()
+    utils.config = SimpleNamespace(standard_date_format='%Y/%m/%d')
+    return utils
+
+
+def test_normalize_dates_keeps_unparseable_values():
+    utils = _date_utils()
+    values = pd.Series(['2026/03/01', '2026-3-7', '未定', None, '2026/3/8 19:00', '中止'],
+                       index=['0', '1', '2', '2', '4', '5'])
+    result = utils.normalize_dates(values)
+    assert result.tolist()[:3] == ['2026/03/01', '2026/03/07', '未定']
+    assert pd.isna(result.iloc[3])
+    assert result.tolist()[4:] == ['2026/03/08', '中止']
+    assert result.index.tolist() == values.index.tolist()
+
+
+def test_normalize_dates_matches_per_row_path_on_all_csvs():
+    # Element-wise conversion: comparing the distinct values of every CSV is enough
+    utils = _date_utils()
+    files = [path for path in CSV_DIR.rglob('*.csv') if path.name != 'csv_timestamp.csv']
+    assert files
+    values = pd.concat([pd.read_csv(path, index_col=0, dtype=str, na_values='')['match_date']
+                        for path in files]).drop_duplicates().reset_index(drop=True)
+    expected = values.map(utils.to_datetime_aspossible)
+    pd.testing.assert_series_equal(utils.normalize_dates(values), expected)
+
+
+def _matches(**overrides):
+    df = pd.DataFrame({
+        'section_no': [1, 1, 2],
+        'home_team': ['A', 'C', 'B'],
+        'away_team': ['B', 'D', 'A'],
+        'home_goal': ['1', '0', None],
+        'away_goal': ['1', '2', ''],
+        'match_index_in_section': [1, 2, 1],
+    })
+    return df.assign(**overrides)
+
+
+def test_diff_matches_ignores_order_index_and_nan():
+    old = _matches().iloc[::-1].reset_index(drop=True)
+    old['match_index_in_section'] = 9
+    old['home_goal'] = old['home_goal'].fillna('')
+    changeset = mu.diff_matches(_matches(), old)
+    assert not changeset
+    assert changeset.summary() == 'no changes'
+    assert not mu.matches_differ(_matches(), old)
+
+
+def test_diff_matches_reports_added_removed_and_changed_rows():
+    new = _matches(home_goal=['1', '0', '3'], away_goal=['1', '2', '0'])
+    new = pd.concat([new, pd.DataFrame({'section_no': [3], 'home_team': ['D'], 'away_team': ['A']})])
+    old = _matches().iloc[[0, 2]]
+    old = pd.concat([old, pd.DataFrame({'section_no': [3], 'home_team': ['A'], 'away_team': ['D']})])
+
+    changeset = mu.diff_matches(new, old)
+    assert changeset.key_columns == ['section_no', 'home_team', 'away_team']
+    assert changeset.added[['home_team', 'away_team']].values.tolist() == [['C', 'D'], ['D', 'A']]
+    assert changeset.removed[['home_team', 'away_team']].values.tolist() == [['A', 'D']]
+    assert changeset.changed == {('2', 'B', 'A', 0): {'away_goal': ('', '0'), 'home_goal': ('', '3')}}
+    assert '2 added, 1 removed, 1 changed' in changeset.summary()
+
+
+def test_diff_matches_detects_column_changes():
+    changeset = mu.diff_matches(_matches(status=['試合終了'] * 3), _matches())
+    assert changeset.columns_added == ['status']
+    assert mu.matches_differ(_matches(status=['試合終了'] * 3), _matches())
+
+
+def _csv_utils(tmp_path):
+    utils = MatchUtils()
+    utils.config = SimpleNamespace(timezone='Asia/Tokyo', standard_date_format='%Y/%m/%d',
+                                   get_path=lambda key: tmp_path / 'csv_timestamp.csv')
+    return utils
+
+
+def test_update_if_diff_skips_parsing_when_content_hash_matches(tmp_path, monkeypatch):
+    utils = _csv_utils(tmp_path)
+    csv_path = str(tmp_path / 'matches.csv')
+    matches = _matches(match_date=['2026/03/01', '2026/03/01', '2026/03/08'])
+    assert utils.update_if_diff(matches, csv_path)
+    assert utils.get_content_hash(csv_path) is not None
+
+    def fail(*args, **kwargs):
+        raise AssertionError('CSV must not be parsed')
+    monkeypatch.setattr(utils, 'read_allmatches_csv', fail)
+    assert not utils.update_if_diff(matches.copy(), csv_path)
+
+
+def test_update_if_diff_backfills_hash_for_unchanged_file(tmp_path):
+    utils = _csv_utils(tmp_path)
+    csv_path = str(tmp_path / 'matches.csv')
+    matches = _matches(match_date=['2026/03/01', '2026/03/01', '2026/03/08'])
+    (tmp_path / 'matches.csv').write_text(serialize_match_csv(matches), encoding='utf-8')
+
+    assert not utils.update_if_diff(matches.iloc[::-1], csv_path)  # reordered: row diff, no write
+    assert utils.get_content_hash(csv_path) is not None
+    assert not utils.update_if_diff(matches, csv_path)
+    assert utils.update_if_diff(matches.assign(home_goal=['2', '0', '1']), csv_path)
+
+
+def test_unchanged_run_leaves_the_timestamp_file_alone(tmp_path):
+    utils = _csv_utils(tmp_path)
+    utils.config.content_hash_path = tmp_path / 'local_data' / 'csv_content_hash.csv'
+    csv_path = str(tmp_path / 'matches.csv')
+    matches = _matches(match_date=['2026/03/01', '2026/03/01', '2026/03/08'])
+    (tmp_path / 'matches.csv').write_text(serialize_match_csv(matches), encoding='utf-8')
+    timestamps = 'file,date\nother.csv,2026-03-11 01:19:58.742306+09:00\n'
+    (tmp_path / 'csv_timestamp.csv').write_text(timestamps, encoding='utf-8')
+
+    assert not utils.update_if_diff(matches, csv_path)  # backfills the hash
+    utils.flush_timestamps()
+    hashes = utils.config.content_hash_path.read_bytes()
+    assert not utils.update_if_diff(matches, csv_path)
+    assert not utils.update_if_diff(matches.iloc[::-1], csv_path)
+    assert not utils._timestamp_store().dirty
+    utils.flush_timestamps()
+    assert (tmp_path / 'csv_timestamp.csv').read_text(encoding='utf-8') == timestamps
+    assert utils.config.content_hash_path.read_bytes() == hashes
+
+
+def test_update_if_diff_records_the_changed_match_dates(tmp_path):
+    utils = _csv_utils(tmp_path)
+    csv_path = str(tmp_path / 'matches.csv')
+    matches = _matches(match_date=['2026/03/01', '2026/03/01', '2026/03/08'])
+    assert utils.update_if_diff(matches, csv_path)
+    first_hash = utils.get_content_hash(csv_path)
+    assert utils.update_if_diff(matches.assign(home_goal=['1', '0', '2'], away_goal=['1', '2', '2']), csv_path)
+    assert utils.update_if_diff(matches.assign(match_date=['2026/03/01', '2026/03/01', '2026/03/15']), csv_path)
+
+    created, scored, moved = utils.take_csv_updates(csv_path)
+    assert (created.old_sha256, created.new_sha256, created.match_dates) == (None, first_hash, None)
+    assert scored.old_sha256 == first_hash and scored.match_dates == {'2026/03/08'}
+    assert moved.old_sha256 == scored.new_sha256 and moved.match_dates == {'2026/03/08', '2026/03/15'}
+    assert utils.take_csv_updates(csv_path) == []
+
+
+SECTION_KEY = ['section_no', 'match_index_in_section']
+
+
+def _season():
+    return pd.DataFrame({
+        'section_no': [1, 1, 2, 2, 4],
+        'match_index_in_section': [1, 2, 1, 2, 1],
+        'home_team': ['A', 'C', 'A', 'B', 'C'],
+        'home_goal': ['1', '0', '', '', ''],
+    })
+
+
+def test_upsert_matches_equals_concat_and_sort():
+    current = _season()
+    updates = pd.DataFrame({'section_no': [2, 2, 3], 'match_index_in_section': [1, 3, 1],
+                            'home_team': ['A', 'D', 'B'], 'home_goal': [2, '', 1]})
+    in_scope = current['section_no'].isin({2, 3})
+    result = upsert_matches(current, updates, SECTION_KEY, scope=in_scope)
+
+    expected = pd.concat([current[~in_scope], updates]).sort_values(SECTION_KEY).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result.frame.astype(str), expected.astype(str))
+    assert (result.inserted, result.updated, result.deleted) == (2, 1, 1)
+
+
+def test_upsert_matches_keeps_unchanged_rows_and_order():
+    current = _season().iloc[[2, 3, 0, 1, 4]]  # not sorted: order is kept anyway
+    updates = current[current['section_no'] == 2].assign(home_goal=['', '3'])
+    result = upsert_matches(current, updates, SECTION_KEY, scope=current['section_no'] == 2)
+    assert result.frame['home_goal'].tolist() == ['', '3', '1', '0', '']
+    assert (result.inserted, result.updated, result.deleted) == (0, 1, 0)
+
+    unchanged = upsert_matches(current, current.iloc[:2], SECTION_KEY, scope=current['section_no'] == 2)
+    assert not unchanged.changed
+    assert unchanged.frame is current
+
+
+def test_upsert_matches_by_round_and_match_number():
+    current = pd.DataFrame({'round': ['準決勝', '準決勝', '決勝'], 'match_number': ['1', '2', '3'],
+                            'home_team': ['A', 'C', '']})
+    updates = pd.DataFrame({'round': ['決勝'], 'match_number': [3], 'home_team': ['A']})
+    result = upsert_matches(current, updates, ['round', 'match_number'])
+    assert result.frame['home_team'].tolist() == ['A', 'C', 'A']
+    assert result.updated == 1
+
+
+def test_upsert_matches_rejects_duplicate_keys():
+    with pytest.raises(ValueError):
+        upsert_matches(_season(), pd.concat([_season().iloc[:1]] * 2), SECTION_KEY)
+
+
+def test_read_allmatches_csv_is_cached_until_the_file_changes(tmp_path):
+    utils = _csv_utils(tmp_path)
+    csv_path = str(tmp_path / 'matches.csv')
+    matches = _matches(match_date=['2026/03/01', '2026/03/01', '2026/03/08'])
+    utils.update_csv(matches, csv_path)
+
+    first = utils.read_allmatches_csv(csv_path)
+    first.loc[first.index[0], 'home_goal'] = '9'  # private copy
+    assert utils.read_allmatches_csv(csv_path, copy=False)['home_goal'].iloc[0] == '1'
+    assert utils.csv_cache_stats == {'hits': 1, 'misses': 1}
+
+    utils.update_csv(matches.assign(home_goal=['5', '0', '']), csv_path)
+    assert utils.read_allmatches_csv(csv_path)['home_goal'].iloc[0] == '5'
+    assert utils.csv_cache_stats['misses'] == 2
+
+
+def test_normalize_nullable_int_formats_integers_and_keeps_blanks():
+    values = pd.Series(['2.0', '', None, 3, 1.0, float('nan'), '12'], index=[5, 3, 3, 1, 0, 2, 4], name='x')
+    result = normalize_nullable_int(values)
+    assert result.tolist() == ['2', '', '', '3', '1', '', '12']
+    assert result.index.equals(values.index) and result.name == 'x'
+    with pytest.raises(ValueError):
+        normalize_nullable_int(pd.Series(['2', 'abc']))
+
+
+def _archive_utils(tmp_path):
+    (tmp_path / 'season_map.yaml').write_text(
+        'jleague:\n  competitions:\n    J1:\n      seasons:\n'
+        "        '1993': {}\n        '2025': {}\n        '2026': {}\n", encoding='utf-8')
+    header = ',match_date,section_no,match_index_in_section,home_team,home_goal,away_goal,away_team,status\n'
+    files = {
+        '1993A': ['0,1993/05/15,1,1,鹿島,5,0,名古屋,試合終了', '1,1993/05/16,1,2,浦和,0,3,鹿島,試合終了'],
+        '1993B': ['0,1993/08/01,1,1,浦和,1,1,清水,試合終了'],
+        '2025': ['0,2025/03/01,1,1,鹿島,2,"1",浦和,試合終了', '1,未定,2,1,浦和,,,鹿島,ＶＳ'],
+    }
+    for season, rows in files.items():
+        (tmp_path / f'{season}_allmatch_result-J1.csv').write_text(header + '\n'.join(rows) + '\n', encoding='utf-8')
+    utils = MatchUtils()
+    utils.config = SimpleNamespace(
+        standard_date_format='%Y/%m/%d',
+        get_path=lambda key: tmp_path / 'season_map.yaml',
+        get_format_str=lambda key, **kwargs: str(tmp_path / '{season}_allmatch_result-{competition}.csv').format(**kwargs))
+    return utils
+
+
+def test_match_archive_queries_across_seasons(tmp_path):
+    archive = MatchArchive(_archive_utils(tmp_path), index_path=tmp_path / 'index.json')
+    assert [(f.season, f.season_key) for f in archive.files()] == [('1993A', '1993'), ('1993B', '1993'),
+                                                                   ('2025', '2025')]
+    head_to_head = archive.matches('鹿島', '浦和')
+    assert head_to_head[['season', 'home_team', 'away_team']].values.tolist() == [
+        ['1993A', '浦和', '鹿島'], ['2025', '鹿島', '浦和'], ['2025', '浦和', '鹿島']]
+    assert head_to_head['section_no'].tolist() == [1, 1, 2]
+    assert archive.load_stats['misses'] == 0  # single rows are read without parsing whole files
+    assert archive.matches('浦和', date_from='1993-06-01', date_to='2025-12-31')['match_date'].tolist() == [
+        '1993/08/01', '2025/03/01']
+    assert len(archive.matches(season='1993')) == 3
+    assert archive.matches('不明').empty
+
+
+def test_match_archive_reindexes_changed_files_only(tmp_path):
+    utils = _archive_utils(tmp_path)
+    MatchArchive(utils, index_path=tmp_path / 'index.json').refresh()
+    archive = MatchArchive(utils, index_path=tmp_path / 'index.json', max_loaded=1)
+    assert archive.refresh() == 0
+    path = tmp_path / '1993B_allmatch_result-J1.csv'
+    path.write_text(path.read_text(encoding='utf-8') + '1,1993/08/07,2,1,清水,0,1,鹿島,試合終了\n',
+                    encoding='utf-8')
+    assert archive.refresh() == 1
+    assert archive.matches('清水', '鹿島')['match_date'].tolist() == ['1993/08/07']
+    archive.matches(season='1993A')
+    archive.matches(season='1993B')
+    assert list(archive._loaded) == [str(path)]
+
+
+def test_season_map_is_parsed_once_until_the_file_changes(tmp_path):
+    season_map = tmp_path / 'season_map.yaml'
+    season_map.write_text("jleague:\n  competitions:\n    J1:\n      seasons:\n"
+                          "        '2025': {team_count: 20, promotion_count: 3, relegation_count: 3}\n",
+                          encoding='utf-8')
+    utils = MatchUtils()
+    utils.config = SimpleNamespace(get_path=lambda key: season_map)
+    entries = utils.load_competition_seasons('J1')
+    assert entries['2025'].team_count == 20
+    assert utils.load_competition_seasons('J1') is entries
+    assert utils.load_season_map() == {'J1': entries}
+    assert utils.load_competition_seasons('J9') is None
+
+    season_map.write_text(season_map.read_text(encoding='utf-8').replace('20,', '18,'), encoding='utf-8')
+    stat = season_map.stat()
+    os.utime(season_map, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert utils.load_competition_seasons('J1')['2025'].team_count == 18
+
+
+def test_yaml_loader_matches_safe_load():
+    text = (CSV_DIR.parent / 'yaml' / 'season_map.yaml').read_text(encoding='utf-8')
+    assert yaml.load(text, Loader=YAML_LOADER) == yaml.safe_load(text)
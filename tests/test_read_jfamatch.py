@@ -1,8 +1,13 @@
 import json
 from pathlib import Path
+from types import SimpleNamespace
 
+import requests
+
+from http_client import http
 from match_utils import mu
 from read_jfamatch import (
+    JfaLiveFeed,
     _finalize_match_df,
     _parse_years,
     _resolve_schedule_url,
@@ -10,6 +15,7 @@ from read_jfamatch import (
     _venue_to_timezone,
     read_jfa_match,
     read_group,
+    read_match_json,
 )
 import read_jfamatch as read_jfamatch_module
 
@@ -107,6 +113,25 @@ def test_read_jfa_match_parses_two_digit_section_numbers(monkeypatch, tmp_path:
     assert actual['match_index_in_section'].tolist() == [1, 1]
 
 
+def test_read_match_json_retries_invalid_json_once(monkeypatch) -> None:
+    bodies = ['{"matchScheduleList": ', '{"matchScheduleList": {"matchSchedule": [1]}}']
+    monkeypatch.setattr(http, 'get_conditional', lambda _: SimpleNamespace(
+        status_code=200, text=bodies.pop(0), raise_for_status=lambda: None))
+    assert read_match_json('dummy.json') == {'matchScheduleList': {'matchSchedule': [1]}}
+
+
+def test_read_match_json_does_not_repeat_failed_requests(monkeypatch) -> None:
+    calls = []
+
+    def fail(url):
+        calls.append(url)
+        raise requests.ConnectionError('down')
+
+    monkeypatch.setattr(http, 'get_conditional', fail)
+    assert read_match_json('dummy.json') == {'matchScheduleList': {'matchSchedule': []}}
+    assert calls == ['dummy.json']
+
+
 def test_parse_years_supports_inclusive_ranges() -> None:
     assert _parse_years('1993-1995') == [1993, 1994, 1995]
     assert _parse_years('2015, 2017') == [2015, 2017]
@@ -341,3 +366,37 @@ def test_venue_to_timezone_unknown_city_returns_empty(caplog) -> None:
     # Non-string / empty inputs fall back to '' without raising.
     assert _venue_to_timezone('') == ''
     assert _venue_to_timezone(None) == ''
+
+
+def test_jfa_live_feed_polls_venue_local_matches(monkeypatch, tmp_path: Path) -> None:
+    from datetime import datetime
+    from zoneinfo import ZoneInfo
+
+    class DummyCompConf(dict):
+        def __getattr__(self, name):
+            return self[name]
+
+    csv_path = tmp_path / 'wc.csv'
+    row = {
+        'match_date': '2026/06/11', 'section_no': 1, 'match_index_in_section': 1,
+        'start_time': '13:00', 'stadium': 'メキシコシティ(メキシコ)／スタジアム',
+        'home_team': 'メキシコ', 'away_team': '南アフリカ', 'status': '',
+        'home_goal': '', 'away_goal': '', 'group': 'A', 'timezone': 'America/Mexico_City',
+    }
+    read_jfamatch_module.pd.DataFrame([row]).to_csv(csv_path)
+    comp_conf = DummyCompConf({'csv_path': str(csv_path), 'groups': ['A']})
+    monkeypatch.setitem(read_jfamatch_module.config.competitions._data, 'WCLive', comp_conf)
+    setattr(read_jfamatch_module.config.competitions, 'WCLive', comp_conf)
+    live_row = dict(row, status='前半', home_goal='1', away_goal='0')
+    monkeypatch.setattr(read_jfamatch_module, 'read_all_group',
+                        lambda conf, year=None: read_jfamatch_module.pd.DataFrame([live_row]))
+    written = []
+    monkeypatch.setattr(mu, 'update_if_diff', lambda df, path: written.append(path) or True)
+
+    feed = JfaLiveFeed('WCLive')
+    # 13:00 in Mexico City is 04:00 JST the next day
+    assert not feed.is_live(datetime(2026, 6, 11, 13, 30, tzinfo=ZoneInfo('Asia/Tokyo')))
+    now = datetime(2026, 6, 12, 4, 30, tzinfo=ZoneInfo('Asia/Tokyo'))
+    assert feed.is_live(now)
+    assert feed.poll(now) is True
+    assert written == [str(csv_path)]
@@ -2,14 +2,31 @@
 from datetime import datetime
 from datetime import timezone
 from pathlib import Path
+import random
+import tempfile
+import time
 import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
 
 from bs4 import BeautifulSoup
 import pandas as pd
 
 from match_utils import drop_duplicated_indexes
+from http_client import ResponseArchive
+from http_client import http
+from read_jleague_matches import clear_fetch_registry
+from read_jleague_matches import fetch_run
+from read_jleague_matches import get_match_dates_of_section
+from read_jleague_matches import get_sections_to_update
+from read_jleague_matches import read_match
+from read_jleague_matches import read_match_from_html
 from read_jleague_matches import read_match_from_web
+from read_jleague_matches import read_matches
 from read_jleague_matches import read_teams_from_web
+from read_jleague_matches import update_all_matches
+import read_jleague_matches
+from section_ledger import SectionLedger
 
 
 class TestDropDuplicatedIndexes(unittest.TestCase):
@@ -304,5 +321,251 @@ class TestReadMatchFromWeb(HtmlLoadingTestCase):
         self.assertEqual(matches[0]['status'], "終了")
 
 
+class TestReadMatchFromHtml(HtmlLoadingTestCase):
+    """Test that the lxml parser matches read_match_from_web record for record"""
+
+    FIXTURES = ['j1_section1.html', 'j2_section2.html', 'j3_section3.html',
+                'j1_2026_section1.html', 'j2j3_2026_section1.html']
+
+    def setUp(self):
+        self.test_data_dir = Path(__file__).parent / 'test_data'
+
+    def test_fixtures_identical(self):
+        """Records (including key order and types) are identical on every section fixture"""
+        for filename in self.FIXTURES:
+            with self.subTest(filename=filename):
+                html = (self.test_data_dir / filename).read_bytes().decode('utf-8', errors='ignore')
+                expected = read_match_from_web(self._load_html_file(filename))
+                self.assertEqual(repr(read_match_from_html(html)), repr(expected))
+
+    def test_no_matches(self):
+        """An empty page gives an empty list"""
+        self.assertEqual(read_match_from_html(''), [])
+        self.assertEqual(read_match_from_html('<html></html>'), [])
+
+    def test_unparsable_section_with_matches_raises(self):
+        """Match rows under an unrecognized section title raise ValueError"""
+        html = """
+        <section class="matchlistWrap">
+            <div class="leagAccTit"><h5>プレーオフ</h5></div>
+            <table><tr><td class="clubName leftside">A</td></tr></table>
+        </section>"""
+        with self.assertRaises(ValueError):
+            read_match_from_html(html)
+
+
+class TestKickoffWindow(unittest.TestCase):
+    """Test section kickoff lists and the update window query"""
+
+    def setUp(self):
+        self.matches = pd.DataFrame({
+            'section_no': [2, 1, 1, 1, 3],
+            'match_date': ['2026/03/08', '2026/03/01', '2026/03/01', '2026/03/01', None],
+            'start_time': ['未定', '19:00', '14:00', '14:00', '14:00'],
+        })
+
+    def test_match_dates_sorted_and_deduplicated(self):
+        """Kickoffs are sorted per section, duplicates removed, undated sections skipped"""
+        dates = get_match_dates_of_section(self.matches)
+        self.assertEqual(list(dates), [1, 2])
+        self.assertEqual([t.strftime('%m/%d %H:%M') for t in dates[1]], ['03/01 14:00', '03/01 19:00'])
+        self.assertEqual([t.strftime('%m/%d %H:%M') for t in dates[2]], ['03/08 00:00'])
+
+    def test_sections_to_update(self):
+        """A section is selected while a match may still be in progress"""
+        start = pd.Timestamp('2026-03-01 20:30', tz='Asia/Tokyo')
+        self.assertEqual(get_sections_to_update(self.matches, start, start + pd.Timedelta(hours=1)), {1})
+        self.assertEqual(get_sections_to_update(self.matches, start + pd.Timedelta(hours=1),
+                                                start + pd.Timedelta(days=7)), {2})
+
+
+class TestReadMatchesConcurrent(unittest.TestCase):
+    """Test that concurrent section fetching matches the sequential path"""
+
+    @staticmethod
+    def _fake_read_match(competition, sec, url_category=None):
+        """Return two matches per section after a random delay (out-of-order completion)"""
+        time.sleep(random.uniform(0, 0.01))
+        return [
+            {'match_date': f'2025/03/{sec:02d}', 'section_no': sec, 'match_index_in_section': _i,
+             'start_time': '14:00', 'stadium': 'S', 'home_team': f'H{_i}', 'home_goal': '1',
+             'away_goal': '0', 'away_team': f'A{_i}', 'status': '試合終了'}
+            for _i in (1, 2)
+        ]
+
+    @patch('read_jleague_matches.read_match')
+    def test_concurrent_equals_sequential(self, mock_read_match):
+        """Concurrent fetch should produce exactly the same DataFrame as the sequential fetch"""
+        mock_read_match.side_effect = self._fake_read_match
+        sections = [5, 1, 3, 2, 4, 6, 8, 7]
+
+        sequential = read_matches('J1', sections, max_workers=1)
+        concurrent = read_matches('J1', sections, max_workers=4)
+
+        pd.testing.assert_frame_equal(sequential, concurrent)
+        self.assertEqual(mock_read_match.call_count, len(sections) * 2)
+        self.assertEqual(concurrent['section_no'].tolist(), sorted(sections * 2))
+
+    @patch('read_jleague_matches.read_match')
+    def test_url_category_passed_to_each_fetch(self, mock_read_match):
+        """url_category should be forwarded to every concurrent section fetch"""
+        mock_read_match.side_effect = self._fake_read_match
+
+        read_matches('J2', {1, 2, 3}, url_category='j2j3', max_workers=3)
+
+        for call in mock_read_match.call_args_list:
+            self.assertEqual(call.kwargs['url_category'], 'j2j3')
+
+
+class TestReadMatchNotModified(unittest.TestCase):
+    """Test that read_match reuses parsed records for unchanged pages"""
+
+    def setUp(self):
+        clear_fetch_registry()
+
+    @patch('read_jleague_matches.read_match_from_html')
+    @patch.object(http, 'load_parsed', return_value=[{'section_no': 1}])
+    @patch.object(http, 'get_conditional')
+    def test_not_modified_page_is_not_parsed(self, mock_get, mock_load, mock_parse):
+        """A 304 page with cached records should skip parsing"""
+        mock_get.return_value.from_cache = True
+
+        self.assertEqual(read_match('J1', 1), [{'section_no': 1}])
+        mock_parse.assert_not_called()
+
+    @patch.object(http, 'save_parsed')
+    @patch.object(http, 'get_conditional')
+    def test_modified_page_is_parsed_and_saved(self, mock_get, mock_save):
+        """A changed page should be parsed and its records saved to the cache"""
+        mock_get.return_value.from_cache = False
+        mock_get.return_value.text = '<html></html>'
+
+        self.assertEqual(read_match('J1', 1), [])
+        mock_save.assert_called_once()
+
+
+class TestReadMatchReplay(HtmlLoadingTestCase):
+    """Test read_match against a response archive built from the HTML fixtures"""
+
+    def setUp(self):
+        self.test_data_dir = Path(__file__).parent / 'test_data'
+        clear_fetch_registry()
+
+    def test_replay_matches_fixture_parse(self):
+        """Replaying an archived section page yields the same records as parsing the fixture"""
+        html = (self.test_data_dir / 'j1_section1.html').read_bytes()
+        response = MagicMock(content=html, status_code=200, encoding='utf-8', headers={})
+        url = 'https://www.jleague.jp/match/section/j1/1/'
+        with tempfile.TemporaryDirectory() as archive_dir:
+            ResponseArchive(archive_dir, 'record').record(url, response)
+            with patch.object(http, 'archive', ResponseArchive(archive_dir, 'replay')), \
+                 patch.object(http, 'session') as mock_session:
+                matches = read_match('J1', 1)
+        mock_session.get.assert_not_called()
+        self.assertEqual(matches, read_match_from_web(self._load_html_file('j1_section1.html')))
+
+
+class TestFetchRegistry(unittest.TestCase):
+    """Test that a section page is fetched once per run across competitions"""
+
+    PAGE = """
+    <section class="matchlistWrap">
+        <div class="leagAccTit"><h5>第1節</h5></div>
+        <table>
+            <tr><th class="groupHead">EAST-A</th></tr>
+            <tr><td class="stadium">13:00<br><a>A</a></td>
+                <td class="clubName leftside">X</td><td class="point leftside"></td>
+                <td class="point rightside"></td><td class="clubName rightside">Y</td></tr>
+        </table>
+    </section>"""
+
+    def setUp(self):
+        clear_fetch_registry()
+        self.addCleanup(clear_fetch_registry)
+
+    def _fake_get(self, url):
+        time.sleep(0.01)
+        return MagicMock(from_cache=False, text=self.PAGE)
+
+    @patch.object(http, 'save_parsed')
+    @patch.object(http, 'get_conditional')
+    def test_shared_url_category_is_fetched_once(self, mock_get, _mock_save):
+        """J2 and J3 sharing url_category j2j3 request each page only once"""
+        mock_get.side_effect = self._fake_get
+        with fetch_run():
+            j2 = read_matches('J2', [1, 2], url_category='j2j3', max_workers=2)
+            j3 = read_matches('J3', [1, 2], url_category='j2j3', max_workers=2)
+
+        self.assertEqual(mock_get.call_count, 2)
+        pd.testing.assert_frame_equal(j2, j3)
+        self.assertEqual(list(j2['group']), ['EAST-A', 'EAST-A'])
+
+    @patch.object(http, 'save_parsed')
+    @patch.object(http, 'get_conditional')
+    def test_pages_are_fetched_again_in_the_next_run(self, mock_get, _mock_save):
+        """A top-level read_matches forgets its pages when it returns"""
+        mock_get.side_effect = self._fake_get
+        read_matches('J2', [1], url_category='j2j3')
+        read_matches('J2', [1], url_category='j2j3')
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch.object(http, 'save_parsed')
+    @patch.object(http, 'get_conditional')
+    def test_concurrent_requests_for_same_page_share_one_fetch(self, mock_get, _mock_save):
+        """Threads asking for the same page at once wait for a single request"""
+        mock_get.side_effect = self._fake_get
+        read_matches('J2', [1, 1, 1, 1], url_category='j2j3', max_workers=4)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch.object(http, 'get_conditional')
+    def test_failed_fetch_is_retried(self, mock_get):
+        """A failed request is not cached, so the next call fetches again"""
+        mock_get.side_effect = [ConnectionError('down'), MagicMock(from_cache=False, text='')]
+        with self.assertRaises(ConnectionError):
+            read_match('J2', 1, url_category='j2j3')
+        with patch.object(http, 'save_parsed'):
+            self.assertEqual(read_match('J2', 1, url_category='j2j3'), [])
+        self.assertEqual(mock_get.call_count, 2)
+
+
+class TestForcedUpdateWithLedger(unittest.TestCase):
+    """Test that -f skips settled sections when the ledger is enabled"""
+
+    def setUp(self):
+        clear_fetch_registry()
+        self.addCleanup(clear_fetch_registry)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.ledger = SectionLedger(Path(tmp.name) / 'ledger.json', settle_after=1, reverify_per_run=1)
+        for sec in (1, 2, 3):
+            self.ledger.observe(read_jleague_matches._section_url('J1', sec), [], finished=True)
+        patcher = patch.object(read_jleague_matches, 'section_ledger', self.ledger)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.csv = Path(tmp.name) / 'j1.csv'
+        self.csv.write_text('x', encoding='utf-8')
+
+    @patch('read_jleague_matches.mu')
+    @patch('read_jleague_matches.read_matches')
+    @patch('read_jleague_matches.read_teams', return_value=['T1', 'T2', 'T3'])
+    def test_only_open_and_rotation_sections_fetched(self, _mock_teams, mock_read, mock_mu):
+        """3 teams -> 6 sections; 1-3 settled, so 4-6 plus one re-verify are fetched"""
+        mock_mu.get_csv_path.return_value = str(self.csv)
+        mock_mu.read_allmatches_csv.return_value = pd.DataFrame({'section_no': [1, 2]})
+        mock_mu.diff_matches.return_value.__bool__.return_value = False
+
+        update_all_matches('J1', force_update=True)
+        self.assertEqual(sorted(mock_read.call_args.args[1]), [1, 4, 5, 6])
+
+    @patch('read_jleague_matches.mu')
+    @patch('read_jleague_matches.read_matches')
+    def test_without_ledger_fetches_everything(self, mock_read, mock_mu):
+        """With the ledger disabled -f keeps re-fetching every section"""
+        mock_mu.get_csv_path.return_value = str(self.csv)
+        with patch.object(read_jleague_matches, 'section_ledger', None):
+            update_all_matches('J1', force_update=True)
+        mock_read.assert_called_once_with('J1', url_category=None)
+
+
 if __name__ == '__main__':
     unittest.main()
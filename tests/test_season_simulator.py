@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from season_simulator import outcome_probabilities
+from season_simulator import simulate_positions
+from standings_timeline import SeasonRules
+
+
+def _matches(rows: list[tuple]) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=['match_date', 'home_team', 'away_team', 'home_goal', 'away_goal', 'status'])
+
+
+def _league(finished: int) -> pd.DataFrame:
+    """Double round robin of four teams with the first ``finished`` matches played."""
+    teams = ['A', 'B', 'C', 'D']
+    pairs = [(home, away) for home in teams for away in teams if home != away]
+    scores = ['2', '1', '0', '1', '3', '0', '1', '1', '0', '2', '2', '2']
+    rows = []
+    for i, (home, away) in enumerate(pairs):
+        if i < finished:
+            rows.append((f'2025/03/{i + 1:02d}', home, away, scores[i], scores[-1 - i], '試合終了'))
+        else:
+            rows.append((f'2025/03/{i + 1:02d}', home, away, '', '', 'ＶＳ'))
+    return _matches(rows)
+
+
+def test_outcomes_follow_the_finished_matches():
+    probabilities = outcome_probabilities(_league(12))
+    # 12 finished matches: 5 home wins, 2 draws, 5 away wins, plus one each
+    assert probabilities.to_dict() == {('win', 'loss'): 6 / 15, ('loss', 'win'): 6 / 15, ('draw', 'draw'): 3 / 15}
+    probabilities = outcome_probabilities(_league(0), 'pk-win2-loss1')
+    assert set(probabilities.index) == {('win', 'loss'), ('loss', 'win'), ('pk_win', 'pk_loss'), ('pk_loss', 'pk_win')}
+
+
+def test_finished_season_gives_the_final_table():
+    positions = simulate_positions(_league(12), simulations=1000, workers=1)['DefaultGroup']
+    assert positions.to_numpy().sum(axis=1).tolist() == [1, 1, 1, 1]
+    assert set(positions.to_numpy().ravel()) == {0, 1}
+
+
+def test_result_depends_on_the_seed_only():
+    matches = _league(6)
+    rules = SeasonRules(teams=('D',))
+    single = simulate_positions(matches, rules, simulations=25_000, seed=3, workers=1)['DefaultGroup']
+    pooled = simulate_positions(matches, rules, simulations=25_000, seed=3, workers=2)['DefaultGroup']
+    pd.testing.assert_frame_equal(single, pooled)
+    assert list(single.index) == ['D', 'A', 'B', 'C']
+    np.testing.assert_allclose(single.sum(axis=0), 1)
+    other = simulate_positions(matches, rules, simulations=25_000, seed=4, workers=1)['DefaultGroup']
+    assert not single.equals(other)
@@ -0,0 +1,67 @@
+"""Tests for the settled-section ledger."""
+import json
+
+import pytest
+
+from section_ledger import SectionLedger
+
+FINISHED = [{'section_no': 1, 'status': '試合終了', 'home_goal': '1'}]
+
+
+def _urls(n):
+    return {sec: f'https://example.com/j1/{sec}/' for sec in range(1, n + 1)}
+
+
+def test_section_settles_after_consecutive_identical_fetches(tmp_path):
+    ledger = SectionLedger(tmp_path / 'ledger.json', settle_after=3)
+    url = _urls(1)[1]
+    for _ in range(2):
+        ledger.observe(url, FINISHED, finished=True)
+    assert not ledger.is_settled(url)
+    ledger.observe(url, FINISHED, finished=True)
+    assert ledger.is_settled(url)
+
+
+@pytest.mark.parametrize('records, finished', [
+    ([{'section_no': 1, 'status': '試合終了', 'home_goal': '2'}], True),  # late correction
+    ([{'section_no': 1, 'status': '試合前', 'home_goal': ''}], False),
+])
+def test_changed_or_unfinished_page_reopens_section(tmp_path, records, finished):
+    ledger = SectionLedger(tmp_path / 'ledger.json', settle_after=2)
+    url = _urls(1)[1]
+    ledger.observe(url, FINISHED, finished=True)
+    ledger.observe(url, FINISHED, finished=True)
+    assert ledger.is_settled(url)
+    ledger.observe(url, records, finished=finished)
+    assert not ledger.is_settled(url)
+
+
+def test_select_fetches_open_sections_and_rotates_settled(tmp_path):
+    ledger = SectionLedger(tmp_path / 'ledger.json', settle_after=1, reverify_per_run=2)
+    urls = _urls(6)
+    for sec in (1, 2, 3, 4):
+        ledger.observe(urls[sec], FINISHED, finished=True)
+    ledger._entries[urls[1]]['verified'] = '2026-01-04T00:00:00+09:00'
+    ledger._entries[urls[2]]['verified'] = '2026-01-01T00:00:00+09:00'
+    ledger._entries[urls[3]]['verified'] = '2026-01-03T00:00:00+09:00'
+    ledger._entries[urls[4]]['verified'] = '2026-01-02T00:00:00+09:00'
+
+    # sections 5, 6 are open; 2 and 4 are the least recently verified
+    assert ledger.select_sections(urls) == [2, 4, 5, 6]
+
+
+def test_save_and_reload(tmp_path):
+    path = tmp_path / 'sub' / 'ledger.json'
+    ledger = SectionLedger(path, settle_after=1)
+    url = _urls(1)[1]
+    ledger.observe(url, FINISHED, finished=True)
+    ledger.save()
+
+    assert SectionLedger(path, settle_after=1).is_settled(url)
+    assert json.loads(path.read_text(encoding='utf-8'))[url]['stable'] == 1
+
+
+def test_unreadable_ledger_starts_empty(tmp_path):
+    path = tmp_path / 'ledger.json'
+    path.write_text('{broken', encoding='utf-8')
+    assert SectionLedger(path).select_sections(_urls(2)) == [1, 2]
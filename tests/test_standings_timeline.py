@@ -0,0 +1,287 @@
+import hashlib
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from match_utils import CsvUpdate
+from match_utils import mu
+from standings_timeline import POINT_MAPS
+from standings_timeline import PRESEASON_SENTINEL
+from standings_timeline import RESULT_TYPES
+from standings_timeline import SeasonRules
+from standings_timeline import build_timeline
+from standings_timeline import dump_timeline
+from standings_timeline import patch_timeline
+from standings_timeline import timeline_path
+from standings_timeline import write_timeline
+
+CSV_DIR = Path(__file__).resolve().parent.parent / 'docs' / 'csv'
+
+
+def _matches(rows: list[tuple]) -> pd.DataFrame:
+    columns = ['match_date', 'home_team', 'away_team', 'home_goal', 'away_goal',
+               'home_score_ex', 'away_score_ex', 'home_pk_score', 'away_pk_score', 'status']
+    return pd.DataFrame(rows, columns=columns)
+
+
+def _group(timeline: dict, group: str = 'DefaultGroup') -> dict:
+    """Per-date lists of each value of a group, e.g. _group(timeline)['point'][date_index]."""
+    entry = dict(timeline['groups'][group])
+    for row in timeline['dates']:
+        for name, values in row['groups'][group].items():
+            entry.setdefault(name, []).append(values)
+    return entry
+
+
+def _reference(matches: pd.DataFrame, rules: SeasonRules) -> dict:
+    """Straight port of the frontend per-date loop (calculateTeamStats / getSortedTeamList)."""
+    point_map = POINT_MAPS[rules.point_system]
+    dates = sorted({PRESEASON_SENTINEL} | {d for d in matches['match_date'].fillna('') if d})
+    records = [{key: '' if pd.isna(value) else value for key, value in row.items()}
+               for row in matches.to_dict('records')]
+    groups = {}
+    for row in records:
+        group = row.get('group') or 'DefaultGroup'
+        teams = groups.setdefault(group, dict.fromkeys(rules.teams))
+        teams.setdefault(row['home_team'])
+        teams.setdefault(row['away_team'])
+    result = {}
+    for group, teams in groups.items():
+        names = list(teams)
+        entry = {name: [] for name in ('point', 'avlbl_pt', 'all_game', 'goal_get', 'goal_diff', *RESULT_TYPES)}
+        entry['order'] = []
+        for date in dates:
+            stats = {name: dict.fromkeys(names, 0) for name in entry if name != 'order'}
+            played = []
+            for row in records:
+                if (row.get('group') or 'DefaultGroup') != group or row['status'] == '試合中止':
+                    continue
+                for team, *values in (
+                        (row['home_team'], row['home_goal'], row['away_goal'], row.get('home_score_ex', ''),
+                         row.get('away_score_ex', ''), row.get('home_pk_score', ''), row.get('away_pk_score', '')),
+                        (row['away_team'], row['away_goal'], row['home_goal'], row.get('away_score_ex', ''),
+                         row.get('home_score_ex', ''), row.get('away_pk_score', ''), row.get('home_pk_score', ''))):
+                    gf, ga, exf, exa, pkf, pka = (int(float(value)) if value else None for value in values)
+                    if gf is None or ga is None or row['match_date'] > date:
+                        stats['avlbl_pt'][team] += point_map['win']
+                        continue
+                    has_ex = exf is not None and exa is not None
+                    has_pk = pkf is not None and pka is not None
+                    if gf != ga:
+                        point = point_map[('ex_' if has_ex else '') + ('win' if gf > ga else 'loss')]
+                    elif has_pk:
+                        point = point_map['pk_win' if pkf > pka else 'pk_loss']
+                    else:
+                        point = point_map['draw']
+                    if has_pk:
+                        cls = 'pk_win' if pkf > pka else 'pk_loss'
+                    elif has_ex and exf != exa:
+                        cls = 'ex_win' if exf > exa else 'ex_loss'
+                    else:
+                        cls = 'win' if point >= point_map['win'] else 'draw' if point >= 1 else 'loss'
+                    played.append((team, row['away_team' if team == row['home_team'] else 'home_team'],
+                                   point, gf, ga))
+                    stats['point'][team] += point
+                    stats['avlbl_pt'][team] += point
+                    stats['all_game'][team] += 1
+                    stats['goal_get'][team] += gf
+                    stats['goal_diff'][team] += gf - ga
+                    stats[cls][team] += 1
+            for name, values in stats.items():
+                entry[name].append([values[team] for team in names])
+            ranked = _ranked(names, ('point', *rules.tiebreak_order), stats, played)
+            entry['order'].append([names.index(team) for team in ranked])
+        result[group] = entry
+    return result
+
+
+def _ranked(teams: list[str], keys: tuple[str, ...], stats: dict, played: list[tuple]) -> list[str]:
+    """Sort teams by keys one at a time; head_to_head starts over on every group its mini-table splits."""
+    if len(teams) < 2 or not keys:
+        return teams
+    key, rest = keys[0], keys[1:]
+    if key == 'head_to_head':
+        sides = [side for side in played if side[0] in teams and side[1] in teams]
+        if len({frozenset(side[:2]) for side in sides}) < len(teams) * (len(teams) - 1) // 2:
+            return _ranked(teams, rest, stats, played)
+        mini = {team: [0, 0, 0] for team in teams}
+        for team, _, point, gf, ga in sides:
+            mini[team] = [mini[team][0] + point, mini[team][1] + gf - ga, mini[team][2] + gf]
+        value = {team: tuple(-v for v in mini[team]) for team in teams}
+        if len(set(value.values())) == 1:
+            return _ranked(teams, rest, stats, played)
+        rest = keys
+    else:
+        name = {'point': 'point', 'goal_diff': 'goal_diff', 'goal_get': 'goal_get', 'wins': 'win'}.get(key)
+        if name is None:
+            return _ranked(teams, rest, stats, played)
+        value = {team: -stats[name][team] for team in teams}
+    return [team for level in sorted(set(value.values()))
+            for team in _ranked([team for team in teams if value[team] == level], rest, stats, played)]
+
+
+def test_points_follow_the_point_system():
+    matches = _matches([
+        ('2025/03/01', 'A', 'B', '2', '1', '1', '0', None, None, '試合終了'),    # extra-time win
+        ('2025/03/01', 'C', 'D', '1', '1', '0', '0', '4', '3', '試合終了'),      # PK win after ET 0-0
+        ('2025/03/08', 'A', 'C', '0', '1', None, None, None, None, '試合終了'),
+        ('2025/03/08', 'B', 'D', '', '', None, None, None, None, '試合中止'),    # ignored
+        ('2025/03/15', 'D', 'A', '', '', None, None, None, None, 'ＶＳ'),
+    ])
+    timeline = build_timeline(matches, SeasonRules(point_system='graduated-win', teams=('E',)))
+    assert [row['date'] for row in timeline['dates']] == [PRESEASON_SENTINEL, '2025/03/01', '2025/03/08',
+                                                          '2025/03/15']
+    group = _group(timeline)
+    assert group['teams'] == ['E', 'A', 'B', 'C', 'D']
+    assert group['games'] == [0, 3, 1, 2, 2]
+    assert group['point'][1] == [0, 2, 0, 1, 0]
+    assert group['point'][-1] == [0, 2, 0, 4, 0]
+    assert group['avlbl_pt'][0] == [0, 9, 3, 6, 6]
+    assert group['avlbl_pt'][-1] == [0, 5, 0, 4, 3]
+    assert group['ex_win'][-1] == [0, 1, 0, 0, 0]
+    assert group['pk_win'][-1] == [0, 0, 0, 1, 0]
+    assert group['pk_loss'][-1] == [0, 0, 0, 0, 1]
+    assert group['win'][-1] == [0, 0, 0, 1, 0]
+    assert group['goal_diff'][-1] == [0, 0, -1, 1, 0]
+    assert group['order'][-1] == [3, 1, 4, 0, 2]
+
+
+def test_head_to_head_splits_tied_teams_again():
+    rules = SeasonRules(tiebreak_order=('head_to_head', 'goal_diff', 'goal_get'))
+    matches = _matches([
+        ('2025/03/01', 'C', 'A', '2', '1', None, None, None, None, '試合終了'),
+        ('2025/03/02', 'A', 'B', '2', '1', None, None, None, None, '試合終了'),
+        ('2025/03/03', 'B', 'C', '1', '0', None, None, None, None, '試合終了'),
+        ('2025/03/03', 'D', 'E', '0', '0', None, None, None, None, '試合終了'),
+    ])
+    # A, B and C: 3 points and goal difference 0 each; A scored 3 and leads, then B beat C
+    assert _group(build_timeline(matches, rules))['order'][-1] == [1, 2, 0, 3, 4]
+    assert _group(build_timeline(matches))['order'][-1] == [1, 0, 2, 3, 4]
+    # C, D and A level, but D has not met either: goal_diff decides instead of C's win over A
+    matches = matches.iloc[[0, 3, 1]].assign(match_date=['2025/03/01', '2025/03/02', '2025/03/03'],
+                                             home_goal=['2', '3', '2'])
+    group = _group(build_timeline(matches, rules))
+    assert group['teams'] == ['C', 'A', 'D', 'E', 'B']
+    assert group['order'][-1] == [2, 0, 1, 4, 3]
+
+
+@pytest.mark.parametrize('name', ['2022_allmatch_result-ACL_GS.csv', '24-25_allmatch_result-ACL_Elite.csv'])
+def test_head_to_head_matches_the_recursive_sort(name):
+    path = CSV_DIR / name
+    if not path.exists():
+        pytest.skip(f'{name} not available')
+    with mu.use_config(SimpleNamespace(standard_date_format='%Y/%m/%d')):
+        matches = mu.read_allmatches_csv(str(path))
+    rules = SeasonRules(tiebreak_order=('head_to_head', 'goal_diff', 'goal_get'))
+    timeline = build_timeline(matches, rules)
+    for group, entry in _reference(matches, rules).items():
+        assert _group(timeline, group)['order'] == entry['order'], group
+
+
+def test_groups_keep_their_own_team_lists():
+    matches = _matches([
+        ('2025/03/01', 'A', 'B', '1', '0', None, None, None, None, '試合終了'),
+        ('2025/03/02', 'C', 'D', '0', '0', None, None, None, None, '試合終了'),
+    ]).assign(group=['X', ''])
+    timeline = build_timeline(matches)
+    assert {name: group['teams'] for name, group in timeline['groups'].items()} == {'X': ['A', 'B'],
+                                                                                    'DefaultGroup': ['C', 'D']}
+    assert _group(timeline)['point'] == [[0, 0], [0, 0], [1, 1]]
+    assert timeline_path('../docs/csv/2025_allmatch_result-J1.csv').name == '2025_allmatch_result-J1.timeline.json'
+
+
+@pytest.mark.parametrize('name, rules', [
+    ('2025_allmatch_result-J1.csv', SeasonRules()),
+    ('1995A_allmatch_result-J1.csv', SeasonRules(point_system='win3all-pkloss1')),
+    ('1998A_allmatch_result-J1.csv', SeasonRules(point_system='graduated-win', tiebreak_order=('wins', 'goal_diff'))),
+    ('2024_allmatch_result-Olympic_GS.csv', SeasonRules()),
+])
+def test_matches_the_frontend_loop_on_published_csvs(name, rules):
+    path = CSV_DIR / name
+    if not path.exists():
+        pytest.skip(f'{name} not available')
+    with mu.use_config(SimpleNamespace(standard_date_format='%Y/%m/%d')):
+        matches = mu.read_allmatches_csv(str(path))
+    timeline = build_timeline(matches, rules)
+    expected = _reference(matches, rules)
+    for group, entry in expected.items():
+        for key, values in entry.items():
+            assert _group(timeline, group)[key] == values, (group, key)
+
+
+def _j2_2025() -> pd.DataFrame:
+    path = CSV_DIR / '2025_allmatch_result-J2.csv'
+    if not path.exists():
+        pytest.skip('2025_allmatch_result-J2.csv not available')
+    with mu.use_config(SimpleNamespace(standard_date_format='%Y/%m/%d')):
+        return mu.read_allmatches_csv(str(path))
+
+
+def _late_score_change(df):
+    df.loc[df.index[-1], ['home_goal', 'away_goal']] = ['3', '0']
+
+
+def _postponed(df):
+    df.loc[df.index[200], 'match_date'] = '2025/12/06'
+
+
+def _cancelled(df):
+    df.loc[df.index[300], ['home_goal', 'away_goal', 'status']] = ['', '', '試合中止']
+
+
+def _added(df):
+    df.loc['new'] = df.iloc[-1]
+    df.loc['new', ['match_date', 'home_goal', 'away_goal', 'status']] = ['2025/12/13', '', '', 'ＶＳ']
+
+
+@pytest.mark.parametrize('change', [_late_score_change, _postponed, _cancelled, _added])
+def test_patch_gives_the_rebuilt_timeline(change):
+    old = _j2_2025()
+    new = old.copy()
+    change(new)
+    since = min(mu.diff_matches(new, old).match_dates())
+    patched = patch_timeline(dump_timeline(build_timeline(old)), new, since)
+    assert patched == dump_timeline(build_timeline(new))
+
+
+def test_removing_the_last_date_rebuilds(tmp_path):
+    old = _j2_2025()
+    last = old['match_date'].max()
+    new = old[old['match_date'] != last]
+    assert patch_timeline(dump_timeline(build_timeline(old)), new, last) is None
+
+    csv_path = tmp_path / 'season.csv'
+    lines = (CSV_DIR / '2025_allmatch_result-J2.csv').read_text(encoding='utf-8').splitlines(keepends=True)
+    csv_path.write_text(''.join(lines), encoding='utf-8')
+    old_sha = hashlib.sha256(csv_path.read_bytes()).hexdigest()
+    with mu.use_config(SimpleNamespace(standard_date_format='%Y/%m/%d')):
+        assert write_timeline(str(csv_path))
+        csv_path.write_text(''.join(line for line in lines if last not in line), encoding='utf-8')
+        new_sha = hashlib.sha256(csv_path.read_bytes()).hexdigest()
+        assert write_timeline(str(csv_path), updates=[CsvUpdate(old_sha, new_sha, frozenset({last}))])
+        written = timeline_path(csv_path).read_text(encoding='utf-8')
+        timeline_path(csv_path).unlink()
+        assert write_timeline(str(csv_path))
+    assert timeline_path(csv_path).read_text(encoding='utf-8') == written
+
+
+def test_write_timeline_patches_after_csv_updates(tmp_path, caplog):
+    csv_path = tmp_path / 'season.csv'
+    lines = (CSV_DIR / '2025_allmatch_result-J2.csv').read_text(encoding='utf-8').splitlines(keepends=True)
+    csv_path.write_text(''.join(lines[:-1]), encoding='utf-8')
+    old_sha = hashlib.sha256(csv_path.read_bytes()).hexdigest()
+    caplog.set_level(logging.INFO, logger='standings_timeline')
+    with mu.use_config(SimpleNamespace(standard_date_format='%Y/%m/%d')):
+        assert write_timeline(str(csv_path))
+        assert not write_timeline(str(csv_path))
+        csv_path.write_text(''.join(lines), encoding='utf-8')
+        new_sha = hashlib.sha256(csv_path.read_bytes()).hexdigest()
+        assert write_timeline(str(csv_path), updates=[CsvUpdate(old_sha, new_sha, frozenset({'2025/11/29'}))])
+        patched = timeline_path(csv_path).read_text(encoding='utf-8')
+        assert 'Patch' in caplog.text
+        timeline_path(csv_path).unlink()
+        assert write_timeline(str(csv_path), updates=[CsvUpdate('other', new_sha, frozenset({'2025/11/29'}))])
+    assert timeline_path(csv_path).read_text(encoding='utf-8') == patched
@@ -0,0 +1,70 @@
+"""Tests for the batched, file-locked timestamp store."""
+from datetime import datetime
+from multiprocessing import get_context
+from zoneinfo import ZoneInfo
+
+from timestamp_store import TimestampStore
+
+JST = ZoneInfo('Asia/Tokyo')
+
+
+def _write_in_process(path, hash_path, filename):
+    store = TimestampStore(path, 'Asia/Tokyo', hash_path)
+    store.set(filename, date=datetime.now(JST), sha256=filename)
+    store.flush()
+
+
+def test_reads_existing_export_and_keeps_format(tmp_path):
+    path = tmp_path / 'csv_timestamp.csv'
+    path.write_text('file,date\n'
+                    'a.csv,2026-03-11 01:19:58.742306+09:00\n'
+                    'b.csv,2026-03-10 16:00:00+00:00\n'
+                    'a.csv,2026-03-01 00:00:00+09:00\n', encoding='utf-8')
+    store = TimestampStore(path, 'Asia/Tokyo', tmp_path / 'local' / 'hashes.csv')
+    assert store.get('a.csv')['date'] == datetime(2026, 3, 11, 1, 19, 58, 742306, tzinfo=JST)
+    assert store.get('b.csv')['date'] == datetime(2026, 3, 11, 1, 0, tzinfo=JST)
+    assert store.get('missing.csv') is None
+
+    store.set('c.csv', date=datetime(2026, 10, 17, 12, 0, tzinfo=JST), sha256='ff')
+    assert path.read_text(encoding='utf-8').count('\n') == 4  # not written before flush
+    store.flush()
+    # The committed file keeps file,date; hashes go to the separate file
+    assert path.read_text(encoding='utf-8').splitlines() == [
+        'file,date',
+        'a.csv,2026-03-11 01:19:58.742306+09:00',
+        'b.csv,2026-03-11 01:00:00+09:00',
+        'c.csv,2026-10-17 12:00:00+09:00',
+    ]
+    assert (tmp_path / 'local' / 'hashes.csv').read_text(encoding='utf-8').splitlines() == ['file,sha256', 'c.csv,ff']
+    assert TimestampStore(path, 'Asia/Tokyo', tmp_path / 'local' / 'hashes.csv').get('c.csv')['sha256'] == 'ff'
+
+
+def test_flush_merges_updates_of_other_writers(tmp_path):
+    path = tmp_path / 'csv_timestamp.csv'
+    first = TimestampStore(path, 'Asia/Tokyo')
+    second = TimestampStore(path, 'Asia/Tokyo')
+    first.set('j1.csv', date=datetime(2026, 10, 17, 1, 0, tzinfo=JST))
+    second.set('wc.csv', date=datetime(2026, 10, 17, 1, 5, tzinfo=JST))
+    first.flush()
+    second.flush()
+    store = TimestampStore(path, 'Asia/Tokyo')
+    assert store.get('j1.csv') is not None and store.get('wc.csv') is not None
+
+
+def test_concurrent_processes_do_not_clobber(tmp_path):
+    path = tmp_path / 'csv_timestamp.csv'
+    hash_path = tmp_path / 'hashes.csv'
+    names = [f'{i}.csv' for i in range(8)]
+    with get_context('spawn').Pool(4) as pool:
+        pool.starmap(_write_in_process, [(path, hash_path, name) for name in names])
+    store = TimestampStore(path, 'Asia/Tokyo', hash_path)
+    assert {name: store.get(name)['sha256'] for name in names} == {name: name for name in names}
+
+
+def test_setting_recorded_values_writes_nothing(tmp_path):
+    path = tmp_path / 'csv_timestamp.csv'
+    store = TimestampStore(path, 'Asia/Tokyo')
+    store.set('a.csv', date=datetime(2026, 10, 17, 1, 0, tzinfo=JST), sha256='ff')
+    store.flush()
+    store.set('a.csv', sha256='ff')
+    assert not store.dirty
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from typed_matches import TypedMatchTable
+from typed_matches import read_typed_matches_csv
+
+CSV_DIR = Path(__file__).resolve().parent.parent / 'docs' / 'csv'
+CSV_FILES = sorted(path for path in CSV_DIR.rglob('*.csv') if path.name != 'csv_timestamp.csv')
+
+
+def _strings(**columns) -> pd.DataFrame:
+    rows = len(next(iter(columns.values())))
+    return pd.DataFrame(columns, index=[str(i) for i in range(rows)], dtype=str)
+
+
+def test_typed_dtypes():
+    df = _strings(match_date=['2025/02/14', '2025/02/15'], section_no=['1', '-2'],
+                  home_team=['Ｇ大阪', '新潟'], home_goal=['2', ''], attendance=['30000', ''])
+    frame = TypedMatchTable.from_strings(df).frame
+    assert frame['match_date'].dtype.kind == 'M'
+    assert str(frame['section_no'].dtype) == 'Int16'
+    assert str(frame['home_goal'].dtype) == 'Int8'
+    assert str(frame['attendance'].dtype) == 'Int32'
+    assert frame['home_team'].dtype == 'category'
+    assert frame['home_goal'].isna().tolist() == [False, True]
+    assert frame.index.dtype == 'int64'
+
+
+def test_cells_without_typed_form_keep_their_text():
+    df = _strings(match_date=['2025/02/14', '未定', '2025-03-01'], home_pk_score=['4.0', '', '300'])
+    table = TypedMatchTable.from_strings(df)
+    assert table.date_format == '%Y/%m/%d'
+    assert table.frame['match_date'].iloc[2] == pd.Timestamp('2025-03-01')
+    assert table.frame['home_pk_score'].tolist() == [4, pd.NA, pd.NA]
+    assert table.raw_cells == {'match_date': {1: '未定', 2: '2025-03-01'},
+                               'home_pk_score': {0: '4.0', 2: '300'}}
+    pd.testing.assert_frame_equal(table.to_strings(), df)
+
+
+@pytest.mark.skipif(not CSV_FILES, reason='docs/csv not available')
+def test_round_trip_is_lossless_on_all_csvs():
+    for path in CSV_FILES:
+        assert read_typed_matches_csv(path).to_csv() == path.read_text(encoding='utf-8'), path.name
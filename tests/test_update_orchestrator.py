@@ -0,0 +1,94 @@
+"""Tests for the single-process CSV update orchestrator."""
+from datetime import datetime
+import threading
+import time
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from match_utils import mu
+from update_orchestrator import PLANS
+from update_orchestrator import Task
+from update_orchestrator import format_summary
+from update_orchestrator import resolve_mode
+from update_orchestrator import run_tasks
+
+
+def _module(main):
+    return SimpleNamespace(main=main)
+
+
+def test_dependent_task_waits_and_runs_after_failure():
+    events = []
+
+    def failing(argv):
+        time.sleep(0.05)
+        events.append(('jfa', argv))
+        raise RuntimeError('feed down')
+
+    modules = {
+        'jfa': _module(failing),
+        'patch': _module(lambda argv: events.append(('patch', argv))),
+    }
+    tasks = [Task('jfa', 'jfa', ('WC2026',)), Task('patch', 'patch', after=('jfa',))]
+    results = run_tasks(tasks, modules)
+
+    assert events == [('jfa', ['WC2026']), ('patch', [])]
+    assert [(r.name, r.ok) for r in results] == [('jfa', False), ('patch', True)]
+    assert results[0].error == 'RuntimeError: feed down'
+
+
+def test_independent_tasks_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    modules = {'a': _module(lambda argv: barrier.wait()), 'b': _module(lambda argv: barrier.wait())}
+    results = run_tasks([Task('a', 'a'), Task('b', 'b')], modules)
+    assert all(r.ok for r in results)
+
+
+def test_system_exit_is_reported_as_failure():
+    def exits(argv):
+        raise SystemExit(2)
+
+    results = run_tasks([Task('bad', 'bad')], {'bad': _module(exits)})
+    assert not results[0].ok
+    assert 'SystemExit' in format_summary(results, 1.0)
+
+
+def test_each_task_sees_its_own_config():
+    seen = {}
+    barrier = threading.Barrier(2, timeout=5)
+
+    def reader(name):
+        def main(argv):
+            with mu.use_config(SimpleNamespace(name=name)):
+                barrier.wait()
+                seen[name] = mu.config.name
+        return main
+
+    run_tasks([Task('a', 'a'), Task('b', 'b')], {'a': _module(reader('a')), 'b': _module(reader('b'))})
+    assert seen == {'a': 'a', 'b': 'b'}
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError):
+        run_tasks([Task('a', 'a', after=('missing',))], {'a': _module(lambda argv: None)})
+
+
+def test_auto_mode_is_daily_only_at_one_am_jst():
+    jst = ZoneInfo('Asia/Tokyo')
+    assert resolve_mode('auto', datetime(2026, 10, 17, 1, 5, tzinfo=jst)) == 'daily'
+    assert resolve_mode('auto', datetime(2026, 10, 17, 16, 5, tzinfo=jst)) == 'ongame'
+    assert resolve_mode('ongame', datetime(2026, 10, 17, 1, 5, tzinfo=jst)) == 'ongame'
+
+
+def test_plans_match_the_former_shell_script():
+    assert [(t.module, t.argv) for t in PLANS['daily']] == [
+        ('read_jleague_matches', ('-f',)),
+        ('read_jfamatch', ('PrincePremierE', 'PrincePremierW', 'PrinceKanto', 'WC2026', 'WC2026KO')),
+        ('read_openfootball_wc', ()),
+        ('read_we_league', ()),
+        ('standings_timeline', ()),
+        ('clinch_flags', ()),
+    ]
+    assert [t.after for t in PLANS['ongame']] == [(), (), ('jfamatch',), ('jleague',), ('jleague',)]